@@ -0,0 +1,52 @@
+"""Measure how long importing tom_text_toolbox takes and which heavy libraries it loads.
+
+Each import runs in a fresh interpreter so earlier imports do not hide the
+cost. Heavy libraries (NLTK, spaCy, torch, transformers, enchant, PassivePy)
+should only appear once a scorer that needs them is actually run.
+
+    python benchmarks/import_time_benchmark.py --repeat 5
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+HEAVY_MODULES = ["nltk", "spacy", "torch", "transformers", "enchant", "PassivePySrc"]
+
+STATEMENTS = {
+    "bare import": "import tom_text_toolbox",
+    "TermCounter": "from tom_text_toolbox import TermCounter",
+    "analyse_features": "from tom_text_toolbox import analyse_features",
+}
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+{statement}
+elapsed = time.perf_counter() - start
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def time_import(statement: str) -> dict:
+    code = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark tom_text_toolbox import time.")
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per statement")
+    args = parser.parse_args()
+
+    for name, statement in STATEMENTS.items():
+        runs = [time_import(statement) for _ in range(args.repeat)]
+        seconds = statistics.median(run["seconds"] for run in runs)
+        loaded = ", ".join(runs[-1]["loaded"]) or "none"
+        print(f"{name:<18} {seconds * 1000:8.1f} ms   heavy modules loaded: {loaded}")
+
+
+if __name__ == "__main__":
+    main()
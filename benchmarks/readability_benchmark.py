@@ -0,0 +1,56 @@
+"""Compare the bulk readability engine with readability.getmeasures per caption.
+
+Times both on captions from tom_text_toolbox/text_data_TEST.csv and checks
+that every grade matches exactly (captions without words are NaN in both).
+
+    python benchmarks/readability_benchmark.py --size 20000
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import readability
+
+from tom_text_toolbox.linguistic_features.readability_score import READABILITY_COLUMNS, readability_scores
+
+SAMPLE_FILE = os.path.join(os.path.dirname(__file__), "..", "tom_text_toolbox", "text_data_TEST.csv")
+
+
+def per_caption_grades(captions: pd.Series) -> pd.DataFrame:
+    rows = []
+    for caption in captions:
+        try:
+            grades = readability.getmeasures(caption)["readability grades"]
+            rows.append({column: grades[key] for column, key in READABILITY_COLUMNS.items()})
+        except ValueError:
+            rows.append({column: np.nan for column in READABILITY_COLUMNS})
+    return pd.DataFrame(rows, index=captions.index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark bulk readability scoring.")
+    parser.add_argument("--size", type=int, default=20000)
+    args = parser.parse_args()
+
+    captions = pd.read_csv(SAMPLE_FILE)["caption"].fillna("")
+    captions = captions.sample(n=args.size, replace=len(captions) < args.size, random_state=0).reset_index(drop=True)
+
+    start = time.perf_counter()
+    expected = per_caption_grades(captions)
+    per_caption_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = readability_scores(captions, verbose=False)
+    bulk_seconds = time.perf_counter() - start
+
+    print(f"getmeasures {per_caption_seconds:8.3f} s")
+    print(f"bulk        {bulk_seconds:8.3f} s  ({per_caption_seconds / bulk_seconds:.1f}x)")
+    pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+    print("grades identical")
+
+
+if __name__ == "__main__":
+    main()
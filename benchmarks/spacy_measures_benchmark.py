@@ -0,0 +1,111 @@
+"""Compare the array-based spaCy measures with the original per-token loop.
+
+Parses captions sampled from tom_text_toolbox/text_data_TEST.csv once, then
+times only the post-parse phase of both versions and checks that every
+output column is identical.
+
+    python benchmarks/spacy_measures_benchmark.py --size 2000 --repeat 4
+"""
+
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from tom_text_toolbox.linguistic_features.spacy_measure_scores import (
+    EVENT_VERBS, STATE_VERBS, SpacyAnalyzer,
+)
+from tom_text_toolbox.linguistic_features.spacy_parse import SpacyParser
+
+SAMPLE_FILE = os.path.join(os.path.dirname(__file__), "..", "tom_text_toolbox", "text_data_TEST.csv")
+
+
+def per_token_measures(docs, term_dict, index):
+    """The per-token loop score_spacy_measures used before it worked on doc.to_array()."""
+    import spacy
+    from spacy.symbols import NOUN, VERB, ADJ, ADV
+
+    informativeness, narrativity, syntax_complexity, tense_data = [], [], [], []
+    consumer_counts, brand_counts = [], []
+
+    for doc in docs:
+        alpha_tokens = [t for t in doc if t.is_alpha]
+        n_tokens = len(alpha_tokens)
+
+        content_count = doc.count_by(spacy.attrs.POS)
+        content_tokens = content_count.get(NOUN, 0) + content_count.get(VERB, 0) + \
+                         content_count.get(ADJ, 0) + content_count.get(ADV, 0)
+        informativeness.append(round(content_tokens / n_tokens, 3) if n_tokens else 0.0)
+
+        verbs = [t.lemma_ for t in alpha_tokens if t.pos_ == "VERB"]
+        if verbs:
+            narrative = sum(1 for v in verbs if v in STATE_VERBS) + sum(1 for v in verbs if v in EVENT_VERBS)
+            narrativity.append(round(narrative / len(verbs), 3))
+        else:
+            narrativity.append(0.0)
+
+        dep_counts = doc.count_by(spacy.attrs.DEP)
+        num_clauses = sum(dep_counts.get(doc.vocab.strings[dep], 0) for dep in ["ccomp", "advcl", "acl", "relcl"])
+        max_depth = max((len(list(t.ancestors)) for t in alpha_tokens), default=0)
+        num_subtrees = sum(1 for t in alpha_tokens if len(list(t.children)) > 1)
+        syntax_complexity.append(round(num_clauses * 1.5 + max_depth * 1.2 + num_subtrees * 1.0, 2))
+
+        counts = {"Past": 0, "Present": 0}
+        for t in alpha_tokens:
+            if t.pos_ == "VERB" and "VerbForm=Fin" in t.morph:
+                if "Tense=Past" in t.morph:
+                    counts["Past"] += 1
+                elif "Tense=Pres" in t.morph:
+                    counts["Present"] += 1
+        tense_data.append(counts)
+
+        subjects = [t for t in doc if t.dep_ in ("nsubj", "nsubjpass")]
+        consumer_counts.append(sum(1 for tok in subjects if tok.lemma_.lower() in term_dict["user"]
+                                   or tok.text.lower() in term_dict["user"]))
+        brand_counts.append(sum(1 for tok in subjects if tok.lemma_.lower() in term_dict["brand"]
+                                or tok.text.lower() in term_dict["brand"]
+                                or tok.lemma_.lower() in term_dict["product"]
+                                or tok.text.lower() in term_dict["product"]))
+
+    return pd.DataFrame({
+        "informativeness": informativeness,
+        "narrativity": narrativity,
+        "syntax_complexity": syntax_complexity,
+        "cb_ratio": [float('inf') if b == 0 and c > 0 else 0.0 if b == 0 else c / b
+                     for c, b in zip(consumer_counts, brand_counts)],
+        "tense_past": [t["Past"] for t in tense_data],
+        "tense_present": [t["Present"] for t in tense_data],
+    }, index=index)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the post-parse phase of the spaCy measures.")
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=1, help="Join this many captions into one (long captions).")
+    args = parser.parse_args()
+
+    captions = pd.read_csv(SAMPLE_FILE)["caption"].dropna()
+    captions = captions.sample(n=args.size * args.repeat, replace=True, random_state=0).to_numpy()
+    captions = pd.Series([" ".join(captions[i:i + args.repeat]) for i in range(0, len(captions), args.repeat)])
+
+    analyzer = SpacyAnalyzer(SpacyParser(store=False))
+    docs = analyzer.parser.parse(captions)
+    print(f"{len(docs)} docs, {sum(len(d) for d in docs) / len(docs):.0f} tokens on average")
+
+    start = time.perf_counter()
+    expected = per_token_measures(docs, analyzer.term_dict, captions.index)
+    loop_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = analyzer.score_spacy_measures(captions, docs=docs)
+    array_seconds = time.perf_counter() - start
+
+    print(f"per-token {loop_seconds:8.3f} s")
+    print(f"arrays    {array_seconds:8.3f} s  ({loop_seconds / array_seconds:.1f}x)")
+    pd.testing.assert_frame_equal(actual, expected)
+    print("outputs identical")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark the single-pass TermMatcher against the per-category regex path.
+
+Captions are resampled from tom_text_toolbox/text_data_TEST.csv up to each
+requested corpus size. The regex path is what `TermCounter.count_all` used to
+run: one `captions.str.count(pattern)` call per category.
+
+    python benchmarks/term_matcher_benchmark.py --sizes 100000 1000000
+"""
+
+import argparse
+import os
+import time
+
+import pandas as pd
+
+from tom_text_toolbox.linguistic_features.dictionary_scores import TermCounter
+
+SAMPLE_FILE = os.path.join(os.path.dirname(__file__), "..", "tom_text_toolbox", "text_data_TEST.csv")
+
+
+def regex_counts(tc: TermCounter, captions: pd.Series) -> pd.DataFrame:
+    return pd.DataFrame({cat: captions.str.count(pat.pattern) for cat, pat in tc.patterns.items()})
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark TermMatcher against the regex path.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--skip-regex-above", type=int, default=None,
+                        help="Only time the matcher for corpora larger than this")
+    args = parser.parse_args()
+
+    tc = TermCounter.from_json()
+    sample = pd.read_csv(SAMPLE_FILE)["caption"].fillna("")
+
+    for size in args.sizes:
+        captions = sample.sample(n=size, replace=True, random_state=0).reset_index(drop=True)
+
+        start = time.perf_counter()
+        matched = tc.matcher.count(captions)
+        matcher_time = time.perf_counter() - start
+        print(f"{size:>9,} captions | matcher {matcher_time:8.2f}s ({size / matcher_time:,.0f} rows/s)")
+
+        if args.skip_regex_above is not None and size > args.skip_regex_above:
+            continue
+
+        start = time.perf_counter()
+        expected = regex_counts(tc, captions)
+        regex_time = time.perf_counter() - start
+        identical = matched.equals(expected[matched.columns])
+        print(f"{size:>9,} captions | regex   {regex_time:8.2f}s ({size / regex_time:,.0f} rows/s) "
+              f"| speed-up {regex_time / matcher_time:.1f}x | identical counts: {identical}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.checkpoints`."""
+
+
+import os
+import tempfile
+import unittest
+
+import pandas as pd
+
+from tom_text_toolbox.checkpoints import RunCheckpoints
+from tom_text_toolbox.scheduler import Stage
+
+
+class TestCheckpoints(unittest.TestCase):
+    """Tests for per-stage run checkpoints."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.input = os.path.join(self.dir.name, "captions.csv")
+        pd.DataFrame({"caption": ["a", "b"]}).to_csv(self.input, index=False)
+        self.run_dir = os.path.join(self.dir.name, "run")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_000_resume(self):
+        """Saved stages come back on a rerun, unless their version or row range changed."""
+        stage = Stage("joy", None, version="v1")
+        run = RunCheckpoints(self.input, {"chunksize": 1}, run_dir=self.run_dir)
+        run.chunk(0, 0, 1).save(stage, pd.Series([0.5]))
+
+        rerun = RunCheckpoints(self.input, {"chunksize": 1}, run_dir=self.run_dir)
+        self.assertEqual(rerun.saved, 1)
+        self.assertEqual(rerun.chunk(0, 0, 1).load([stage])["joy"].tolist(), [0.5])
+        self.assertEqual(rerun.chunk(0, 0, 1).load([Stage("joy", None, version="v2")]), {})
+        self.assertEqual(rerun.chunk(0, 0, 2).load([stage]), {})
+
+    def test_001_other_input_starts_over(self):
+        """A changed input file or settings discards the old checkpoints; clear removes the run."""
+        stage = Stage("joy", None)
+        RunCheckpoints(self.input, {"chunksize": 1}, run_dir=self.run_dir).chunk(0, 0, 1).save(stage, [1])
+        self.assertEqual(RunCheckpoints(self.input, {"chunksize": 2}, run_dir=self.run_dir).saved, 0)
+
+        run = RunCheckpoints(self.input, {"chunksize": 2}, run_dir=self.run_dir)
+        run.chunk(0, 0, 2).save(stage, [1, 2])
+        run.clear()
+        self.assertFalse(os.path.exists(self.run_dir))
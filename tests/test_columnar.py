@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.columnar` and the chunk writer."""
+
+
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from tom_text_toolbox.streaming import OutputWriter, read_file_chunks
+
+try:
+    import pyarrow  # noqa: F401
+except ImportError:
+    pyarrow = None
+
+
+@unittest.skipIf(pyarrow is None, "pyarrow is not installed")
+class TestColumnar(unittest.TestCase):
+    """Tests for Parquet output and projected reading."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "out.parquet")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_000_chunks_share_one_schema(self):
+        """Chunks with missing values or empty columns are written with the first chunk's types."""
+        chunks = [
+            pd.DataFrame({"caption": ["a b", "c"], "likes": [1, 2], "note": [None, None],
+                          "token_captions": [["a", "b"], ["c"]], "joy": [0.25, 0.5]}),
+            pd.DataFrame({"caption": ["d"], "likes": [np.nan], "note": ["x"],
+                          "token_captions": [[]], "joy": [np.nan]}, index=[2]),
+        ]
+        with OutputWriter(self.path, float32=["joy"], lists=["token_captions"]) as writer:
+            for chunk in chunks:
+                writer.write(chunk)
+
+        import pyarrow.parquet as pq
+        parquet = pq.ParquetFile(self.path)
+        self.assertEqual(parquet.metadata.num_row_groups, 2)
+        self.assertEqual(str(parquet.schema_arrow.field("joy").type), "float")
+        self.assertEqual(str(parquet.schema_arrow.field("likes").type), "int64")
+        df = pd.read_parquet(self.path)
+        self.assertEqual(list(df["token_captions"][0]), ["a", "b"])
+        self.assertEqual(df["note"].tolist()[2], "x")
+        self.assertTrue(pd.isna(df["likes"][2]))
+
+    def test_001_projected_chunks(self):
+        """Only the requested columns are read, and the index runs on across chunks."""
+        pd.DataFrame({"caption": list("abcde"), "other": range(5)}).to_parquet(self.path)
+        chunks = list(read_file_chunks(self.path, 2, columns=["caption"]))
+        self.assertEqual([len(c) for c in chunks], [2, 2, 1])
+        self.assertEqual(list(chunks[2].columns), ["caption"])
+        self.assertEqual(chunks[2].index.tolist(), [4])
+        with self.assertRaises(ValueError):
+            next(read_file_chunks(self.path, 2, columns=["missing"]))
+
+
+class TestExcelWithoutPyarrow(unittest.TestCase):
+    """Excel input keeps working, streamed by openpyxl, when pyarrow is not installed."""
+
+    def test_000_excel_fallback(self):
+        from unittest import mock
+
+        from tom_text_toolbox import columnar
+        from tom_text_toolbox.main import read_file
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "captions.xlsx")
+            pd.DataFrame({"caption": list("abcde"), "likes": range(5)}).to_excel(path, index=False)
+            with mock.patch.object(columnar, "has_pyarrow", return_value=False):
+                chunks = list(read_file_chunks(path, 2, columns=["caption"]))
+                df = read_file(path, columns=["likes"])
+        self.assertEqual([len(c) for c in chunks], [2, 2, 1])
+        self.assertEqual(chunks[2].index.tolist(), [4])
+        self.assertEqual(list(chunks[0].columns), ["caption"])
+        self.assertEqual(df["likes"].tolist(), list(range(5)))
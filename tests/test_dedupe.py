@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.dedupe`."""
+
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from tom_text_toolbox.dedupe import CaptionGroups, dedup_summary
+
+CAPTIONS = pd.Series(["buy now", "hello", "buy now", np.nan, "Hello", "hello", np.nan, ""],
+                     index=[7, 7, 3, 2, 9, 0, 1, 5])
+
+
+def score(captions: pd.Series) -> pd.DataFrame:
+    # Any per-caption feature; NaN captions get their own value
+    text = captions.fillna("<missing>")
+    return pd.DataFrame({"length": text.str.len(), "upper": text.str.upper()}, index=captions.index)
+
+
+class TestCaptionGroups(unittest.TestCase):
+    """Scoring the distinct captions and expanding equals scoring every row."""
+
+    def test_000_collapse_expand_round_trip(self):
+        groups = CaptionGroups(CAPTIONS)
+        unique = groups.collapse(CAPTIONS)
+        pd.testing.assert_frame_equal(groups.expand(score(unique), CAPTIONS.index), score(CAPTIONS))
+        pd.testing.assert_series_equal(groups.expand(unique.str.len(), CAPTIONS.index), CAPTIONS.str.len())
+
+    def test_001_first_occurrence_order(self):
+        groups = CaptionGroups(CAPTIONS)
+        unique = groups.collapse(CAPTIONS)
+        self.assertEqual(unique.fillna("<nan>").tolist(), ["buy now", "hello", "<nan>", "Hello", ""])
+        self.assertEqual(unique.index.tolist(), list(range(5)))
+        self.assertEqual(groups.collapse(CAPTIONS.to_frame("caption"))["caption"].fillna("<nan>").tolist(),
+                         unique.fillna("<nan>").tolist())
+
+    def test_002_counts(self):
+        groups = CaptionGroups(CAPTIONS)
+        self.assertTrue(groups.has_duplicates)
+        self.assertEqual((groups.n_rows, groups.n_unique), (8, 5))
+        self.assertAlmostEqual(groups.duplicate_ratio, 3 / 8)
+        self.assertFalse(CaptionGroups(pd.Series(["a", "b"])).has_duplicates)
+        self.assertEqual(CaptionGroups(pd.Series([], dtype=object)).duplicate_ratio, 0.0)
+        self.assertEqual(dedup_summary(8, 5), "5 unique captions in 8 rows (37.5% duplicates scored once)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.linguistic_features.emoji_features`."""
+
+
+import unittest
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+from emosent import get_emoji_sentiment_rank_multiple
+
+from tom_text_toolbox.linguistic_features.emoji_features import classify_emoji_sentiment, emoji_name_counts
+
+CAPTIONS = pd.Series([
+    "Love this 😍😍🔥",
+    "Worst day ever 😡 😂😂 😡",
+    "No emoji here",
+    None,
+    "Café ☕ — naïve 👍🏽 ❤️",
+    "🔥😍",
+], index=list("abcdef"))
+
+
+def baseline_features(caption) -> dict:
+    # Per caption from emosent's own scan
+    ranks = [item["emoji_sentiment_rank"] for item in get_emoji_sentiment_rank_multiple(caption)] \
+        if isinstance(caption, str) else []
+    if not ranks:
+        return {"emoji_count": 0, "emoji_sentiment": np.nan, "emoji_positive": np.nan,
+                "emoji_negative": np.nan, "top_emoji": None}
+    emoji = [chr(int(rank["unicode_codepoint"], 16)) for rank in ranks]
+    counts = Counter(emoji)
+    return {
+        "emoji_count": len(ranks),
+        "emoji_sentiment": np.mean([rank["sentiment_score"] for rank in ranks]),
+        "emoji_positive": np.mean([rank["positive"] / rank["occurrences"] for rank in ranks]),
+        "emoji_negative": np.mean([rank["negative"] / rank["occurrences"] for rank in ranks]),
+        # Counter keeps first-seen order, so max() picks the first of equally frequent emoji
+        "top_emoji": max(counts, key=counts.get),
+    }
+
+
+class TestEmojiFeatures(unittest.TestCase):
+    """The one-scan emoji index finds what emosent finds."""
+
+    def test_000_per_caption_features(self):
+        expected = pd.DataFrame([baseline_features(c) for c in CAPTIONS], index=CAPTIONS.index)
+        pd.testing.assert_frame_equal(classify_emoji_sentiment(CAPTIONS), expected, check_dtype=False)
+
+    def test_001_corpus_counts_match_extract_emoji_dict(self):
+        """emoji_name_counts equals the old extract_emoji_dict Counter."""
+        expected = Counter()
+        for caption in map(str, CAPTIONS):
+            expected.update(item["emoji_sentiment_rank"]["unicode_name"]
+                            for item in get_emoji_sentiment_rank_multiple(caption))
+        self.assertEqual(emoji_name_counts(CAPTIONS), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
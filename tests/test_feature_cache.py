@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.feature_cache`."""
+
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from tom_text_toolbox import feature_cache
+from tom_text_toolbox.feature_cache import FeatureCache, run_cached
+
+CAPTIONS = pd.Series(["good day", "bad day", "good day", None, "", "bad day"], index=[3, 1, 4, 1, 5, 9])
+
+
+def score(captions: pd.Series) -> pd.DataFrame:
+    # A stage returning mixed column types, NaN and None
+    text = captions.fillna("")
+    return pd.DataFrame({
+        "length": text.str.len(),
+        "ratio": [len(t) / 4 if t else np.nan for t in text],
+        "label": [t.split()[0] if t else None for t in text],
+    }, index=captions.index)
+
+
+class TestFeatureCache(unittest.TestCase):
+    """Cached results equal fresh ones; versions and the size bound are honoured."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.cache = FeatureCache(os.path.join(self.dir.name, "features.sqlite"))
+        self.computed = []
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def compute(self, captions):
+        self.computed.append(captions.tolist())
+        return score(captions)
+
+    def test_000_same_as_uncached(self):
+        expected = run_cached(None, "score", "v1", CAPTIONS, score)
+        fresh = self.cache.cached_stage("score", "v1", CAPTIONS, self.compute, verbose=False)
+        cached = self.cache.cached_stage("score", "v1", CAPTIONS, self.compute, verbose=False)
+        pd.testing.assert_frame_equal(fresh, expected, check_dtype=False)
+        pd.testing.assert_frame_equal(cached, expected, check_dtype=False)
+        # Each distinct caption was computed once, and nothing on the second run
+        self.assertEqual(len(self.computed), 1)
+        self.assertEqual(len(self.computed[0]), 4)
+
+    def test_001_series(self):
+        compute = lambda captions: captions.str.len()
+        self.cache.cached_stage("length", "v1", CAPTIONS.dropna(), compute, verbose=False)
+        cached = self.cache.cached_stage("length", "v1", CAPTIONS.dropna(), compute, verbose=False)
+        pd.testing.assert_series_equal(cached, compute(CAPTIONS.dropna()), check_dtype=False)
+
+    def test_002_new_version_recomputes(self):
+        self.cache.cached_stage("score", "v1", CAPTIONS, self.compute, verbose=False)
+        self.cache.cached_stage("score", "v2", CAPTIONS, self.compute, verbose=False)
+        self.assertEqual(len(self.computed), 2)
+        # The v2 rows replaced the v1 rows
+        self.assertEqual(self.cache.get("score", "v1", [feature_cache.text_hash("good day")]), {})
+        self.assertEqual(self.cache.invalidate("score", keep_version="v2"), 0)
+        self.assertEqual(self.cache.invalidate("score"), 4)
+
+    def test_003_evicts_least_recently_used(self):
+        hashes = [feature_cache.text_hash(str(i)) for i in range(10)]
+        with mock.patch.object(feature_cache.time, "time", side_effect=range(100, 200)):
+            for h in hashes:
+                self.cache.put("score", "v1", {h: {"value": 1.0}})
+            # Reading the oldest entry makes it recent again
+            self.cache.get("score", "v1", hashes[:1])
+            row_size = len('{"value": 1.0}') + len(hashes[0]) + len("score") + len("v1")
+            self.cache.max_bytes = row_size * 5
+            self.cache.evict()
+        kept = self.cache.get("score", "v1", hashes)
+        # 10 rows over a 5-row bound: the six oldest go, down to 90% of the bound
+        self.assertEqual(sorted(kept, key=hashes.index), [hashes[0]] + hashes[7:])
+
+    def test_004_running_size_total(self):
+        def scanned():
+            with self.cache._connect() as connection:
+                return connection.execute("SELECT COALESCE(SUM(size), 0) FROM features").fetchone()[0]
+
+        self.cache.cached_stage("score", "v1", CAPTIONS, self.compute, verbose=False)
+        self.assertEqual(self.cache.total_size(), scanned())
+        # Replaced rows (new version, longer key) are subtracted before the new ones are added
+        self.cache.cached_stage("score", "version-2", CAPTIONS, self.compute, verbose=False)
+        self.assertEqual(self.cache.total_size(), scanned())
+        self.cache.invalidate("score")
+        self.assertEqual(self.cache.total_size(), 0)
+
+        # A file written before the total existed gets it filled on open
+        self.cache.put("score", "v1", {"abc": {"value": 1.0}})
+        with self.cache._connect() as connection:
+            connection.execute("DROP TABLE cache_size")
+        self.assertEqual(FeatureCache(self.cache.path).total_size(), scanned())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.linguistic_features.inference` (the parts that run without torch)."""
+
+
+import unittest
+
+import numpy as np
+
+from tom_text_toolbox.linguistic_features.inference import InferenceEngine, encode_nli_pairs
+
+
+class WhitespaceTokenizer:
+    """A toy tokenizer with the Hugging Face methods encode_nli_pairs uses: [CLS] a [SEP] b [SEP]."""
+
+    model_input_names = ["input_ids", "token_type_ids", "attention_mask"]
+    CLS, SEP = 1, 2
+
+    def __init__(self):
+        self.vocab = {}
+
+    def ids(self, text):
+        return [self.vocab.setdefault(word, len(self.vocab) + 3) for word in text.split()]
+
+    def __call__(self, text, text_pair=None, add_special_tokens=True, truncation=None, max_length=None):
+        if isinstance(text, list):
+            return {"input_ids": [self.ids(t) for t in text]}
+        if text_pair is None:
+            return {"input_ids": self.ids(text)}
+        first, second = self.ids(text), self.ids(text_pair)
+        if truncation == "only_first":
+            first = first[:max(max_length - self.num_special_tokens_to_add(pair=True) - len(second), 0)]
+        return {"input_ids": self.build_inputs_with_special_tokens(first, second),
+                "token_type_ids": self.create_token_type_ids_from_sequences(first, second)}
+
+    def num_special_tokens_to_add(self, pair=False):
+        return 3 if pair else 2
+
+    def build_inputs_with_special_tokens(self, first, second):
+        return [self.CLS] + first + [self.SEP] + second + [self.SEP]
+
+    def create_token_type_ids_from_sequences(self, first, second):
+        return [0] * (len(first) + 2) + [1] * (len(second) + 1)
+
+
+class TestInference(unittest.TestCase):
+    """Batch planning and NLI pair encoding."""
+
+    def test_000_plan_covers_every_text_within_budget(self):
+        engine = InferenceEngine(None, max_tokens=64, max_batch_size=5, device="cpu", verbose=False)
+        lengths = np.random.default_rng(0).integers(1, 40, size=103)
+        batches = engine.plan(lengths)
+        positions = np.concatenate(batches)
+        self.assertEqual(sorted(positions.tolist()), list(range(len(lengths))))
+        # Shortest first, so every batch pads to its last text
+        self.assertTrue((np.diff(lengths[positions]) >= 0).all())
+        for batch in batches:
+            self.assertLessEqual(len(batch), 5)
+            self.assertTrue(len(batch) == 1 or len(batch) * lengths[batch].max() <= 64)
+
+    def test_001_pairs_match_tokenizing_each_pair(self):
+        """Assembled ids equal tokenizer(text, hypothesis, truncation="only_first") per pair."""
+        tokenizer = WhitespaceTokenizer()
+        texts = ["a short caption", "a much longer caption that will have to be cut short here", ""]
+        hypotheses = ["This example is assertive.", "This example is directive."]
+        encodings = encode_nli_pairs(tokenizer, texts, hypotheses, max_length=12)
+
+        expected = [tokenizer(t, h, truncation="only_first", max_length=12) for t in texts for h in hypotheses]
+        self.assertEqual(encodings["input_ids"], [e["input_ids"] for e in expected])
+        self.assertEqual(encodings["token_type_ids"], [e["token_type_ids"] for e in expected])
+        self.assertEqual(encodings["attention_mask"], [[1] * len(e["input_ids"]) for e in expected])
+        self.assertTrue(all(len(ids) <= 12 for ids in encodings["input_ids"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.linguistic_features.levdist_scores`."""
+
+
+import io
+import itertools
+import re
+import unittest
+from contextlib import redirect_stdout
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from rapidfuzz.distance import Levenshtein
+
+from tom_text_toolbox.linguistic_features import levdist_scores
+from tom_text_toolbox.linguistic_features.levdist_scores import classify_levdist, mean_levdist, sampled_levdist
+
+CAPTIONS = pd.Series([
+    "Cat bat rat",
+    "Love dove move love LOVE",
+    "Quick brown fox jumps over the lazy dog",
+    "Word",
+    "This has numbers 123 and symbols #hashtag",
+    None,
+    "",
+    "so so so so so",
+], index=range(100, 108))
+
+
+def baseline_levdist(captions: pd.Series) -> pd.Series:
+    # The original loop over itertools.combinations
+    results = []
+    for caption in captions:
+        words = re.findall(r"[^\s]+", caption.lower()) if isinstance(caption, str) else []
+        if len(words) < 2:
+            results.append(0)
+            continue
+        distances = [Levenshtein.distance(w1, w2) for w1, w2 in itertools.combinations(words, 2)]
+        results.append(round(np.mean(distances), 2))
+    return pd.Series(results, index=captions.index)
+
+
+class TestLevdist(unittest.TestCase):
+    """Exact scores equal the pairwise loop; sampled scores are exact or within their error."""
+
+    def test_000_exact_matches_pairwise_loop(self):
+        pd.testing.assert_series_equal(classify_levdist(CAPTIONS), baseline_levdist(CAPTIONS), check_dtype=False)
+
+    def test_001_blocks(self):
+        """Splitting the distance matrix into row blocks does not change the sums."""
+        words = "a bb ccc a dd bb eee ffff a".split()
+        with mock.patch.object(levdist_scores, "BLOCK_ROWS", 2):
+            self.assertEqual(mean_levdist(words), baseline_levdist(pd.Series([" ".join(words)])).iloc[0])
+
+    def test_002_sampled_is_exact_for_short_captions(self):
+        result = classify_levdist(CAPTIONS, max_pairs=50, return_error=True)
+        pd.testing.assert_series_equal(result["avg_letter_edit_distance"], baseline_levdist(CAPTIONS),
+                                       check_dtype=False, check_names=False)
+        self.assertTrue((result["avg_letter_edit_distance_se"] == 0).all())
+
+    def test_003_sampled_estimate(self):
+        """Long captions are estimated within a few standard errors, reproducibly per seed."""
+        rng = np.random.default_rng(1)
+        words = ["".join(rng.choice(list("abcdefgh"), size=rng.integers(1, 9))) for _ in range(300)]
+        exact = mean_levdist(words)
+        estimate, error = sampled_levdist(words, max_pairs=2000, seed=3)
+        self.assertGreater(error, 0)
+        self.assertLess(abs(estimate - exact), 5 * error + 0.01)
+        self.assertEqual(sampled_levdist(words, max_pairs=2000, seed=3), (estimate, error))
+
+    def test_004_max_pairs_too_small(self):
+        with self.assertRaises(ValueError):
+            classify_levdist(CAPTIONS, max_pairs=1)
+
+    def test_005_sampled_count(self):
+        """Captions with more than max_pairs pairs count as sampled, even at standard error 0."""
+        with redirect_stdout(io.StringIO()) as output:
+            result = classify_levdist(CAPTIONS, max_pairs=9, return_error=True)
+        # "so so so so so" has 10 pairs, all at distance 0
+        self.assertEqual(result["avg_letter_edit_distance_se"].iloc[-1], 0)
+        self.assertIn(" 4 captions sampled", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.linguistic_features.lexicon_matrix`."""
+
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from tom_text_toolbox.linguistic_features.abstract_concrete_score import concreteness_score_tokens
+from tom_text_toolbox.linguistic_features.lexicon_matrix import CountMatrix
+from tom_text_toolbox.linguistic_features.lexicon_store import Lexicon
+from tom_text_toolbox.linguistic_features.nrc_scores import avg_emo_scores
+from tom_text_toolbox.linguistic_features.whissell_scores import classify_whissell_scores
+
+TOKENS = [
+    ["I", "love", "love", "my", "Joyous", "life"],
+    ["nothing", "here"],
+    [],
+    ["the", "the", "war", "LOVE", "ugly"],
+    ["war"],
+]
+SCORES = {"love": 0.75, "joyous": 0.5, "life": 0.25, "war": 0.125, "the": 0.0625, "ugly": 0.375}
+
+WHISSELL = pd.DataFrame({
+    "word": ["love", "life", "war", "The", "ugly"],
+    "pleas": [3.0, 2.5, 1.0, 2.0, 1.25],
+    "activ": [2.0, 1.5, 2.75, 1.0, 1.5],
+    "image": [1.5, 2.0, 3.0, 1.0, 2.25],
+})
+
+
+def baseline_whissell(captions: pd.Series, dictionary: pd.DataFrame) -> pd.DataFrame:
+    # The original per-caption loop; captions without a dictionary word score 0.0
+    dictionary = dictionary.set_index("word")
+    rows = []
+    for caption in captions:
+        matched = [w for w in caption if w in dictionary.index]
+        if matched:
+            rows.append(dictionary.loc[matched][["pleas", "activ", "image"]].mean().tolist())
+        else:
+            rows.append([0.0, 0.0, 0.0])
+    return pd.DataFrame(rows, index=captions.index,
+                        columns=["whissell_pleasant", "whissell_active", "whissell_image"])
+
+
+class TestCountMatrix(unittest.TestCase):
+    """Sparse lexicon means equal the per-caption loops, including their NaN vs 0.0 conventions."""
+
+    def test_000_nrc_means_are_nan_without_matches(self):
+        lowered = [[t.lower() for t in tokens] for tokens in TOKENS]
+        means, matched = CountMatrix(TOKENS, lowercase=True).lexicon_means(Lexicon.from_mapping("joy", SCORES))
+        expected = [avg_emo_scores(tokens, {"joy": SCORES})["joy"] for tokens in lowered]
+        np.testing.assert_allclose(means[:, 0], expected)
+        self.assertEqual(matched.tolist(), [4, 0, 0, 5, 1])
+
+    def test_001_concreteness_excludes_stopwords(self):
+        stop_words = {"the", "my", "i"}
+        means, _ = CountMatrix(TOKENS, lowercase=True).lexicon_means(Lexicon.from_mapping("conc", SCORES),
+                                                                     exclude=stop_words)
+        expected = [concreteness_score_tokens(tokens, SCORES, stop_words) for tokens in TOKENS]
+        np.testing.assert_allclose(means[:, 0], expected)
+
+    def test_002_whissell_is_case_sensitive_and_zero_without_matches(self):
+        captions = pd.Series(TOKENS, index=[10, 11, 12, 13, 14])
+        pd.testing.assert_frame_equal(classify_whissell_scores(captions, dictionary=WHISSELL),
+                                      baseline_whissell(captions, WHISSELL))
+
+    def test_003_lowercase_merges_columns(self):
+        matrix = CountMatrix([["Love", "love", "LOVE"], ["war"]], lowercase=True)
+        self.assertEqual(sorted(matrix.vocabulary), ["love", "war"])
+        self.assertEqual(matrix.matrix.toarray().sum(axis=1).tolist(), [3.0, 1.0])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.linguistic_features.lexicon_store`."""
+
+
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from tom_text_toolbox.linguistic_features import lexicon_store
+from tom_text_toolbox.linguistic_features.lexicon_store import (
+    Lexicon, compile_lexicon, dictionary_path, lexicon_version, load_lexicon,
+)
+
+
+def baseline_dict(file: str, sep: str, word: str, value: str) -> dict:
+    # The dict(zip(...)) loaders the scorers used before the store; "null" is read as NaN there
+    df = pd.read_csv(dictionary_path(file), sep=sep)
+    return {w: v for w, v in zip(df[word].astype(str).str.lower(), df[value]) if isinstance(w, str) and w != "nan"}
+
+
+class TestLexiconStore(unittest.TestCase):
+    """Compiled lexicons hold the same words and values as the source files."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = self.dir.name
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def assert_same_dict(self, compiled: dict, baseline: dict):
+        self.assertEqual(set(compiled) - {"null"}, set(baseline))
+        words = sorted(baseline)
+        # Values are stored as float32
+        np.testing.assert_allclose([compiled[w] for w in words], [baseline[w] for w in words], rtol=1e-6)
+
+    def test_000_nrc(self):
+        for emotion in ("joy", "anger"):
+            file = f"{emotion}-NRC-EmoIntv1-withZeroIntensityEntries.txt"
+            self.assert_same_dict(load_lexicon(f"nrc_{emotion}", self.store).as_dict(),
+                                  baseline_dict(file, "\t", "English Word", "Emotion-Intensity-Score"))
+
+    def test_001_brysbaert(self):
+        self.assert_same_dict(load_lexicon("brysbaert", self.store).as_dict(),
+                              baseline_dict("ac_brysbaert_dict.csv", ",", "Word", "Conc.M"))
+
+    def test_002_whissell_keeps_case_and_columns(self):
+        source = pd.read_csv(dictionary_path("whissell_dict.csv")).dropna(subset=["word"]).set_index("word")
+        source = source[~source.index.duplicated(keep="last")]
+        compiled = load_lexicon("whissell", self.store).as_frame()
+        self.assertEqual(list(compiled.columns), ["pleas", "activ", "image"])
+        compiled = compiled.drop(index="null", errors="ignore")
+        np.testing.assert_allclose(compiled.loc[source.index].to_numpy(),
+                                   source[["pleas", "activ", "image"]].to_numpy(), rtol=1e-6)
+
+    def test_003_lookup(self):
+        lexicon = Lexicon.from_mapping("test", {"joy": 0.5, "fun": 0.25, "a": 0.1})
+        self.assertEqual(lexicon.lookup(["fun", "nope", "joy", "averyveryverylongword", ""]).tolist(),
+                         [1, -1, 2, -1, -1])
+
+    def test_004_stale_store_is_recompiled(self):
+        """A manifest from another store format is rebuilt on load."""
+        manifest = compile_lexicon("whissell", self.store)
+        with open(manifest, encoding="utf-8") as f:
+            content = json.load(f)
+        content["format_version"] = -1
+        with open(manifest, "w", encoding="utf-8") as f:
+            json.dump(content, f)
+        load_lexicon.cache_clear()
+        load_lexicon("whissell", self.store)
+        with open(manifest, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["format_version"], lexicon_store.FORMAT_VERSION)
+
+    def test_005_missing_source(self):
+        """A lexicon whose file is not installed fails with a clear error and versions as missing."""
+        missing = {"file": "not_installed.csv", "sep": ",", "word": "Word", "values": ["x"], "lowercase": True}
+        with mock.patch.dict(lexicon_store.LEXICON_SOURCES, {"missing": missing}):
+            self.assertFalse(lexicon_store.lexicon_available("missing"))
+            self.assertTrue(lexicon_version("missing").endswith("|missing"))
+            with self.assertRaisesRegex(FileNotFoundError, "not_installed.csv"):
+                compile_lexicon("missing", self.store)
+            self.assertFalse(os.path.exists(os.path.join(self.store, "missing.json")))
+
+
+if __name__ == "__main__":
+    unittest.main()
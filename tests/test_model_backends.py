@@ -0,0 +1,56 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.linguistic_features.model_backends`."""
+
+
+import os
+import tempfile
+import unittest
+from importlib import metadata
+from unittest import mock
+
+try:
+    import torch
+    import transformers
+except ImportError:
+    torch = transformers = None
+
+from tom_text_toolbox.linguistic_features import model_backends
+from tom_text_toolbox.linguistic_features.paths import CACHE_ENV_VAR
+
+
+@unittest.skipIf(torch is None, "torch and transformers are not installed")
+class TestModelBackends(unittest.TestCase):
+    """Tests for the int8 artifact and its versioned cache path."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.env = mock.patch.dict(os.environ, {CACHE_ENV_VAR: os.path.join(self.dir.name, "cache")})
+        self.env.start()
+        self.model_dir = os.path.join(self.dir.name, "tiny-bert")
+        config = transformers.BertConfig(vocab_size=50, hidden_size=16, num_hidden_layers=1,
+                                         num_attention_heads=2, intermediate_size=32)
+        transformers.BertForSequenceClassification(config).save_pretrained(self.model_dir)
+        model_backends.backend_version.cache_clear()
+
+    def tearDown(self):
+        self.env.stop()
+        self.dir.cleanup()
+
+    def test_000_artifact_path_is_versioned(self):
+        """The artifact directory names the library versions and the model revision."""
+        path = model_backends.backend_dir(self.model_dir, "int8")
+        self.assertIn(f"torch-{metadata.version('torch')}", path)
+        self.assertIn(f"transformers-{metadata.version('transformers')}", path)
+        self.assertIn("rev-local", path)
+
+    def test_001_int8_round_trip(self):
+        """The int8 model is stored as a state_dict and reloads to the same outputs."""
+        first = model_backends.load_model(self.model_dir, "sequence-classification", "int8")
+        path = os.path.join(model_backends.backend_dir(self.model_dir, "int8"), "state_dict.pt")
+        self.assertIsInstance(torch.load(path, weights_only=True), dict)
+
+        second = model_backends.load_model(self.model_dir, "sequence-classification", "int8")
+        ids = torch.tensor([[1, 5, 7, 2], [1, 9, 2, 0]])
+        with torch.no_grad():
+            self.assertTrue(torch.equal(first(ids).logits, second(ids).logits))
@@ -0,0 +1,46 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.linguistic_features.passive_voice_score`."""
+
+
+import unittest
+
+try:
+    from spacy.tokens import Doc
+    from spacy.vocab import Vocab
+except ImportError:
+    Doc = None
+
+from tom_text_toolbox.linguistic_features.passive_voice_score import count_passive_docs
+
+# (words, heads, deps, pos, passive clauses); heads are absolute token indices
+PARSES = {
+    "active": ("The team founded the company".split(), [1, 2, 2, 4, 2],
+               ["det", "nsubj", "ROOT", "det", "dobj"], ["DET", "NOUN", "VERB", "DET", "NOUN"], 0),
+    "truncated passive": ("The company was founded".split(), [1, 3, 3, 3],
+                          ["det", "nsubjpass", "auxpass", "ROOT"], ["DET", "NOUN", "AUX", "VERB"], 1),
+    "agentive passive": ("The company was founded by employees".split(), [1, 3, 3, 3, 3, 4],
+                         ["det", "nsubjpass", "auxpass", "ROOT", "agent", "pobj"],
+                         ["DET", "NOUN", "AUX", "VERB", "ADP", "NOUN"], 1),
+    "clausal subject": ("That we won is known".split(), [2, 2, 4, 4, 4],
+                        ["mark", "nsubj", "csubjpass", "auxpass", "ROOT"], ["SCONJ", "PRON", "VERB", "AUX", "VERB"], 1),
+    "two passives": ("It was built and it was sold".split(), [2, 2, 2, 2, 6, 6, 2],
+                     ["nsubjpass", "auxpass", "ROOT", "cc", "nsubjpass", "auxpass", "conj"],
+                     ["PRON", "AUX", "VERB", "CCONJ", "PRON", "AUX", "VERB"], 2),
+}
+
+
+@unittest.skipIf(Doc is None, "spaCy is not installed")
+class TestPassiveVoice(unittest.TestCase):
+    """Tests for the dependency-matcher passive rules on hand-built parses."""
+
+    def test_000_count_passive_docs(self):
+        """Each passive clause is counted once, active clauses not at all."""
+        vocab = Vocab()
+        docs = [Doc(vocab, words=words, heads=heads, deps=deps, pos=pos)
+                for words, heads, deps, pos, _ in PARSES.values()]
+        self.assertEqual(count_passive_docs(docs), [expected for *_, expected in PARSES.values()])
+
+    def test_001_empty(self):
+        """No docs, no counts."""
+        self.assertEqual(count_passive_docs([]), [])
@@ -0,0 +1,65 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.profiling`."""
+
+
+import json
+import os
+import tempfile
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from tom_text_toolbox import profiling
+from tom_text_toolbox.profiling import Profiler
+from tom_text_toolbox.scheduler import Stage, run_stages
+
+
+def slow_stage(captions):
+    with profiling.timed_load("model"):
+        time.sleep(0.05)
+    # Pretend the longest caption took longest
+    profiling.record_captions(np.array([len(c) for c in captions], dtype=float))
+    return captions.str.len()
+
+
+class TestProfiling(unittest.TestCase):
+    """Tests for the opt-in run profiler."""
+
+    def test_000_stage_report(self):
+        """Stages are measured across chunks, with loads, throughput and slowest captions."""
+        sunk = []
+        profiler = Profiler(top_n=2, sink=sunk.append)
+        chunks = [pd.Series(["a", "a much longer caption"]), pd.Series(["mid length", "b"])]
+        with profiler:
+            for chunk in chunks:
+                run_stages([Stage("slow", slow_stage), Stage("fast", lambda captions: captions)],
+                           {"captions": chunk}, verbose=False, profiler=profiler)
+        self.assertFalse(profiling.active())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.json")
+            report = profiler.emit(path)
+            with open(path, encoding="utf-8") as f:
+                self.assertEqual(json.load(f), report)
+        self.assertEqual(sunk, [report])
+
+        slow = {stage["stage"]: stage for stage in report["stages"]}["slow"]
+        self.assertEqual((slow["calls"], slow["rows"], slow["failures"]), (2, 4, 0))
+        self.assertGreaterEqual(slow["model_loads"]["model"], 0.1)
+        self.assertGreater(slow["rows_per_second"], 0)
+        self.assertEqual([c["caption"] for c in slow["slowest_captions"]], ["a much longer caption", "mid length"])
+        self.assertGreater(report["peak_rss_mb"], 0)
+
+    def test_001_failures_are_reported(self):
+        """A failing stage still shows up in the report, marked as failed."""
+        def fail(captions):
+            raise RuntimeError("boom")
+
+        profiler = Profiler()
+        with self.assertRaises(RuntimeError), profiler:
+            run_stages([Stage("bad", fail)], {"captions": pd.Series(["x"])}, verbose=False, profiler=profiler)
+        self.assertEqual(profiler.report()["stages"][0]["failures"], 1)
+        self.assertFalse(profiling.active())
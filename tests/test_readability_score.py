@@ -0,0 +1,49 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.linguistic_features.readability_score`."""
+
+
+import unittest
+
+import numpy as np
+import pandas as pd
+import readability
+
+from tom_text_toolbox.linguistic_features.readability_score import READABILITY_COLUMNS, readability_scores
+
+CAPTIONS = pd.Series([
+    "This is a test.",
+    "Another sentence!",
+    "Unbelievably comfortable furniture, delivered immediately.\nOrder yours today!",
+    "NASA launched 12345 satellites; Mississippi residents celebrated extraordinarily.",
+    "!!! ... ???",
+    "",
+    None,
+    "multi\n\nline\ncaption with   extra   spaces and emoji 😍",
+], index=[4, 8, 15, 16, 23, 42, 1, 2])
+
+
+def baseline_grades(caption) -> dict:
+    # readability.getmeasures per caption; it raises ValueError when there are no words
+    try:
+        grades = readability.getmeasures(caption)["readability grades"]
+    except (ValueError, TypeError):
+        return {column: np.nan for column in READABILITY_COLUMNS}
+    return {column: grades[grade] for column, grade in READABILITY_COLUMNS.items()}
+
+
+class TestReadability(unittest.TestCase):
+    """The bulk engine reproduces readability.getmeasures caption by caption."""
+
+    def test_000_matches_getmeasures(self):
+        expected = pd.DataFrame([baseline_grades(c) for c in CAPTIONS], index=CAPTIONS.index)
+        pd.testing.assert_frame_equal(readability_scores(CAPTIONS, verbose=False), expected, rtol=1e-12)
+
+    def test_001_no_words(self):
+        grades = readability_scores(pd.Series(["...", "word"]), verbose=False)
+        self.assertTrue(grades.iloc[0].isna().all())
+        self.assertFalse(grades.iloc[1].isna().any())
+
+
+if __name__ == "__main__":
+    unittest.main()
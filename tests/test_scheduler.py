@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.scheduler`."""
+
+
+import time
+import unittest
+
+import pandas as pd
+
+from tom_text_toolbox.scheduler import Stage, assemble_columns, run_stages, select_stages
+
+
+def sleeper(seconds, value):
+    def run(**inputs):
+        time.sleep(seconds)
+        return value
+    return run
+
+
+class TestScheduler(unittest.TestCase):
+    """Tests for the feature-stage scheduler."""
+
+    def test_000_independent_stages_overlap(self):
+        """Wall time follows the longest stage, not the sum, when the budget allows."""
+        stages = [Stage(f"s{i}", sleeper(0.2, i), resource="light") for i in range(4)]
+        start = time.perf_counter()
+        results = run_stages(stages, {"captions": None}, cpu_budget=4, verbose=False)
+        self.assertLess(time.perf_counter() - start, 0.6)
+        self.assertEqual(results, {"s0": 0, "s1": 1, "s2": 2, "s3": 3})
+
+    def test_001_dependencies_and_model_lane(self):
+        """Stages wait for their inputs, and model stages never run together."""
+        order = []
+
+        def record(name):
+            def run(**inputs):
+                order.append(("start", name))
+                time.sleep(0.05)
+                order.append(("end", name))
+                return inputs
+            return run
+
+        stages = [
+            Stage("a", record("a"), resource="model"),
+            Stage("b", record("b"), resource="model"),
+            Stage("c", record("c"), inputs=("a",)),
+        ]
+        results = run_stages(stages, {"captions": None}, cpu_budget=4, verbose=False)
+        self.assertLess(order.index(("end", "a")), order.index(("start", "b")))
+        self.assertLess(order.index(("end", "a")), order.index(("start", "c")))
+        self.assertEqual(results["c"], {"a": {"captions": None}})
+
+    def test_002_missing_input(self):
+        """A stage reading something nobody provides is rejected up front."""
+        with self.assertRaises(ValueError):
+            run_stages([Stage("a", sleeper(0, 1), inputs=("docs",))], {"captions": None}, verbose=False)
+
+    def test_003_assemble_columns(self):
+        """Series, DataFrames and plain lists become frames on the row index."""
+        index = pd.Index([10, 11])
+        stages = [Stage("x", None), Stage("y", None), Stage("z", None)]
+        results = {"x": pd.Series([1, 2]), "y": pd.DataFrame({"p": [3, 4]}), "z": [5, 6]}
+        frame = pd.concat(assemble_columns(stages, results, index), axis=1)
+        self.assertEqual(list(frame.columns), ["x", "p", "z"])
+        self.assertEqual(frame.loc[11].tolist(), [2, 4, 6])
+
+    def test_004_select_stages(self):
+        """Only the stages behind the requested columns (and what they read) are kept."""
+        stages = [
+            Stage("parse", None, columns=["docs"]),
+            Stage("spacy", None, inputs=("parse",), columns=["cb_ratio", "narrativity"]),
+            Stage("whissell", None, columns=["whissell_pleasant", "whissell_active"]),
+            Stage("nrc", None, columns=["joy", "anger"]),
+        ]
+        selected, columns = select_stages(stages, ["joy", "whissell_*", "cb_ratio"])
+        self.assertEqual([s.name for s in selected], ["parse", "spacy", "whissell", "nrc"])
+        self.assertEqual(columns, ["joy", "whissell_pleasant", "whissell_active", "cb_ratio"])
+        self.assertEqual([s.name for s in select_stages(stages, ["anger"])[0]], ["nrc"])
+        with self.assertRaises(ValueError):
+            select_stages(stages, ["not_a_feature"])
+
+    def test_005_completed_stages_are_skipped(self):
+        """Restored results feed their dependents without rerunning, and new results are reported."""
+        ran, saved = [], []
+
+        def record(name):
+            def run(**inputs):
+                ran.append(name)
+                return name
+            return run
+
+        stages = [Stage("a", record("a")), Stage("b", record("b"), inputs=("a",)), Stage("c", record("c"))]
+        results = run_stages(stages, {"captions": None}, verbose=False, completed={"a": "restored"},
+                             on_complete=lambda stage, result: saved.append((stage.name, result)))
+        self.assertEqual(sorted(ran), ["b", "c"])
+        self.assertEqual(results["a"], "restored")
+        self.assertEqual(sorted(saved), [("b", "b"), ("c", "c")])
+
+    def test_006_failure_drains_running_stages(self):
+        """A failing stage stops new starts, but stages already running still finish and are reported."""
+        saved = []
+
+        def fail(**inputs):
+            raise MemoryError("out of memory")
+
+        stages = [Stage("slow", sleeper(0.2, 1)), Stage("bad", fail), Stage("later", sleeper(0, 2), inputs=("slow",))]
+        with self.assertRaises(MemoryError):
+            run_stages(stages, {"captions": None}, cpu_budget=2, verbose=False,
+                       on_complete=lambda stage, result: saved.append(stage.name))
+        self.assertEqual(saved, ["slow"])
+
+    def test_007_opt_in_stages(self):
+        """Stages with default=False only run when a feature selects them."""
+        stages = [Stage("nrc", None, columns=["joy"]), Stage("figurative", None, columns=["Idiom"], default=False)]
+        self.assertEqual(select_stages(stages, None), ([stages[0]], None))
+        self.assertEqual([s.name for s in select_stages(stages, ["Idiom"])[0]], ["figurative"])
+        self.assertEqual([s.name for s in select_stages(stages, ["*"])[0]], ["nrc", "figurative"])
+
+    def test_008_lazy_version(self):
+        """A callable version is resolved once, on first read."""
+        calls = []
+        stage = Stage("model", None, version=lambda: calls.append(1) or "rev-1")
+        self.assertEqual(calls, [])
+        self.assertEqual((stage.version, stage.version), ("rev-1", "rev-1"))
+        self.assertEqual(calls, [1])
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.linguistic_features.spacy_measure_scores`."""
+
+
+import unittest
+
+import pandas as pd
+
+try:
+    import spacy
+    from spacy.tokens import Doc
+except ImportError:
+    spacy = None
+
+from tom_text_toolbox.linguistic_features.spacy_measure_scores import (
+    CLAUSE_DEPS, EVENT_VERBS, STATE_VERBS, SUBJECT_DEPS, SpacyAnalyzer,
+)
+from tom_text_toolbox.linguistic_features.spacy_parse import SpacyParser
+
+PAST, PRESENT = "Tense=Past|VerbForm=Fin", "Tense=Pres|VerbForm=Fin"
+
+# (words, heads, deps, pos, lemmas, morphs); heads are absolute token indices
+PARSES = [
+    ("Customers decided that the app changed everything .".split(), [1, 1, 5, 4, 5, 1, 5, 1],
+     ["nsubj", "ROOT", "mark", "det", "nsubj", "ccomp", "dobj", "punct"],
+     ["NOUN", "VERB", "SCONJ", "DET", "NOUN", "VERB", "PRON", "PUNCT"],
+     ["customer", "decide", "that", "the", "app", "change", "everything", "."],
+     ["", PAST, "", "", "", PAST, "", ""]),
+    ("We start what happens next !".split(), [1, 1, 3, 1, 3, 1],
+     ["nsubj", "ROOT", "nsubj", "ccomp", "advmod", "punct"],
+     ["PRON", "VERB", "PRON", "VERB", "ADV", "PUNCT"],
+     ["we", "start", "what", "happen", "next", "!"],
+     ["", PRESENT, "", "Number=Sing|Person=3|" + PRESENT, "", ""]),
+    ("He bought the bag he loved".split(), [1, 1, 3, 1, 5, 3],
+     ["nsubj", "ROOT", "det", "dobj", "nsubj", "relcl"],
+     ["PRON", "VERB", "DET", "NOUN", "PRON", "VERB"],
+     ["he", "buy", "the", "bag", "he", "love"],
+     ["", PAST, "", "", "", PAST]),
+    ("Running fast".split(), [0, 0], ["ROOT", "advmod"], ["VERB", "ADV"], ["run", "fast"],
+     ["Tense=Past,Pres|VerbForm=Fin", ""]),
+    ([], [], [], [], [], []),
+]
+
+
+def per_token_measures(docs, term_dict, index):
+    """The per-token loop score_spacy_measures replaced (reference output)."""
+    from spacy.symbols import NOUN, VERB, ADJ, ADV
+
+    rows = []
+    for doc in docs:
+        alpha = [t for t in doc if t.is_alpha]
+        content = sum(1 for t in doc if t.pos in (NOUN, VERB, ADJ, ADV))
+        verbs = [t for t in alpha if t.pos_ == "VERB"]
+        narrative = sum(1 for t in verbs if t.lemma_ in STATE_VERBS | EVENT_VERBS)
+        clauses = sum(1 for t in doc if t.dep_ in CLAUSE_DEPS)
+        max_depth = max((len(list(t.ancestors)) for t in alpha), default=0)
+        subtrees = sum(1 for t in alpha if len(list(t.children)) > 1)
+        finite = [t for t in verbs if "VerbForm=Fin" in t.morph]
+        past = sum(1 for t in finite if "Tense=Past" in t.morph)
+        present = sum(1 for t in finite if "Tense=Past" not in t.morph and "Tense=Pres" in t.morph)
+
+        subjects = [t for t in doc if t.dep_ in SUBJECT_DEPS]
+        brand_terms = term_dict["brand"] | term_dict["product"]
+        consumer = sum(1 for t in subjects if t.lemma_.lower() in term_dict["user"] or t.text.lower() in term_dict["user"])
+        brand = sum(1 for t in subjects if t.lemma_.lower() in brand_terms or t.text.lower() in brand_terms)
+        rows.append({
+            "informativeness": round(content / len(alpha), 3) if alpha else 0.0,
+            "narrativity": round(narrative / len(verbs), 3) if verbs else 0.0,
+            "syntax_complexity": round(clauses * 1.5 + max_depth * 1.2 + subtrees * 1.0, 2),
+            "cb_ratio": float("inf") if brand == 0 and consumer > 0 else 0.0 if brand == 0 else consumer / brand,
+            "tense_past": past,
+            "tense_present": present,
+        })
+    return pd.DataFrame(rows, index=index)
+
+
+@unittest.skipIf(spacy is None, "spaCy is not installed")
+class TestSpacyMeasures(unittest.TestCase):
+    """Tests for the array-based spaCy measures against the per-token loop."""
+
+    def test_000_same_as_per_token_loop(self):
+        """Every column matches the per-token loop on hand-built parses."""
+        analyzer = SpacyAnalyzer(SpacyParser("blank:en", store=False))
+        vocab = analyzer.parser.nlp.vocab
+        docs = [Doc(vocab, words=words, heads=heads, deps=deps, pos=pos, lemmas=lemmas, morphs=morphs)
+                for words, heads, deps, pos, lemmas, morphs in PARSES]
+        captions = pd.Series([doc.text for doc in docs], index=range(10, 10 + len(docs)))
+
+        scores = analyzer.score_spacy_measures(captions, docs=docs)
+        expected = per_token_measures(docs, analyzer.term_dict, captions.index)
+        pd.testing.assert_frame_equal(scores, expected, check_dtype=False)
+        self.assertEqual(scores["cb_ratio"].tolist()[:3], [1.0, 0.0, float("inf")])
+        self.assertEqual(scores["tense_past"].tolist(), [2, 0, 2, 1, 0])
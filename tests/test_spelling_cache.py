@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.linguistic_features.spelling_cache`."""
+
+
+import os
+import re
+import sys
+import tempfile
+import types
+import unittest
+from unittest import mock
+
+import pandas as pd
+
+from tom_text_toolbox.linguistic_features.mistakes_score import count_spelling_mistakes
+from tom_text_toolbox.linguistic_features.spelling_cache import SpellingCache
+
+CAPTIONS = pd.Series([
+    "Ths is a tset of teh NASA Spelling checker",
+    "all good here, see www.exmple.com and http://x.co/abcd",
+    None,
+    "Ths ths THS Ths",
+], index=[5, 6, 7, 8])
+WORDS = {"is", "a", "of", "the", "test", "spelling", "checker", "all", "good", "here", "see", "and"}
+
+
+class FakeChecker:
+    """Stands in for enchant.Dict: knows WORDS and records every word it is asked about."""
+
+    def __init__(self, tag="en_US", provider_file="/nonexistent/libenchant_hunspell.so"):
+        self.tag = tag
+        self.provider = types.SimpleNamespace(name="hunspell", file=provider_file)
+        self.asked = []
+
+    def check(self, word):
+        self.asked.append(word)
+        return word in WORDS
+
+
+def baseline_mistakes(captions: pd.Series, checker) -> pd.Series:
+    # The original per-caption loop
+    def find_mistakes(text):
+        if pd.isna(text):
+            return 0
+        words = re.findall(r"\b[a-zA-Z]+\b", re.sub(r"http\S+|www\.\S+", "", str(text)))
+        return sum(not checker.check(w.lower()) for w in words if not w.isupper() and not w.istitle())
+    return captions.apply(find_mistakes)
+
+
+class TestSpellingCache(unittest.TestCase):
+    """Words are checked once per dictionary; another dictionary gets another cache."""
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.store = os.path.join(self.dir.name, "store")
+        self.config = os.path.join(self.dir.name, "config")
+        os.makedirs(os.path.join(self.config, "hunspell"))
+        self.dic = os.path.join(self.config, "hunspell", "en_US.dic")
+        with open(self.dic, "w") as f:
+            f.write("1\nthe\n")
+        enchant = types.SimpleNamespace(get_enchant_version=lambda: "2.3.0")
+        self.patches = [mock.patch.dict(sys.modules, {"enchant": enchant}),
+                        mock.patch.dict(os.environ, {"ENCHANT_CONFIG_DIR": self.config})]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.dir.cleanup()
+
+    def test_000_counts_match_per_caption_loop(self):
+        checker = FakeChecker()
+        counts = count_spelling_mistakes(CAPTIONS, cache=SpellingCache(checker=checker, store_dir=self.store))
+        pd.testing.assert_series_equal(counts, baseline_mistakes(CAPTIONS, FakeChecker()), check_dtype=False)
+        # Each distinct word was asked about once
+        self.assertEqual(len(checker.asked), len(set(checker.asked)))
+
+    def test_001_results_persist(self):
+        SpellingCache(checker=FakeChecker(), store_dir=self.store).check(["ths", "the"])
+        checker = FakeChecker()
+        cache = SpellingCache(checker=checker, store_dir=self.store)
+        self.assertEqual(cache.check(["the", "ths", "tset"]).tolist(), [True, False, False])
+        self.assertEqual(checker.asked, ["tset"])
+
+    def test_002_key_follows_dictionary(self):
+        """Language, enchant version and the dictionary file's size/mtime are all part of the key."""
+        path = SpellingCache(checker=FakeChecker(), store_dir=self.store).path
+        self.assertEqual(SpellingCache(checker=FakeChecker(), store_dir=self.store).path, path)
+        self.assertNotEqual(SpellingCache("en_GB", checker=FakeChecker("en_GB"), store_dir=self.store).path, path)
+
+        with open(self.dic, "a") as f:
+            f.write("tset\n")
+        updated = SpellingCache(checker=FakeChecker(), store_dir=self.store)
+        self.assertNotEqual(updated.path, path)
+
+        with mock.patch.dict(sys.modules, {"enchant": types.SimpleNamespace(get_enchant_version=lambda: "2.6.0")}):
+            self.assertNotEqual(SpellingCache(checker=FakeChecker(), store_dir=self.store).path, updated.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
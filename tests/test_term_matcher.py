@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+
+"""Tests for `tom_text_toolbox.linguistic_features.term_matcher`."""
+
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from tom_text_toolbox.linguistic_features.dictionary_scores import TermCounter
+from tom_text_toolbox.linguistic_features.term_matcher import TermMatcher
+
+CAPTIONS = pd.Series([
+    "Buy now!!! Limited-time offer :) #sale",
+    "I can't believe it's not butter... or is it?",
+    "new new NEW news, renewed and newer",
+    "e-mail me @ shop.example.com / call 555-0100",
+    ":-) smile :) :( frown",
+    "",
+    "___ under_score __init__",
+    np.nan,
+])
+
+TERMS = {
+    "plain": ["new", "news", "it"],
+    "wildcard": ["new*", "butt*", "smil*"],
+    "punctuation": [":)", ":(", ":-)", "...", "!!", "!"],
+    "mixed": ["e-mail", "can't", "limited-time", "shop.", ".com", "-0100"],
+    "overlap": ["new new", "new", "new news"],
+    "underscore": ["_", "under_*", "__init__"],
+}
+
+
+def regex_counts(counter: TermCounter, captions: pd.Series) -> pd.DataFrame:
+    # The original count_all: one regex per category, counted by str.count
+    return pd.DataFrame({category: counter.count_terms(captions, category) for category in counter.term_dict})
+
+
+class TestTermMatcher(unittest.TestCase):
+    """The single-pass matcher counts exactly what the per-category regexes count."""
+
+    def assert_same_as_regex(self, term_dict, captions, ignore_case=False):
+        counter = TermCounter(term_dict, ignore_case=ignore_case)
+        matched = TermMatcher(term_dict, ignore_case=ignore_case).count(captions)
+        pd.testing.assert_frame_equal(matched, regex_counts(counter, captions), check_dtype=False)
+
+    def test_000_word_boundaries_and_wildcards(self):
+        """`\\b` around plain terms and `\\w*` after `*` terms, including terms made of punctuation."""
+        self.assert_same_as_regex(TERMS, CAPTIONS)
+
+    def test_001_ignore_case(self):
+        self.assert_same_as_regex(TERMS, CAPTIONS, ignore_case=True)
+
+    def test_002_no_overlapping_matches(self):
+        """Matches are counted left to right without overlaps, the earliest listed term winning."""
+        counts = TermMatcher({"overlap": ["new new", "new"]}).count(pd.Series(["new new new"]))
+        self.assertEqual(counts["overlap"].tolist(), [2])
+        self.assertEqual(TermMatcher({"x": ["aa*"]}).count(pd.Series(["aaaa aa a"]))["x"].tolist(), [2])
+
+    def test_003_missing_captions_stay_nan(self):
+        counts = TermMatcher({"plain": ["it"]}).count(pd.Series([np.nan, "it"]))
+        self.assertTrue(np.isnan(counts["plain"].iloc[0]))
+        self.assertEqual(counts["plain"].iloc[1], 1)
+
+    def test_004_shipped_term_dictionary(self):
+        """Every category of term_dict.json on sample captions."""
+        counter = TermCounter.from_json()
+        pd.testing.assert_frame_equal(counter.matcher.count(CAPTIONS), regex_counts(counter, CAPTIONS),
+                                      check_dtype=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
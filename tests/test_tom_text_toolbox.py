@@ -3,19 +3,40 @@
 """Tests for `tom_text_toolbox` package."""
 
 
+import subprocess
+import sys
 import unittest
 
-from tom_text_toolbox import tom_text_toolbox
+import tom_text_toolbox
 
+HEAVY_MODULES = ["nltk", "spacy", "torch", "transformers", "enchant", "PassivePySrc"]
 
-class TestTom_text_toolbox(unittest.TestCase):
-    """Tests for `tom_text_toolbox` package."""
 
-    def setUp(self):
-        """Set up test fixtures, if any."""
+def loaded_after(statement):
+    """Heavy modules present in a fresh interpreter after running `statement`."""
+    code = f"import sys\n{statement}\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    return [m for m in output.strip().split(",") if m]
+
 
-    def tearDown(self):
-        """Tear down test fixtures, if any."""
+class TestTom_text_toolbox(unittest.TestCase):
+    """Tests for `tom_text_toolbox` package."""
 
-    def test_000_something(self):
-        """Test something."""
+    def test_000_public_names(self):
+        """Every name in __all__ resolves to the object it names."""
+        for name in tom_text_toolbox.__all__:
+            with self.subTest(name=name):
+                self.assertIn(name, dir(tom_text_toolbox))
+                self.assertEqual(getattr(tom_text_toolbox, name).__name__, name)
+        with self.assertRaises(AttributeError):
+            tom_text_toolbox.not_a_scorer
+
+    def test_001_bare_import_is_lazy(self):
+        """Importing the package loads no heavy library."""
+        self.assertEqual(loaded_after("import tom_text_toolbox"), [])
+
+    def test_002_pipeline_import_is_lazy(self):
+        """Heavy libraries wait until a scorer actually runs."""
+        self.assertEqual(loaded_after("from tom_text_toolbox import TermCounter, analyse_features"), [])
+        self.assertEqual(loaded_after("from tom_text_toolbox import *"), [])
+        self.assertEqual(loaded_after("from tom_text_toolbox.main import feature_stages; feature_stages()"), [])
@@ -4,37 +4,48 @@ __author__ = """Thomas Young"""
 __email__ = "thomasyoung0416@gmail.com"
 __version__ = "0.0.1"
 
-# Core pipeline functions
-from .main import read_file, process_captions, analyse_features
-
-# Expose linguistic feature scorers directly
-from .linguistic_features.abstract_concrete_score import classify_abstract_concrete
-from .linguistic_features.familiarity_score import classify_familiarity
-from .linguistic_features.mind_miner_score import classify_mind_miner
-from .linguistic_features.mistakes_score import count_spelling_mistakes
-from .linguistic_features.passive_voice_score import count_passive
-from .linguistic_features.levdist_scores import classify_levdist
-from .linguistic_features.dictionary_scores import TermCounter
-from .linguistic_features.spacy_measure_scores import SpacyAnalyzer
-from .linguistic_features.nrc_scores import classify_nrc_dict
-from .linguistic_features.whissell_scores import classify_whissell_scores
-from .linguistic_features.figurative_speech_scores import classify_figures_of_speech
-from .linguistic_features.liwc_scores import classify_liwc
-
-__all__ = [
-    "read_file",
-    "process_captions",
-    "analyse_features",
-    "classify_abstract_concrete",
-    "classify_familiarity",
-    "classify_mind_miner",
-    "count_spelling_mistakes",
-    "count_passive",
-    "classify_levdist",
-    "TermCounter",
-    "SpacyAnalyzer",
-    "classify_nrc_dict",
-    "classify_whissell_scores",
-    "classify_figures_of_speech",
-    "classify_liwc",
-]
+import importlib
+
+# Public name -> module that defines it. Nothing is imported until a name is
+# first used, so `import tom_text_toolbox` does not load pandas, NLTK, spaCy,
+# torch or any model.
+_LAZY_EXPORTS = {
+    # Core pipeline functions
+    "read_file": ".main",
+    "process_captions": ".main",
+    "analyse_features": ".main",
+    "available_features": ".main",
+    "Profiler": ".profiling",
+
+    # Expose linguistic feature scorers directly
+    "classify_abstract_concrete": ".linguistic_features.abstract_concrete_score",
+    "classify_familiarity": ".linguistic_features.familiarity_score",
+    "classify_mind_miner": ".linguistic_features.mind_miner_score",
+    "count_spelling_mistakes": ".linguistic_features.mistakes_score",
+    "count_passive": ".linguistic_features.passive_voice_score",
+    "classify_levdist": ".linguistic_features.levdist_scores",
+    "TermCounter": ".linguistic_features.dictionary_scores",
+    "SpacyAnalyzer": ".linguistic_features.spacy_measure_scores",
+    "SpacyParser": ".linguistic_features.spacy_parse",
+    "classify_nrc_dict": ".linguistic_features.nrc_scores",
+    "classify_whissell_scores": ".linguistic_features.whissell_scores",
+    "classify_emoji_sentiment": ".linguistic_features.emoji_features",
+    "readability_scores": ".linguistic_features.readability_score",
+    "classify_figures_of_speech": ".linguistic_features.figurative_speech_scores",
+    "classify_speech_acts": ".linguistic_features.speech_act_scores",
+    "classify_liwc": ".linguistic_features.liwc_scores",
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _LAZY_EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_LAZY_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
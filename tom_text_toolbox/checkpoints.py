@@ -0,0 +1,123 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from typing import Any, Dict, List, Optional
+
+from . import __version__
+from .linguistic_features.paths import cache_dir
+from .scheduler import Stage
+
+MANIFEST = "manifest.json"
+
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    """SHA-256 of a file's bytes, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: str, write):
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        write(f)
+    os.replace(tmp, path)
+
+
+class RunCheckpoints:
+    """Stage outputs of one analyse_features run, saved as each stage finishes.
+
+    The run directory holds one pickle per (chunk, stage) and a manifest with
+    the input file's hash, the run settings, and per chunk its row range and
+    the version of every stage saved for it. A rerun on the same input and
+    settings finds the directory again (by default it is keyed by both under
+    the toolbox cache) and only runs the stages and chunks not saved yet.
+    """
+
+    def __init__(self, file: str, settings: Dict[str, Any], run_dir: Optional[str] = None):
+        self.input_hash = file_hash(file)
+        self.settings = json.loads(json.dumps(settings))
+        if run_dir is None:
+            key = json.dumps({"input": self.input_hash, **self.settings}, sort_keys=True)
+            run_dir = cache_dir("runs", hashlib.sha256(key.encode("utf-8")).hexdigest()[:16])
+        os.makedirs(run_dir, exist_ok=True)
+        self.run_dir = run_dir
+        self.manifest_path = os.path.join(run_dir, MANIFEST)
+
+        manifest = None
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("input_hash") != self.input_hash or manifest.get("settings") != self.settings:
+                print(f"♻️ Checkpoints in {run_dir} belong to another input or settings; starting over.")
+                self.clear()
+                manifest = None
+        self.manifest = manifest or {"input_file": os.path.abspath(file), "input_hash": self.input_hash,
+                                     "settings": self.settings, "chunks": {}}
+        self._save_manifest()
+
+    @property
+    def saved(self) -> int:
+        """Number of stage results already on disk."""
+        return sum(len(chunk["stages"]) for chunk in self.manifest["chunks"].values())
+
+    def _save_manifest(self):
+        os.makedirs(self.run_dir, exist_ok=True)
+        payload = json.dumps(self.manifest, indent=2).encode("utf-8")
+        _write_atomic(self.manifest_path, lambda f: f.write(payload))
+
+    def chunk(self, index: int, start: int, stop: int) -> "ChunkCheckpoint":
+        """The checkpoints of chunk `index`, rows [start, stop) of the input."""
+        key = str(index)
+        entry = self.manifest["chunks"].get(key)
+        if entry is None or entry["rows"] != [start, stop]:
+            entry = self.manifest["chunks"][key] = {"rows": [start, stop], "stages": {}}
+        return ChunkCheckpoint(self, key, entry)
+
+    def clear(self):
+        """Delete the manifest and saved chunks (and the run directory if that leaves it empty)."""
+        for name in os.listdir(self.run_dir):
+            path = os.path.join(self.run_dir, name)
+            if name.startswith("chunk-") and os.path.isdir(path):
+                shutil.rmtree(path, ignore_errors=True)
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+        if not os.listdir(self.run_dir):
+            os.rmdir(self.run_dir)
+
+
+class ChunkCheckpoint:
+    """Saved stage results of one chunk; `load` and `save` plug into scheduler.run_stages."""
+
+    def __init__(self, run: RunCheckpoints, key: str, entry: dict):
+        self.run = run
+        self.entry = entry
+        self.directory = os.path.join(run.run_dir, f"chunk-{int(key):05d}")
+
+    @staticmethod
+    def _version(stage: Stage) -> str:
+        return f"{__version__}|{stage.version}"
+
+    def _path(self, stage: Stage) -> str:
+        return os.path.join(self.directory, f"{stage.name}.pkl")
+
+    def load(self, stages: List[Stage]) -> Dict[str, Any]:
+        """{stage name: result} for the stages saved with their current version."""
+        results = {}
+        for stage in stages:
+            if self.entry["stages"].get(stage.name) != self._version(stage) or not os.path.exists(self._path(stage)):
+                continue
+            with open(self._path(stage), "rb") as f:
+                results[stage.name] = pickle.load(f)
+        return results
+
+    def save(self, stage: Stage, result: Any):
+        """Write one stage's result, then record it in the manifest."""
+        os.makedirs(self.directory, exist_ok=True)
+        _write_atomic(self._path(stage), lambda f: pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL))
+        self.entry["stages"][stage.name] = self._version(stage)
+        self.run._save_manifest()
@@ -0,0 +1,86 @@
+"""Command-line entry point: score a CSV/Excel file of captions.
+
+    tom_text_toolbox captions.csv -o scored.csv
+    tom_text_toolbox captions.csv --features joy anger "whissell_*" cb_ratio
+    tom_text_toolbox --list-features
+"""
+
+import argparse
+import sys
+from typing import List, Optional
+
+
+def _backend(value: str):
+    stage, sep, backend = value.partition("=")
+    if not sep:
+        raise argparse.ArgumentTypeError("Use STAGE=BACKEND, e.g. mind_miner=int8.")
+    return stage, backend
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="tom_text_toolbox", description="Score the captions in a CSV or Excel file.")
+    parser.add_argument("file", nargs="?", help="CSV, Parquet or Excel file with one caption per row.")
+    parser.add_argument("-c", "--column", default="caption", help="Caption column (default: caption).")
+    parser.add_argument("-o", "--output", default="processed_captions.csv", help="Output file, .csv or .parquet.")
+    parser.add_argument("-f", "--features", nargs="+", metavar="NAME",
+                        help="Only these output columns (names or glob patterns such as 'whissell_*').")
+    parser.add_argument("-k", "--keep", nargs="*", metavar="COLUMN",
+                        help="Only read these input columns besides the captions (default: all).")
+    parser.add_argument("--list-features", action="store_true", help="Print every feature name and exit.")
+    parser.add_argument("--chunksize", type=int, help="Stream the file this many rows at a time.")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="Worker processes (-1 for every core).")
+    parser.add_argument("--cpu-budget", type=int, help="Cores for concurrent stages (default: every core).")
+    parser.add_argument("--backend", type=_backend, action="append", default=[], metavar="STAGE=BACKEND",
+                        help="Model backend per stage, e.g. mind_miner=int8 or figurative=onnx.")
+    parser.add_argument("--no-cache", action="store_true", help="Do not read or write the feature cache.")
+    parser.add_argument("--cache-size-mb", type=int, default=1024, help="Feature cache size bound.")
+    parser.add_argument("--checkpoint", action="store_true", help="Save each stage's output so a failed run resumes.")
+    parser.add_argument("--run-dir", help="Directory for the stage checkpoints (default: in the toolbox cache).")
+    parser.add_argument("--profile", action="store_true",
+                        help="Write a per-stage profile (<output>_profile.json): time, memory, slowest captions.")
+    parser.add_argument("--no-dedupe", action="store_true", help="Score duplicate captions separately.")
+    parser.add_argument("--liwc", action="store_true", help="Also run the LIWC analysis on the output.")
+    parser.add_argument("--custom-dictionary", help="LIWC custom dictionary.")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    # The pipeline is imported only once we know there is work to do
+    from .main import analyse_features, available_features
+
+    if args.list_features:
+        print("\n".join(available_features()))
+        return 0
+    if not args.file:
+        build_parser().error("a file is required (or use --list-features)")
+
+    try:
+        result = analyse_features(
+            args.file,
+            column=args.column,
+            liwc=args.liwc,
+            custom_dictionary=args.custom_dictionary,
+            chunksize=args.chunksize,
+            output_file=args.output,
+            n_workers=args.workers,
+            cache=not args.no_cache,
+            cache_size_mb=args.cache_size_mb,
+            backends=dict(args.backend) or None,
+            dedupe=not args.no_dedupe,
+            cpu_budget=args.cpu_budget,
+            features=args.features,
+            keep_columns=args.keep,
+            checkpoint=args.checkpoint,
+            run_dir=args.run_dir,
+            profile=args.profile,
+        )
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    return 0 if result is not None else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+import hashlib
+import os
+import pandas as pd
+from typing import Iterator, List, Optional, Sequence
+
+from .linguistic_features.paths import cache_dir
+
+PARQUET_SUFFIXES = (".parquet", ".pq")
+# Excel formats openpyxl can stream row by row
+STREAMING_EXCEL_SUFFIXES = (".xlsx", ".xlsm")
+# Rows per row group in the cached columnar copies of Excel files
+ROW_GROUP_SIZE = 50_000
+
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as e:
+        raise ImportError("Parquet input and output need pyarrow: "
+                          "pip install 'tom-text-toolbox[parquet]'") from e
+    return pa, pq
+
+
+def has_pyarrow() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def is_parquet(file: str) -> bool:
+    return file.lower().endswith(PARQUET_SUFFIXES)
+
+
+def iter_excel(file: str, chunksize: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Yield the first sheet of an .xlsx/.xlsm file `chunksize` rows at a time (only `columns` if given)."""
+    # openpyxl's read-only mode streams rows instead of loading the whole sheet
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        start, batch = 0, []
+        for row in rows:
+            batch.append(row)
+            if len(batch) == chunksize:
+                df = pd.DataFrame(batch, columns=header, index=range(start, start + len(batch)))
+                yield df if columns is None else df[columns]
+                start, batch = start + len(batch), []
+        if batch:
+            df = pd.DataFrame(batch, columns=header, index=range(start, start + len(batch)))
+            yield df if columns is None else df[columns]
+    finally:
+        workbook.close()
+
+
+def _as_text(values: pd.Series) -> list:
+    return [None if v is None or (isinstance(v, float) and v != v) else str(v) for v in values]
+
+
+def _to_arrow(values: pd.Series, kind=None):
+    pa, _ = _pyarrow()
+    if kind is None and not len(values.dropna()):
+        # All missing here: typed as text so that later chunks can fill it in
+        kind = pa.string()
+    if kind is not None and pa.types.is_integer(kind) and pd.api.types.is_float_dtype(values):
+        # An integer column with missing values in this chunk
+        values = values.astype("Int64")
+    try:
+        return pa.array(values, type=kind, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, TypeError):
+        if kind is not None and kind != pa.string():
+            raise ValueError(f"Column '{values.name}' does not fit the {kind} type of the first chunk.")
+        # Mixed-type object columns (common in Excel sheets) are kept as text
+        return pa.array(_as_text(values), type=pa.string())
+
+
+def arrow_table(df: pd.DataFrame, float32: Sequence[str] = (), lists: Sequence[str] = (), schema=None):
+    """`df` as an Arrow table without its index.
+
+    Float columns named in `float32` are stored as float32 and the columns in
+    `lists` as list<string>. With `schema` (that of the first chunk), every
+    column is converted to the type it had there, so all chunks of one file
+    share a schema.
+    """
+    pa, _ = _pyarrow()
+    names = [str(c) for c in df.columns]
+    if schema is not None and names != schema.names:
+        raise ValueError(f"Columns {names} differ from the first chunk's {schema.names}.")
+
+    arrays = []
+    for name, column in zip(names, df.columns):
+        values = df[column]
+        if schema is not None:
+            kind = schema.field(name).type
+        elif name in lists:
+            kind = pa.list_(pa.string())
+        elif name in float32 and pd.api.types.is_float_dtype(values):
+            kind = pa.float32()
+        else:
+            kind = None
+        arrays.append(_to_arrow(values, kind))
+    return pa.Table.from_arrays(arrays, names=names)
+
+
+class ParquetOutput:
+    """A Parquet file written one row group per `write` call.
+
+    The first DataFrame fixes the schema; the file is only complete (and
+    readable) once `close` has written its footer.
+    """
+
+    def __init__(self, path: str, float32: Sequence[str] = (), lists: Sequence[str] = (),
+                 compression: str = "zstd"):
+        self.path = path
+        self.float32, self.lists = list(float32), list(lists)
+        self.compression = compression
+        self._writer = None
+
+    def write(self, df: pd.DataFrame):
+        _, pq = _pyarrow()
+        schema = self._writer.schema if self._writer is not None else None
+        table = arrow_table(df, self.float32, self.lists, schema=schema)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(self.path, table.schema, compression=self.compression)
+        self._writer.write_table(table, row_group_size=max(1, len(df)))
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+# Workbook versions whose columns could not share one Parquet schema (read directly instead)
+_UNCONVERTIBLE = set()
+
+
+def excel_copy(file: str) -> Optional[str]:
+    """Path of a Parquet copy of an Excel file, converted on first use.
+
+    The copy lives in the toolbox cache and is keyed by the file's path,
+    size and modification time, so an edited workbook is converted again.
+    .xlsx/.xlsm sheets are converted row group by row group. Returns None
+    when pyarrow is not installed or a column's type changes between row
+    groups; the workbook is then read directly with pandas/openpyxl.
+    """
+    if not has_pyarrow():
+        return None
+    stat = os.stat(file)
+    key = hashlib.sha256(f"{os.path.abspath(file)}|{stat.st_size}|{stat.st_mtime_ns}".encode()).hexdigest()[:16]
+    stem = os.path.splitext(os.path.basename(file))[0]
+    path = os.path.join(cache_dir("inputs"), f"{stem}-{key}.parquet")
+    if os.path.exists(path):
+        return path
+    if key in _UNCONVERTIBLE:
+        return None
+
+    print(f"📑 Converting {os.path.basename(file)} to a columnar copy (once per file version)...")
+    if file.lower().endswith(STREAMING_EXCEL_SUFFIXES):
+        chunks = iter_excel(file, ROW_GROUP_SIZE)
+    else:
+        # Older formats cannot be streamed; pandas reads the sheet in one go
+        df = pd.read_excel(file)
+        chunks = (df.iloc[start:start + ROW_GROUP_SIZE] for start in range(0, len(df), ROW_GROUP_SIZE))
+
+    output = ParquetOutput(f"{path}.{os.getpid()}.tmp")
+    converted = False
+    try:
+        for chunk in chunks:
+            output.write(chunk)
+            converted = True
+    except ValueError as e:
+        print(f"⚠️ Reading {os.path.basename(file)} as Excel: {e}")
+        converted = False
+    finally:
+        output.close()
+    if not converted:
+        # Empty sheet or mixed column types
+        _UNCONVERTIBLE.add(key)
+        if os.path.exists(output.path):
+            os.remove(output.path)
+        return None
+    os.replace(output.path, path)
+    return path
+
+
+def file_columns(file: str) -> List[str]:
+    """Column names of a CSV, Parquet or Excel file, without reading its rows."""
+    if file.endswith(".csv"):
+        return list(pd.read_csv(file, nrows=0).columns)
+    if is_parquet(file):
+        _, pq = _pyarrow()
+        return pq.read_schema(file).names
+    copy = excel_copy(file)
+    if copy is not None:
+        _, pq = _pyarrow()
+        return pq.read_schema(copy).names
+    return list(pd.read_excel(file, nrows=0).columns)
+
+
+def check_columns(file: str, columns: Optional[List[str]]):
+    if columns is None:
+        return
+    missing = [c for c in columns if c not in file_columns(file)]
+    if missing:
+        raise ValueError(f"Column(s) {missing} not found in {os.path.basename(file)}.")
+
+
+def read_columns(file: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """Read `columns` (default all) of a CSV, Parquet or Excel file.
+
+    Parquet reads only the requested columns from disk; Excel files are read
+    from their cached Parquet copy when pyarrow is installed, else by pandas.
+    """
+    check_columns(file, columns)
+    if file.endswith(".csv"):
+        return pd.read_csv(file, usecols=columns)
+    source = file if is_parquet(file) else excel_copy(file)
+    if source is None:
+        return pd.read_excel(file, usecols=columns)
+    _, pq = _pyarrow()
+    return pq.read_table(source, columns=columns).to_pandas()
+
+
+def iter_parquet(file: str, chunksize: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Yield `columns` of a Parquet file `chunksize` rows at a time; the index continues across chunks."""
+    _, pq = _pyarrow()
+    parquet = pq.ParquetFile(file)
+    start = 0
+    for batch in parquet.iter_batches(batch_size=chunksize, columns=columns):
+        df = batch.to_pandas()
+        df.index = pd.RangeIndex(start, start + len(df))
+        start += len(df)
+        yield df
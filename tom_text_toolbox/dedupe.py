@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from typing import Union
+
+Result = Union[pd.Series, pd.DataFrame]
+
+
+class CaptionGroups:
+    """Rows grouped by identical caption text.
+
+    Reposted captions are common across companies, platforms and profiles, so
+    every feature is computed once per distinct caption (`collapse`) and the
+    results are scattered back to all of its rows (`expand`).
+    """
+
+    def __init__(self, captions: pd.Series):
+        # Codes are numbered in order of first appearance, so unique() gives the first row of each
+        self.codes, uniques = pd.factorize(captions, use_na_sentinel=False)
+        self.first_rows = np.unique(self.codes, return_index=True)[1]
+        self.n_rows = len(captions)
+        self.n_unique = len(uniques)
+
+    @property
+    def has_duplicates(self) -> bool:
+        return self.n_unique < self.n_rows
+
+    @property
+    def duplicate_ratio(self) -> float:
+        """Share of rows whose caption already appeared earlier (the work skipped)."""
+        return 1 - self.n_unique / self.n_rows if self.n_rows else 0.0
+
+    def collapse(self, data: Result) -> Result:
+        """One row per distinct caption (its first occurrence), on a fresh RangeIndex."""
+        return data.iloc[self.first_rows].reset_index(drop=True)
+
+    def expand(self, result: Result, index: pd.Index) -> Result:
+        """Scatter per-caption results back to every row, on the original `index`."""
+        expanded = result.iloc[self.codes]
+        expanded.index = index
+        return expanded
+
+
+def dedup_summary(n_rows: int, n_unique: int) -> str:
+    ratio = 1 - n_unique / n_rows if n_rows else 0.0
+    return f"{n_unique} unique captions in {n_rows} rows ({ratio:.1%} duplicates scored once)"
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+import pandas as pd
+from typing import Callable, Dict, List, Optional, Union
+
+from .linguistic_features.paths import cache_dir
+
+DEFAULT_MAX_BYTES = 1 << 30
+# Stays below SQLite's limit on bound parameters per statement
+_BATCH = 500
+# Key of the single value stored for stages that return a Series
+_SERIES_KEY = "__series__"
+
+Result = Union[pd.Series, pd.DataFrame]
+
+
+def text_hash(text) -> str:
+    """Content hash of one caption (non-strings are hashed by their repr)."""
+    raw = text if isinstance(text, str) else f"\0{text!r}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def _to_json(value) -> str:
+    # numpy scalars -> Python; json writes NaN/inf as NaN/Infinity and reads them back
+    return json.dumps(value, default=lambda o: o.item() if hasattr(o, "item") else str(o))
+
+
+class FeatureCache:
+    """On-disk cache of per-caption feature values, keyed by (caption hash, feature).
+
+    Each entry records the feature version (model, dictionary or code
+    version). A lookup with a different version is a miss, and the fresh
+    value replaces the stale one. The SQLite file is kept under `max_bytes`
+    by evicting the least recently used entries.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.path = path or os.path.join(cache_dir("features"), "features.sqlite")
+        self.max_bytes = max_bytes
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS features ("
+                "text_hash TEXT NOT NULL, feature TEXT NOT NULL, version TEXT NOT NULL, "
+                "value TEXT NOT NULL, size INTEGER NOT NULL, last_used REAL NOT NULL, "
+                "PRIMARY KEY (text_hash, feature))"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS features_last_used ON features (last_used)")
+            # Running total of `size`, kept by triggers in the same transaction as every write,
+            # so the size check after each put does not scan the table (filled once for older files)
+            connection.execute("CREATE TABLE IF NOT EXISTS cache_size "
+                               "(id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL)")
+            connection.execute("INSERT OR IGNORE INTO cache_size SELECT 0, COALESCE(SUM(size), 0) FROM features")
+            connection.execute("CREATE TRIGGER IF NOT EXISTS features_insert AFTER INSERT ON features "
+                               "BEGIN UPDATE cache_size SET total = total + NEW.size; END")
+            connection.execute("CREATE TRIGGER IF NOT EXISTS features_delete AFTER DELETE ON features "
+                               "BEGIN UPDATE cache_size SET total = total - OLD.size; END")
+            connection.execute("CREATE TRIGGER IF NOT EXISTS features_resize AFTER UPDATE OF size ON features "
+                               "BEGIN UPDATE cache_size SET total = total + NEW.size - OLD.size; END")
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        # Rows replaced by INSERT OR REPLACE only fire the delete trigger with this on
+        connection.execute("PRAGMA recursive_triggers = ON")
+        return connection
+
+    def total_size(self) -> int:
+        """Stored bytes counted against `max_bytes`."""
+        with self._connect() as connection:
+            return connection.execute("SELECT total FROM cache_size").fetchone()[0]
+
+    def get(self, feature: str, version: str, hashes: List[str]) -> Dict[str, dict]:
+        """Return {hash: stored row} for the hashes cached under this feature version."""
+        found = {}
+        with self._connect() as connection:
+            for start in range(0, len(hashes), _BATCH):
+                batch = hashes[start:start + _BATCH]
+                rows = connection.execute(
+                    f"SELECT text_hash, value FROM features WHERE feature = ? AND version = ? "
+                    f"AND text_hash IN ({','.join('?' * len(batch))})",
+                    [feature, version, *batch],
+                )
+                found.update((h, json.loads(value)) for h, value in rows)
+            now = time.time()
+            connection.executemany("UPDATE features SET last_used = ? WHERE text_hash = ? AND feature = ?",
+                                   [(now, h, feature) for h in found])
+        return found
+
+    def put(self, feature: str, version: str, rows: Dict[str, dict]):
+        """Store {hash: row} under this feature version, then evict down to the size bound."""
+        now = time.time()
+        records = []
+        for h, row in rows.items():
+            value = _to_json(row)
+            records.append((h, feature, version, value, len(value) + len(h) + len(feature) + len(version), now))
+        with self._connect() as connection:
+            connection.executemany("INSERT OR REPLACE INTO features VALUES (?, ?, ?, ?, ?, ?)", records)
+        self.evict()
+
+    def evict(self) -> int:
+        """Drop least recently used entries until the cache is at 90% of `max_bytes`."""
+        with self._connect() as connection:
+            total = connection.execute("SELECT total FROM cache_size").fetchone()[0]
+            if total <= self.max_bytes:
+                return 0
+            excess, stale = total - int(self.max_bytes * 0.9), []
+            for rowid, size in connection.execute("SELECT rowid, size FROM features ORDER BY last_used"):
+                stale.append((rowid,))
+                excess -= size
+                if excess <= 0:
+                    break
+            connection.executemany("DELETE FROM features WHERE rowid = ?", stale)
+        return len(stale)
+
+    def invalidate(self, feature: str, keep_version: Optional[str] = None) -> int:
+        """Delete the entries of `feature` (except those at `keep_version`); returns how many."""
+        with self._connect() as connection:
+            if keep_version is None:
+                cursor = connection.execute("DELETE FROM features WHERE feature = ?", (feature,))
+            else:
+                cursor = connection.execute("DELETE FROM features WHERE feature = ? AND version != ?",
+                                            (feature, keep_version))
+        return cursor.rowcount
+
+    def cached_stage(self, feature: str, version: str, captions: pd.Series,
+                     compute: Callable[[pd.Series], Result], verbose: bool = True) -> Result:
+        """Run `compute` on the captions missing from the cache only and merge in the cached rows.
+
+        `compute` takes a Series of captions and returns a Series or DataFrame
+        on the same index. Each distinct caption text is computed at most once.
+        """
+        if len(captions) == 0:
+            return compute(captions)
+
+        hashes = [text_hash(c) for c in captions]
+        first_seen = {}
+        for position, h in enumerate(hashes):
+            first_seen.setdefault(h, position)
+
+        found = self.get(feature, version, list(first_seen))
+        missing = [h for h in first_seen if h not in found]
+        if verbose:
+            hits = sum(h in found for h in hashes)
+            print(f"🗄️ {feature}: {hits}/{len(hashes)} captions cached ({hits / len(hashes):.0%}), "
+                  f"computing {len(missing)} new")
+
+        if missing:
+            result = compute(captions.iloc[[first_seen[h] for h in missing]])
+            if isinstance(result, pd.Series):
+                new_rows = [{_SERIES_KEY: value} for value in result.tolist()]
+            else:
+                new_rows = result.to_dict(orient="records")
+            new = dict(zip(missing, new_rows))
+            self.put(feature, version, new)
+            # Round-trip through JSON so fresh and cached rows have the same types
+            found.update({h: json.loads(_to_json(row)) for h, row in new.items()})
+
+        rows = [found[h] for h in hashes]
+        if list(rows[0]) == [_SERIES_KEY]:
+            return pd.Series([row[_SERIES_KEY] for row in rows], index=captions.index)
+        return pd.DataFrame(rows, index=captions.index)
+
+
+def run_cached(cache: Optional[FeatureCache], feature: str, version: str, captions: pd.Series,
+               compute: Callable[[pd.Series], Result], verbose: bool = True) -> Result:
+    """`cache.cached_stage(...)`, or just `compute(captions)` when caching is off."""
+    if cache is None:
+        return compute(captions)
+    return cache.cached_stage(feature, version, captions, compute, verbose=verbose)
+
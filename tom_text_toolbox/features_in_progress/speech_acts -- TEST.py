@@ -1,16 +1,18 @@
-from transformers.pipelines import pipeline
+from transformers import AutoTokenizer
 import torch
 import time
 import pandas as pd
 
-def load_model(model_name:str = "valhalla/distilbart-mnli-12-1"):
-    device = "cuda" if torch.cuda.is_available() else "cpu"
+from linguistic_features.inference import InferenceEngine, zero_shot_scores
+from linguistic_features.model_backends import load_model as load_backend_model
 
-    print(f"Loading model {model_name} on {device}...")
+def load_model(model_name:str = "valhalla/distilbart-mnli-12-1", backend:str = "torch"):
+    print(f"Loading model {model_name} ({backend})...")
 
-    classifier = pipeline("zero-shot-classification", model = model_name, device = device)
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = load_backend_model(model_name, "sequence-classification", backend)
 
-    return classifier
+    return tokenizer, model
 
 def speech_act_labels():
     label_definitions = {
@@ -23,16 +25,16 @@ def speech_act_labels():
 
 def main(captions: pd.Series|list):
     print("Loading model and labels...")
-    classifier = load_model()
+    tokenizer, model = load_model()
     labels = speech_act_labels()
     if isinstance(captions, pd.Series):
         captions = captions.tolist()
     print("Running inference... This may take a while for large datasets.")
-    results = classifier(captions, candidate_labels=labels)
+    engine = InferenceEngine(tokenizer, name="Speech acts", device=model.device)
+    scores = zero_shot_scores(engine, model, captions, labels)
 
-    predicted_labels = [r['labels'][0] for r in results]
-    predicted_scores = [r['scores'][0] for r in results]
-    return pd.DataFrame({'label': predicted_labels, 'score': predicted_scores})
+    best = scores.argmax(axis=1)
+    return pd.DataFrame({'label': [labels[i] for i in best], 'score': scores.max(axis=1)})
 
 
 ####################################
@@ -1,12 +1,16 @@
 import pandas as pd
 import numpy as np
-import nltk
-from nltk.corpus import stopwords as nltk_stopwords
+
+from .lexicon_matrix import CountMatrix
+from .lexicon_store import load_lexicon
+from .tokens import TokenizedCaptions, english_stopwords
 
 # -----------------------------
 # Load Brysbaert dictionary
 # -----------------------------
-def load_brysbaert_dictionary(dict_path="tom_text_toolbox/linguistic_dictionaries/ac_brysbaert_dict.csv"):
+def load_brysbaert_dictionary(dict_path=None):
+    if dict_path is None:
+        return load_lexicon("brysbaert").as_dict()
     brys_df = pd.read_csv(dict_path, usecols=["Word", "Conc.M"])
     return dict(zip(brys_df["Word"].str.lower().astype(str), brys_df["Conc.M"]))
 
@@ -15,8 +19,7 @@ def load_brysbaert_dictionary(dict_path="tom_text_toolbox/linguistic_dictionarie
 # -----------------------------
 def get_stopwords(remove_stopwords=False):
     if remove_stopwords:
-        nltk.download("stopwords", quiet=True)
-        return set(nltk_stopwords.words("english"))
+        return set(english_stopwords())
     return set()
 
 # -----------------------------
@@ -34,16 +37,19 @@ def concreteness_score_tokens(tokens, brys_dict, stop_words=set()):
     return np.mean(scores) if scores else np.nan
 
 # -----------------------------
-# Apply scoring to Series of tokenized captions
+# Apply scoring to Series of tokenized captions (vectorized)
 # -----------------------------
-def classify_abstract_concrete(token_captions: pd.Series, remove_stopwords: bool = False) -> pd.Series:
-    brys_dict = load_brysbaert_dictionary()
+def classify_abstract_concrete(token_captions: pd.Series | TokenizedCaptions, remove_stopwords: bool = False) -> pd.Series:
     stop_words = get_stopwords(remove_stopwords)
 
-    return pd.Series(
-        [concreteness_score_tokens(tokens, brys_dict, stop_words) for tokens in token_captions],
-        index=token_captions.index
-    )
+    if isinstance(token_captions, TokenizedCaptions):
+        matrix = token_captions.count_matrix("raw", lowercase=True)
+    else:
+        matrix = CountMatrix([[t.lower() for t in tokens] if isinstance(tokens, list) else [] for tokens in token_captions])
+
+    # NaN when no token is in the dictionary, as in concreteness_score_tokens
+    means, _ = matrix.lexicon_means(load_lexicon("brysbaert"), exclude=stop_words)
+    return pd.Series(means[:, 0], index=token_captions.index)
 
 # -----------------------------
 # Main execution
@@ -0,0 +1,98 @@
+import os
+import time
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, Optional, Sequence
+
+from .model_backends import BACKENDS
+from .paths import PACKAGE_DIR
+
+REFERENCE_FILE = os.path.join(PACKAGE_DIR, "text_data_TEST.csv")
+
+
+def _mind_miner(captions: pd.Series, backend: str) -> pd.DataFrame:
+    from .mind_miner_score import classify_mind_miner
+
+    return classify_mind_miner(captions, backend=backend).to_frame("mind_miner_score")
+
+
+def _figurative(captions: pd.Series, backend: str) -> pd.DataFrame:
+    from .figurative_speech_scores import classify_figures_of_speech
+
+    return classify_figures_of_speech(captions, backend=backend).drop(columns="Caption")
+
+
+def _speech_acts(captions: pd.Series, backend: str) -> pd.DataFrame:
+    from .speech_act_scores import classify_speech_acts
+
+    return classify_speech_acts(captions, backend=backend).drop(columns="speech_act")
+
+
+# Stage name -> function(captions, backend) returning a DataFrame of outputs
+STAGES: Dict[str, Callable[[pd.Series, str], pd.DataFrame]] = {
+    "mind_miner": _mind_miner,
+    "figurative": _figurative,
+    "speech_acts": _speech_acts,
+}
+
+
+def reference_captions(n: int = 200, seed: int = 0) -> pd.Series:
+    """A fixed sample of distinct, non-empty captions from text_data_TEST.csv."""
+    captions = pd.read_csv(REFERENCE_FILE)["caption"].dropna().drop_duplicates()
+    return captions.sample(n=min(n, len(captions)), random_state=seed).reset_index(drop=True)
+
+
+def accuracy_delta_report(stages: Optional[Sequence[str]] = None, backends: Sequence[str] = ("int8", "onnx"),
+                          captions: Optional[pd.Series] = None) -> pd.DataFrame:
+    """Compare each backend with fp32 PyTorch on a reference caption set.
+
+    For every stage and output column, the report gives the mean and max
+    absolute difference from the fp32 output and the share of captions with
+    the same 0/1 flag (for flag columns), plus time and speed-up per stage.
+    Backends that cannot be loaded are reported with their error.
+    """
+    stages = list(stages or STAGES)
+    captions = reference_captions() if captions is None else captions
+    rows = []
+
+    for stage in stages:
+        if stage not in STAGES:
+            raise ValueError(f"Unknown stage '{stage}'. Choose from {list(STAGES)}.")
+        start = time.perf_counter()
+        reference = STAGES[stage](captions, "torch")
+        reference_seconds = time.perf_counter() - start
+
+        for backend in backends:
+            if backend not in BACKENDS or backend == "torch":
+                raise ValueError(f"Compare against one of {[b for b in BACKENDS if b != 'torch']}.")
+            try:
+                start = time.perf_counter()
+                output = STAGES[stage](captions, backend)
+                seconds = time.perf_counter() - start
+            except Exception as e:
+                rows.append({"stage": stage, "backend": backend, "error": repr(e)})
+                continue
+
+            for column in reference.columns:
+                expected = reference[column].to_numpy(dtype=float)
+                actual = output[column].to_numpy(dtype=float)
+                difference = np.abs(actual - expected)
+                is_flag = set(np.unique(expected)) <= {0.0, 1.0}
+                rows.append({
+                    "stage": stage,
+                    "backend": backend,
+                    "column": column,
+                    "mean_abs_delta": float(difference.mean()),
+                    "max_abs_delta": float(difference.max()),
+                    "flag_agreement": float((actual == expected).mean()) if is_flag else np.nan,
+                    "seconds": seconds,
+                    "speedup": reference_seconds / seconds if seconds else np.nan,
+                })
+
+    return pd.DataFrame(rows)
+
+
+if __name__ == "__main__":
+    # python -m tom_text_toolbox.linguistic_features.backend_report
+    with pd.option_context("display.width", 160, "display.max_columns", None):
+        print(accuracy_delta_report())
@@ -2,34 +2,49 @@ import pandas as pd
 import numpy as np
 import re
 import json
+import hashlib
 import os
-import string
-import nltk
 from collections import Counter
 from typing import List, Dict, Optional
-from concurrent.futures import ThreadPoolExecutor
-from emosent import get_emoji_sentiment_rank_multiple
 
-# Download resources for tokenization
-nltk.download("punkt", quiet=True)
-nltk.download("stopwords", quiet=True)
-from nltk.tokenize import word_tokenize
-from nltk.corpus import stopwords
+from .emoji_features import emoji_name_counts
+from .parallel import run_sharded, worker_state
+from .term_matcher import TermMatcher
+from .tokens import TokenizedCaptions
+
+
+# -------------------------------------------------------
+# Shard functions for worker processes
+# -------------------------------------------------------
+def _term_counts_shard(captions: List[str]) -> np.ndarray:
+    return worker_state("term_matcher").count(pd.Series(captions)).to_numpy()
 
 
 class TermCounter:
-    def __init__(self, term_dict: Dict[str, List[str]]):
-        """Initialize TermCounter with a dictionary of term categories."""
+    # Columns count_all adds after the term categories
+    TEXT_FEATURES = ["exclamation_count", "question_count", "hashtag_count", "mention_count", "caption_length",
+                     "type_token_ratio", "alliteration_count", "repetition_count"]
+
+    def __init__(self, term_dict: Dict[str, List[str]], ignore_case: bool = False):
+        """Initialize TermCounter with a dictionary of term categories.
+
+        Matching is case-sensitive by default, which is what `count_all` has
+        always produced; pass `ignore_case=True` to fold case.
+        """
         if not isinstance(term_dict, dict):
             raise ValueError("term_dict must be a dictionary.")
         if not all(isinstance(v, list) for v in term_dict.values()):
             raise ValueError("Each value in term_dict must be a list of terms.")
         self.term_dict = term_dict
+        self.ignore_case = ignore_case
         self.patterns = {name: self.build_pattern(terms) for name, terms in term_dict.items()}
+        self.matcher = TermMatcher(term_dict, ignore_case=ignore_case)
+        # Changes whenever the terms or case handling do; used to key saved results
+        content = json.dumps([term_dict, ignore_case], sort_keys=True).encode("utf-8")
+        self.version = hashlib.sha256(content).hexdigest()[:12]
 
-    @classmethod
-    def from_json(cls, json_path: str = "linguistic_dictionaries/term_dict.json"):
-        """Load TermCounter from a JSON file."""
+    @staticmethod
+    def _read_json(json_path: str) -> dict:
         if not os.path.isabs(json_path):
             base_dir = os.path.join(os.path.dirname(__file__), "..")
             json_path = os.path.abspath(os.path.join(base_dir, json_path))
@@ -37,14 +52,24 @@ class TermCounter:
             raise FileNotFoundError(f"Cannot find term dictionary file at: {json_path}")
 
         with open(json_path, "r", encoding="utf-8") as f:
-            term_dict = json.load(f)
+            return json.load(f)
+
+    @classmethod
+    def from_json(cls, json_path: str = "linguistic_dictionaries/term_dict.json", ignore_case: bool = False):
+        """Load TermCounter from a JSON file."""
+        term_dict = cls._read_json(json_path)
 
         if not isinstance(term_dict, dict):
             raise ValueError("JSON must contain a dictionary at the top level.")
         if not all(isinstance(v, list) for v in term_dict.values()):
             raise ValueError("Each value in the JSON must be a list of terms.")
 
-        return cls(term_dict)
+        return cls(term_dict, ignore_case=ignore_case)
+
+    @classmethod
+    def column_names(cls, json_path: str = "linguistic_dictionaries/term_dict.json") -> List[str]:
+        """The columns count_all returns, without compiling any patterns."""
+        return list(cls._read_json(json_path)) + cls.TEXT_FEATURES
 
     def build_pattern(self, terms: List[str]) -> re.Pattern:
         """Compile a regex pattern for a list of terms (supports '*' wildcard)."""
@@ -52,38 +77,25 @@ class TermCounter:
             rf"\b{re.escape(term[:-1])}\w*" if term.endswith("*") else rf"\b{re.escape(term)}\b"
             for term in terms
         ]
-        return re.compile(rf"(?:{'|'.join(pattern_parts)})", re.IGNORECASE)
+        # Inline (?i) rather than re.IGNORECASE: pandas' pyarrow-backed strings
+        # match on the pattern text and drop the flags of a compiled pattern
+        case = "(?i)" if self.ignore_case else ""
+        return re.compile(rf"{case}(?:{'|'.join(pattern_parts)})")
 
     def count_terms(self, captions: pd.Series, category: str) -> pd.Series:
         """Count term matches for a specific category."""
         if category not in self.patterns:
             raise ValueError(f"Category '{category}' not found in term_dict.")
-        return captions.str.count(self.patterns[category].pattern)
+        return captions.str.count(self.patterns[category])
 
     def extract_emoji_dict(self, captions: pd.Series, parallel: bool = True, verbose: bool = False) -> Counter:
-        """Extract emoji sentiment counts from text."""
-        emoji_counter = Counter()
-        captions = captions.astype(str)
-
-        def process_caption(caption: str) -> List[str]:
-            try:
-                results = get_emoji_sentiment_rank_multiple(caption)
-                return [item.get('emoji_sentiment_rank', {}).get('unicode_name', 'unknown') for item in results]
-            except Exception as e:
-                if verbose:
-                    print(f"Error processing text: {e}")
-                return []
-
-        if parallel:
-            with ThreadPoolExecutor() as executor:
-                all_results = list(executor.map(process_caption, captions))
-            for result in all_results:
-                emoji_counter.update(result)
-        else:
-            for caption in captions:
-                emoji_counter.update(process_caption(caption))
+        """Corpus-wide emoji counts by Unicode name.
 
-        return emoji_counter
+        `parallel` and `verbose` are kept for compatibility; the scan is one
+        precompiled regex pass (see emoji_features.classify_emoji_sentiment
+        for per-caption features).
+        """
+        return emoji_name_counts(captions)
 
     @staticmethod
     def exclamation_count(captions: pd.Series) -> pd.Series:
@@ -105,69 +117,78 @@ class TermCounter:
     def caption_length(captions: pd.Series) -> pd.Series:
         return captions.str.len()
 
-    def type_token_ratio(self, captions: pd.Series, segment_size: int = 5) -> pd.Series:
+    def type_token_ratio(self, captions: pd.Series, segment_size: int = 5,
+                         tokens: Optional[TokenizedCaptions] = None) -> pd.Series:
         """Calculate segmental type-token ratio (TTR) for each caption."""
-        def calculate_segmental_ttr(text: str) -> Optional[float]:
-            words = str(text).lower().split()
+        if tokens is None:
+            tokens = TokenizedCaptions(captions)
+
+        def calculate_segmental_ttr(words: List[str]) -> Optional[float]:
             if not words:
                 return None
             segments = [words[i:i + segment_size] for i in range(0, len(words), segment_size)]
             ttrs = [len(set(seg)) / len(seg) for seg in segments]
             return round(float(np.mean(ttrs)), 3)
-        return captions.apply(calculate_segmental_ttr)
+        return pd.Series([calculate_segmental_ttr(words) for words in tokens.whitespace], index=captions.index)
 
     # -------------------------------------------------------
     # New Features: Alliteration & Repetition
     # -------------------------------------------------------
     @staticmethod
-    def alliteration_count(captions: pd.Series) -> pd.Series:
+    def alliteration_count(captions: pd.Series, tokens: Optional[TokenizedCaptions] = None) -> pd.Series:
         """Count occurrences of alliteration per caption."""
-        stop_words = set(stopwords.words("english"))
-
-        def count_alliteration(text):
-            tokens = [
-                w.lower().strip(string.punctuation)
-                for w in word_tokenize(str(text))
-                if w.isalpha()
-            ]
-            content_words = [w for w in tokens if w not in stop_words]
+        if tokens is None:
+            tokens = TokenizedCaptions(captions)
+
+        def count_alliteration(content_words):
             count = 0
             for i in range(len(content_words) - 1):
                 if content_words[i][0] == content_words[i + 1][0]:
                     count += 1
             return count
 
-        return captions.apply(count_alliteration)
+        return pd.Series([count_alliteration(words) for words in tokens.content], index=captions.index)
 
     @staticmethod
-    def repetition_count(captions: pd.Series) -> pd.Series:
+    def repetition_count(captions: pd.Series, tokens: Optional[TokenizedCaptions] = None) -> pd.Series:
         """Count repeated words per caption."""
-        def count_repetition(text):
-            tokens = [
-                w.lower().strip(string.punctuation)
-                for w in word_tokenize(str(text))
-                if w.isalpha()
-            ]
-            counts = Counter(tokens)
+        if tokens is None:
+            tokens = TokenizedCaptions(captions)
+
+        def count_repetition(words):
+            counts = Counter(words)
             return sum(v - 1 for v in counts.values() if v > 1)
 
-        return captions.apply(count_repetition)
+        return pd.Series([count_repetition(words) for words in tokens.alpha], index=captions.index)
 
     # -------------------------------------------------------
     # Main Counting Function (Extended)
     # -------------------------------------------------------
-    def count_all(self, captions: pd.Series) -> pd.DataFrame:
-        """Count matches for all categories AND include additional text features."""
-        df_counts = pd.DataFrame({cat: captions.str.count(pat.pattern) for cat, pat in self.patterns.items()})
+    def count_all(self, captions: pd.Series, tokens: Optional[TokenizedCaptions] = None,
+                  n_workers: int = 1) -> pd.DataFrame:
+        """Count matches for all categories AND include additional text features.
+
+        With `n_workers` > 1 the term matching is sharded over worker
+        processes, each of which builds its own TermMatcher once.
+        """
+        if tokens is None:
+            tokens = TokenizedCaptions(captions, n_workers=n_workers)
+
+        if n_workers == 1:
+            df_counts = self.matcher.count(captions)
+        else:
+            shards = run_sharded(_term_counts_shard, captions.tolist(), n_workers,
+                                 state={"term_matcher": (TermMatcher, (self.term_dict, self.ignore_case))})
+            df_counts = pd.DataFrame(np.concatenate(shards), index=captions.index, columns=self.matcher.categories)
 
         df_counts['exclamation_count'] = self.exclamation_count(captions)
         df_counts['question_count'] = self.question_count(captions)
         df_counts['hashtag_count'] = self.hashtag_count(captions)
         df_counts['mention_count'] = self.mention_count(captions)
         df_counts['caption_length'] = self.caption_length(captions)
-        df_counts['type_token_ratio'] = self.type_token_ratio(captions)
-        df_counts['alliteration_count'] = self.alliteration_count(captions)
-        df_counts['repetition_count'] = self.repetition_count(captions)
+        df_counts['type_token_ratio'] = self.type_token_ratio(captions, tokens=tokens)
+        df_counts['alliteration_count'] = self.alliteration_count(captions, tokens=tokens)
+        df_counts['repetition_count'] = self.repetition_count(captions, tokens=tokens)
 
         return df_counts
 
@@ -0,0 +1,104 @@
+import re
+import numpy as np
+import pandas as pd
+from collections import Counter
+from functools import lru_cache
+from itertools import chain
+from emosent.emosent import EMOJI_SENTIMENT_DICT
+
+EMOJI_COLUMNS = ["emoji_count", "emoji_sentiment", "emoji_positive", "emoji_negative", "top_emoji"]
+
+
+class EmojiIndex:
+    """The emosent sentiment table compiled into a codepoint lookup and aligned arrays.
+
+    Every emosent entry is a single character, so one scan per caption finds
+    the same emoji as `get_emoji_sentiment_rank_multiple`. The scan only
+    pulls out non-ASCII characters (plus any ASCII entries), which is far
+    cheaper than a regex class over hundreds of astral codepoints, and then
+    keeps the ones in the table.
+    """
+
+    def __init__(self, table: dict = EMOJI_SENTIMENT_DICT):
+        self.emoji = list(table)
+        ascii_emoji = "".join(re.escape(e) for e in self.emoji if e.isascii())
+        self.pattern = re.compile(r"[^\x00-\x7f]" + (f"|[{ascii_emoji}]" if ascii_emoji else ""))
+        self.codes = {e: i for i, e in enumerate(self.emoji)}
+        self.names = np.asarray([table[e]["unicode_name"] for e in self.emoji], dtype=object)
+
+        occurrences = np.asarray([table[e]["occurrences"] for e in self.emoji], dtype=float)
+        self.sentiment = np.asarray([table[e]["sentiment_score"] for e in self.emoji], dtype=float)
+        self.positive = np.asarray([table[e]["positive"] for e in self.emoji], dtype=float) / occurrences
+        self.negative = np.asarray([table[e]["negative"] for e in self.emoji], dtype=float) / occurrences
+
+    def find(self, captions: pd.Series):
+        """Return (caption_ids, emoji_ids) for every emoji occurrence, in caption order."""
+        codes = self.codes
+        found = [[ch for ch in self.pattern.findall(c) if ch in codes] if isinstance(c, str) else [] for c in captions]
+        lengths = np.fromiter(map(len, found), dtype=np.int64, count=len(found))
+        emoji_ids = np.fromiter((codes[e] for e in chain.from_iterable(found)),
+                                dtype=np.int64, count=int(lengths.sum()))
+        return np.repeat(np.arange(len(found)), lengths), emoji_ids
+
+
+@lru_cache(maxsize=None)
+def load_emoji_index() -> EmojiIndex:
+    """Compile the emosent table once per process."""
+    return EmojiIndex()
+
+
+def classify_emoji_sentiment(captions: pd.Series) -> pd.DataFrame:
+    """Per-caption emoji features from the emosent sentiment table.
+
+    - `emoji_count`: number of emoji
+    - `emoji_sentiment`: mean emosent sentiment score of the emoji
+    - `emoji_positive` / `emoji_negative`: mean share of positive / negative uses
+    - `top_emoji`: most frequent emoji (first seen wins ties)
+
+    The means are NaN and `top_emoji` is None for captions without emoji.
+    """
+    index = load_emoji_index()
+    caption_ids, emoji_ids = index.find(captions)
+    n = len(captions)
+
+    counts = np.bincount(caption_ids, minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = {
+            column: np.bincount(caption_ids, weights=values[emoji_ids], minlength=n) / counts
+            for column, values in (("emoji_sentiment", index.sentiment),
+                                   ("emoji_positive", index.positive),
+                                   ("emoji_negative", index.negative))
+        }
+
+    top = np.full(n, None, dtype=object)
+    if len(emoji_ids):
+        occurrences = pd.DataFrame({"caption": caption_ids, "emoji": emoji_ids, "position": np.arange(len(emoji_ids))})
+        per_emoji = occurrences.groupby(["caption", "emoji"], sort=False).agg(
+            n=("position", "size"), first=("position", "min")).reset_index()
+        per_emoji = per_emoji.sort_values(["caption", "n", "first"], ascending=[True, False, True])
+        best = per_emoji.drop_duplicates("caption")
+        top[best["caption"].to_numpy()] = np.asarray(index.emoji, dtype=object)[best["emoji"].to_numpy()]
+
+    return pd.DataFrame({"emoji_count": counts, **means, "top_emoji": top}, index=captions.index)[EMOJI_COLUMNS]
+
+
+def emoji_name_counts(captions: pd.Series) -> Counter:
+    """Corpus-wide count of emoji by Unicode name."""
+    index = load_emoji_index()
+    _, emoji_ids = index.find(captions)
+    ids, counts = np.unique(emoji_ids, return_counts=True)
+    return Counter(dict(zip(index.names[ids].tolist(), counts.tolist())))
+
+
+if __name__ == "__main__":
+    df = pd.DataFrame({
+        "caption": [
+            "Love this 😍😍🔥",
+            "Worst day ever 😡",
+            "No emoji here",
+            None
+        ]
+    })
+
+    print(pd.concat([df, classify_emoji_sentiment(df["caption"])], axis=1))
+    print(emoji_name_counts(df["caption"]))
@@ -1,15 +1,18 @@
-import pandas as pd
-from typing import Optional, Union
-from tqdm import tqdm
-
+import numpy as np
 import pandas as pd
 from typing import Optional, Union, List
 from tqdm import tqdm
 
+from .lexicon_matrix import CountMatrix
+from .lexicon_store import load_lexicon
+from .tokens import TokenizedCaptions
+
 # -----------------------------
 # Load familiarity dictionary
 # -----------------------------
-def load_familiarity_dict(dict_path: str = "tom_text_toolbox/linguistic_dictionaries/fam_peatzold_dict.csv") -> dict:
+def load_familiarity_dict(dict_path: Optional[str] = None) -> dict:
+    if dict_path is None:
+        return load_lexicon("familiarity").as_dict()
     df = pd.read_csv(dict_path)
     df = df[df["Word"].apply(lambda x: isinstance(x, str))]
     return dict(zip(df["Word"].str.lower(), df["Familiarity"]))
@@ -17,18 +20,19 @@ def load_familiarity_dict(dict_path: str = "tom_text_toolbox/linguistic_dictiona
 # -----------------------------
 # Score a single caption
 # -----------------------------
-def score_caption(tokens_or_text: Union[str, List[str]], fam_dict: dict) -> Optional[float]:
+def caption_tokens(tokens_or_text: Union[str, List[str]]) -> List[str]:
     # Handle NaNs / empty values
     if tokens_or_text is None or (isinstance(tokens_or_text, float) and pd.isna(tokens_or_text)):
-        return None
-    
+        return []
+
     # If it's already tokenized
     if isinstance(tokens_or_text, list):
-        tokens = [str(t).lower() for t in tokens_or_text]
-    else:
-        # Assume it's a string
-        tokens = str(tokens_or_text).lower().split()
-    
+        return [str(t).lower() for t in tokens_or_text]
+    # Assume it's a string
+    return str(tokens_or_text).lower().split()
+
+def score_caption(tokens_or_text: Union[str, List[str]], fam_dict: dict) -> Optional[float]:
+    tokens = caption_tokens(tokens_or_text)
     if not tokens:
         return None
     
@@ -39,13 +43,18 @@ def score_caption(tokens_or_text: Union[str, List[str]], fam_dict: dict) -> Opti
 # -----------------------------
 # Apply scoring to a pandas Series
 # -----------------------------
-def classify_familiarity(captions: pd.Series, show_progress: bool = False) -> pd.Series:
-    fam_dict = load_familiarity_dict()
-    if show_progress:
-        tqdm.pandas(desc="Calculating familiarity scores")
-        return captions.progress_apply(lambda x: score_caption(x, fam_dict))
+def classify_familiarity(captions: pd.Series | TokenizedCaptions, show_progress: bool = False) -> pd.Series:
+    lexicon = load_lexicon("familiarity")
+    if isinstance(captions, TokenizedCaptions):
+        matrix = captions.count_matrix("raw", lowercase=True)
     else:
-        return captions.apply(lambda x: score_caption(x, fam_dict))
+        values = tqdm(captions, desc="Tokenizing for familiarity scores") if show_progress else captions
+        matrix = CountMatrix(caption_tokens(x) for x in values)
+
+    # NaN (previously None) when no token is in the dictionary
+    means, _ = matrix.lexicon_means(lexicon)
+    return pd.Series([np.nan if np.isnan(m) else round(float(m), 2) for m in means[:, 0]],
+                     index=captions.index, dtype=float)
 
 
 # -----------------------------
@@ -1,42 +1,150 @@
-import torch
-from transformers import T5Tokenizer, MT5ForConditionalGeneration
+import numpy as np
 import pandas as pd
-from tqdm import tqdm
+from functools import lru_cache
+from typing import Dict, List, Tuple
 
-# Load once globally to avoid reloading for every function call
-DEVICE = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-TOKENIZER = T5Tokenizer.from_pretrained('laihuiyuan/MMFLD', legacy = True)
-MODEL = MT5ForConditionalGeneration.from_pretrained('laihuiyuan/MMFLD').to(DEVICE)
+from .inference import InferenceEngine
+from .model_backends import load_model
 
-def classify_figures_of_speech(captions, tasks=None, batch_size=4):
+# Part of the feature-cache key: bump when the model, prompts or decoding change
+MODEL_NAME = "laihuiyuan/MMFLD"
+FIGURATIVE_VERSION = f"{MODEL_NAME}:2"
+
+DEFAULT_TASKS = ['Idiom', 'Hyperbole', 'Metaphor']
+PROMPT_TEMPLATE = 'Which figure of speech does this text contain? (A) Literal. (B) {}. | Text: {}'
+LITERAL_OPTION = 'Literal'
+
+# Platt scaling per task, score = sigmoid(scale * margin + bias), where the margin
+# is the figurative-minus-literal first-step logit. (1, 0) is the plain two-option
+# softmax, so the scores are not calibrated probabilities until these are refit
+# with fit_calibration() on labelled captions.
+CALIBRATION: Dict[str, Tuple[float, float]] = {task: (1.0, 0.0) for task in DEFAULT_TASKS}
+
+# Load once per process on first use (not at import) to avoid reloading for every function call
+@lru_cache(maxsize=None)
+def load_mmfld(backend="torch"):
+    from transformers import T5Tokenizer
+
+    tokenizer = T5Tokenizer.from_pretrained(MODEL_NAME, legacy = True)
+    return tokenizer, load_model(MODEL_NAME, "seq2seq", backend)
+
+def option_token_ids(tokenizer, option: str) -> List[int]:
+    """First sub-token ids that can start the answer `option` (cased and lowercased spellings)."""
+    ids = []
+    for spelling in dict.fromkeys([option, option.lower()]):
+        pieces = tokenizer(spelling, add_special_tokens=False)["input_ids"]
+        # Skip a bare word-boundary piece ("▁") so the id actually identifies the word
+        pieces = [p for p in pieces if tokenizer.convert_ids_to_tokens(p) != "▁"] or pieces
+        if pieces and pieces[0] not in ids:
+            ids.append(pieces[0])
+    return ids
+
+def fit_calibration(margins: np.ndarray, labels: np.ndarray, iterations: int = 100) -> Tuple[float, float]:
+    """Fit Platt scaling (scale, bias) to first-step margins and 0/1 labels by Newton's method."""
+    margins, labels = np.asarray(margins, dtype=float), np.asarray(labels, dtype=float)
+    scale, bias = 1.0, 0.0
+    for _ in range(iterations):
+        p = 1 / (1 + np.exp(-(scale * margins + bias)))
+        w = p * (1 - p) + 1e-9
+        gradient = np.array([np.sum((p - labels) * margins), np.sum(p - labels)])
+        hessian = np.array([[np.sum(w * margins ** 2), np.sum(w * margins)],
+                            [np.sum(w * margins), np.sum(w)]]) + 1e-6 * np.eye(2)
+        step = np.linalg.solve(hessian, gradient)
+        scale, bias = scale - step[0], bias - step[1]
+        if np.abs(step).max() < 1e-8:
+            break
+    return float(scale), float(bias)
+
+def _classify_by_generation(captions, tasks, tokenizer, model, batch_size, max_tokens):
+    # Original scoring: one generate() pass per task, then string matching
+    all_results = {}
+
+    def generate(batch):
+        outputs = model.generate(**batch)
+        return [tokenizer.decode(o, skip_special_tokens=True).strip().lower() for o in outputs]
+
+    for task in tasks:
+        engine = InferenceEngine(tokenizer, name=f"MMFLD {task}", max_tokens=max_tokens, max_batch_size=batch_size,
+                                 device=model.device)
+        preds = engine.run([PROMPT_TEMPLATE.format(task, cap) for cap in captions], generate)
+        all_results[task] = [1 if task.lower() in p else 0 for p in preds]
+    return all_results
+
+def _classify_by_logits(captions, tasks, tokenizer, model, batch_size, max_tokens, threshold):
+    import torch
+
+    literal_ids = option_token_ids(tokenizer, LITERAL_OPTION)
+    task_ids = {task: option_token_ids(tokenizer, task) for task in tasks}
+    for task, ids in task_ids.items():
+        if set(ids) & set(literal_ids):
+            raise ValueError(f"'{task}' and '{LITERAL_OPTION}' start with the same token; use method='generate'.")
+
+    # Only the logits of the candidate answer tokens are kept per prompt
+    candidates = list(dict.fromkeys(literal_ids + [i for ids in task_ids.values() for i in ids]))
+    column = {token: i for i, token in enumerate(candidates)}
+    candidate_index = torch.tensor(candidates)
+    start_id = model.config.decoder_start_token_id
+
+    def first_step(batch):
+        start = torch.full((batch["input_ids"].shape[0], 1), start_id, dtype=torch.long, device=batch["input_ids"].device)
+        logits = model(**batch, decoder_input_ids=start).logits[:, 0, :]
+        return logits.index_select(1, candidate_index.to(logits.device)).float().cpu().numpy()
+
+    # Every task of a caption goes through the same run; the engine groups prompts of similar length
+    prompts = [PROMPT_TEMPLATE.format(task, cap) for cap in captions for task in tasks]
+    engine = InferenceEngine(tokenizer, name="MMFLD", max_tokens=max_tokens, max_batch_size=batch_size,
+                             device=model.device)
+    logits = np.stack(engine.run(prompts, first_step)) if prompts else np.zeros((0, len(candidates)))
+    logits = logits.reshape(len(captions), len(tasks), len(candidates))
+
+    def option_score(values, ids):
+        chosen = values[..., [column[i] for i in ids]]
+        top = chosen.max(axis=-1, keepdims=True)
+        return (top + np.log(np.exp(chosen - top).sum(axis=-1, keepdims=True)))[..., 0]
+
+    all_results = {}
+    for t, task in enumerate(tasks):
+        margin = option_score(logits[:, t], task_ids[task]) - option_score(logits[:, t], literal_ids)
+        scale, bias = CALIBRATION.get(task, (1.0, 0.0))
+        probability = 1 / (1 + np.exp(-(scale * margin + bias)))
+        all_results[task] = (probability >= threshold).astype(int).tolist()
+        all_results[f"{task}_score"] = probability.round(4).tolist()
+    return all_results
+
+def classify_figures_of_speech(captions, tasks=None, batch_size=64, max_tokens=8192, method="generate",
+                               threshold=0.5, backend="torch"):
+    """Idiom/Hyperbole/Metaphor scores per caption from MMFLD.
+
+    `method="generate"` (default) is the original free-text decoding and
+    returns a 0/1 flag per task. `method="logits"` runs one encoder pass per
+    (caption, task) prompt and a single decoder step. It reads the
+    "(A) Literal" vs "(B) <task>" choice from the first-step logits and
+    returns a 0/1 flag at `threshold` plus the score it thresholds
+    (`<task>_score`, in [0, 1]). With the shipped identity CALIBRATION that
+    score is the two-option softmax of the logits, a ranking score rather
+    than a probability. Its flags have not been checked against generate's
+    yet (benchmarks/figurative_benchmark.py), so it is opt-in.
+    Prompts are batched by length under `max_tokens` padded tokens (and at
+    most `batch_size` rows). `backend` picks fp32 PyTorch ("torch"), "int8"
+    or "onnx" (see model_backends).
+    """
     if tasks is None:
-        tasks = ['Idiom', 'Hyperbole', 'Metaphor']
-    
+        tasks = DEFAULT_TASKS
+
     # Ensure list format
+    index = captions.index if isinstance(captions, pd.Series) else None
     if isinstance(captions, pd.Series):
         captions = captions.tolist()
-    
-    prompt_template = 'Which figure of speech does this text contain? (A) Literal. (B) {}. | Text: {}'
-    all_results = {"Caption": captions}
 
-    # Loop over each task once 
-    for task in tasks:
-        binary_preds_all = []
-        
-        for i in tqdm(range(0, len(captions), batch_size), desc=f"Processing {task}"):
-            batch = captions[i:i+batch_size]
-            prompts = [prompt_template.format(task, cap) for cap in batch]
-            
-            inputs = TOKENIZER(prompts, return_tensors="pt", padding=True, truncation=True).to(DEVICE)
-            outputs = MODEL.generate(**inputs)
-            preds = [TOKENIZER.decode(o, skip_special_tokens=True).strip().lower() for o in outputs]
-
-            binary_preds = [1 if task.lower() in p else 0 for p in preds]
-            binary_preds_all.extend(binary_preds)
-        
-        all_results[task] = binary_preds_all
-    
-    return pd.DataFrame(all_results)
+    tokenizer, model = load_mmfld(backend)
+    if method == "logits":
+        scores = _classify_by_logits(captions, tasks, tokenizer, model, batch_size, max_tokens, threshold)
+    elif method == "generate":
+        scores = _classify_by_generation(captions, tasks, tokenizer, model, batch_size, max_tokens)
+    else:
+        raise ValueError("method must be 'logits' or 'generate'.")
+
+    return pd.DataFrame({"Caption": captions, **scores}, index=index)
 
 if __name__ == "__main__":
     df = pd.DataFrame({
@@ -0,0 +1,154 @@
+import time
+import numpy as np
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Sequence, Tuple, Union
+
+# A single text, or a (text, text_pair) for NLI-style models
+Text = Union[str, Tuple[str, str]]
+
+
+@lru_cache(maxsize=None)
+def default_device():
+    """The GPU if torch can see one, else the CPU (torch is imported on first call)."""
+    import torch
+
+    return torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+
+class InferenceEngine:
+    """Shared batching for the Hugging Face stages (MindMiner, MMFLD, zero-shot).
+
+    Texts are tokenized once without padding and sorted by length, then
+    grouped into batches holding at most `max_tokens` padded tokens (and at
+    most `max_batch_size` rows). Each batch is padded only to its own longest
+    text, run under `torch.inference_mode`, and the results are put back in
+    input order. Throughput for the last run is kept in `stats` and printed.
+    """
+
+    def __init__(self, tokenizer, name: str = "inference", max_tokens: int = 16384,
+                 max_batch_size: int = 256, max_length: int = 512, device=None, verbose: bool = True):
+        self.tokenizer = tokenizer
+        self.name = name
+        self.max_tokens = max_tokens
+        self.max_batch_size = max_batch_size
+        self.max_length = max_length
+        self.device = device if device is not None else default_device()
+        self.verbose = verbose
+        self.stats: Dict[str, float] = {}
+
+    def encode(self, texts: Sequence[Text]) -> Dict[str, List[List[int]]]:
+        """Tokenize every text once, truncated but unpadded."""
+        if texts and isinstance(texts[0], tuple):
+            first, second = zip(*texts)
+            return dict(self.tokenizer(list(first), list(second), truncation="only_first",
+                                       max_length=self.max_length))
+        return dict(self.tokenizer(list(texts), truncation=True, max_length=self.max_length))
+
+    def plan(self, lengths: np.ndarray) -> List[np.ndarray]:
+        """Split positions, shortest first, into batches under the token budget."""
+        order = np.argsort(lengths, kind="stable")
+        batches, start = [], 0
+        for end in range(1, len(order) + 1):
+            size = end - start
+            # Sorted ascending, so the batch pads to the length of its last item
+            if end < len(order) and size < self.max_batch_size \
+                    and (size + 1) * lengths[order[end]] <= self.max_tokens:
+                continue
+            batches.append(order[start:end])
+            start = end
+        return batches
+
+    def run(self, texts: Sequence[Text], step: Callable[[Dict[str, Any]], Sequence[Any]]) -> List[Any]:
+        """Apply `step` (padded batch -> one result per row) to every text; results keep input order."""
+        texts = list(texts)
+        if not texts:
+            return []
+        return self.run_encoded(self.encode(texts), step)
+
+    def run_encoded(self, encodings: Dict[str, List[List[int]]],
+                    step: Callable[[Dict[str, Any]], Sequence[Any]]) -> List[Any]:
+        """Like run() for inputs that are already tokenized (unpadded id lists per model input)."""
+        import torch
+
+        start = time.perf_counter()
+        n = len(encodings["input_ids"])
+        results: List[Any] = [None] * n
+        lengths = np.fromiter(map(len, encodings["input_ids"]), dtype=np.int64, count=n)
+        batches = self.plan(lengths)
+
+        with torch.inference_mode():
+            for positions in batches:
+                features = [{key: values[i] for key, values in encodings.items()} for i in positions]
+                batch = self.tokenizer.pad(features, return_tensors="pt").to(self.device)
+                for position, result in zip(positions, step(batch)):
+                    results[position] = result
+
+        elapsed = time.perf_counter() - start
+        self.stats = {
+            "texts": n,
+            "batches": len(batches),
+            "tokens": int(lengths.sum()),
+            "seconds": elapsed,
+            "texts_per_second": n / elapsed if elapsed else float("inf"),
+        }
+        if self.verbose:
+            print(f"⚡ {self.name}: {n} texts in {elapsed:.1f}s "
+                  f"({self.stats['texts_per_second']:.1f}/s, {len(batches)} batches on {self.device})")
+        return results
+
+
+def encode_nli_pairs(tokenizer, texts: Sequence[str], hypotheses: Sequence[str],
+                     max_length: int = 512) -> Dict[str, List[List[int]]]:
+    """Token ids for every (text, hypothesis) pair, text-major.
+
+    Each text and each hypothesis is tokenized once and the pairs are
+    assembled from those ids, instead of re-tokenizing every hypothesis for
+    every text. Texts are truncated so each pair fits in `max_length`, like
+    truncation="only_first".
+    """
+    premises = tokenizer(list(texts), add_special_tokens=False)["input_ids"] if texts else []
+    hypothesis_ids = [tokenizer(h, add_special_tokens=False)["input_ids"] for h in hypotheses]
+    budget = max_length - tokenizer.num_special_tokens_to_add(pair=True)
+    with_types = "token_type_ids" in tokenizer.model_input_names
+
+    encodings = {"input_ids": [], "attention_mask": []}
+    if with_types:
+        encodings["token_type_ids"] = []
+    for premise in premises:
+        for hypothesis in hypothesis_ids:
+            first = premise[:max(budget - len(hypothesis), 0)]
+            ids = tokenizer.build_inputs_with_special_tokens(first, hypothesis)
+            encodings["input_ids"].append(ids)
+            encodings["attention_mask"].append([1] * len(ids))
+            if with_types:
+                encodings["token_type_ids"].append(tokenizer.create_token_type_ids_from_sequences(first, hypothesis))
+    return encodings
+
+
+def zero_shot_scores(engine: InferenceEngine, model, texts: Sequence[str], labels: Sequence[str],
+                     hypothesis_template: str = "This example is {}.", multi_label: bool = False) -> np.ndarray:
+    """Zero-shot label probabilities, shape (len(texts), len(labels)).
+
+    Same scoring as the `zero-shot-classification` pipeline. With
+    multi_label=False the entailment logits of a text's hypotheses are
+    softmaxed over the labels. With multi_label=True each label gets its own
+    entailment-vs-contradiction probability.
+    """
+    label2id = {label.lower(): i for label, i in model.config.label2id.items()}
+    entailment = next((i for label, i in label2id.items() if label.startswith("entail")), -1)
+    contradiction = next((i for label, i in label2id.items() if label.startswith("contradict")), 0)
+    if len(texts) == 0:
+        return np.zeros((0, len(labels)))
+
+    encodings = encode_nli_pairs(engine.tokenizer, texts, [hypothesis_template.format(label) for label in labels],
+                                 engine.max_length)
+    logits = engine.run_encoded(
+        encodings, lambda batch: model(**batch).logits[:, [contradiction, entailment]].float().cpu().tolist())
+    logits = np.asarray(logits, dtype=np.float64).reshape(len(texts), len(labels), 2)
+
+    if multi_label:
+        # Softmax over (contradiction, entailment) for each label separately
+        return 1 / (1 + np.exp(logits[..., 0] - logits[..., 1]))
+    entail = logits[..., 1] - logits[..., 1].max(axis=1, keepdims=True)
+    probabilities = np.exp(entail)
+    return probabilities / probabilities.sum(axis=1, keepdims=True)
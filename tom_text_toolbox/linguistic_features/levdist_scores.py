@@ -1,30 +1,115 @@
 import pandas as pd
-import itertools
 import numpy as np
-import re
-from Levenshtein import distance as levenshtein_distance
-
-def classify_levdist(captions: pd.Series) -> pd.Series:
-    results = []
-    for caption in captions:
-        if not isinstance(caption, str):
-            results.append(0)
-            continue
-
-        # Tokenize, keeping numbers and symbols
-        words = re.findall(r"[^\s]+", caption.lower())
-
-        if len(words) < 2:
-            results.append(0)
-            continue
-
-        distances = [
-            levenshtein_distance(w1, w2)
-            for w1, w2 in itertools.combinations(words, 2)
-        ]
-        results.append(round(np.mean(distances), 2) if distances else 0)
+from functools import partial
+from typing import List, Optional, Tuple, Union
+from rapidfuzz.distance import Levenshtein
+from rapidfuzz.process import cdist, cpdist
+
+from .parallel import run_sharded
+from ..profiling import active, map_timed, record_captions
+from .tokens import TokenizedCaptions
+
+# Rows of the unique-word distance matrix computed per cdist call (bounds memory on huge captions)
+BLOCK_ROWS = 512
+
+def _unique_words(words: List[str]) -> Tuple[List[str], np.ndarray]:
+    # Identical words are at distance 0, so only distinct words need comparing
+    codes, uniques = pd.factorize(pd.Series(words, dtype=object))
+    return uniques.tolist(), np.bincount(codes).astype(np.int64)
+
+def _n_pairs(n_words):
+    # Pairs of word positions in a caption (works elementwise on arrays)
+    return n_words * (n_words - 1) // 2
+
+def _pair_distance_sum(uniques: List[str], weights: np.ndarray) -> int:
+    """Sum of Levenshtein distances over every pair of word occurrences."""
+    total = 0
+    for start in range(0, len(uniques), BLOCK_ROWS):
+        block = cdist(uniques[start:start + BLOCK_ROWS], uniques, scorer=Levenshtein.distance, dtype=np.int32)
+        # weights_i * weights_j * d(i, j) over the block; the full matrix counts each pair twice
+        total += int(weights[start:start + BLOCK_ROWS] @ block.astype(np.int64) @ weights)
+    return total // 2
+
+def mean_levdist(words: List[str]) -> float:
+    """Exact mean Levenshtein distance over all word pairs, rounded to 2 places."""
+    n = len(words)
+    if n < 2:
+        return 0
+
+    uniques, weights = _unique_words(words)
+    n_pairs = _n_pairs(n)
+    return round(_pair_distance_sum(uniques, weights) / n_pairs, 2)
+
+def sampled_levdist(words: List[str], max_pairs: int, seed: int = 0) -> Tuple[float, float]:
+    """Mean Levenshtein distance estimated from at most `max_pairs` word pairs.
+
+    Captions with no more than `max_pairs` pairs are scored exactly (error 0).
+    Longer ones draw `max_pairs` pairs of word positions uniformly at random;
+    the second value is the standard error of that estimate.
+    """
+    n = len(words)
+    if n < 2:
+        return 0, 0.0
+    if _n_pairs(n) <= max_pairs:
+        return mean_levdist(words), 0.0
+
+    rng = np.random.default_rng(seed)
+    first = rng.integers(0, n, size=max_pairs)
+    second = (first + rng.integers(1, n, size=max_pairs)) % n
+
+    codes, uniques = pd.factorize(pd.Series(words, dtype=object))
+    uniques = np.asarray(uniques, dtype=object)
+    distances = cpdist(uniques[codes[first]], uniques[codes[second]], scorer=Levenshtein.distance, dtype=np.int32)
+    return round(float(distances.mean()), 2), float(distances.std(ddof=1) / np.sqrt(max_pairs))
+
+# Shards also return the seconds per caption when profiling (None otherwise)
+def _levdist_shard(word_lists: List[List[str]], timed: bool = False) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    values, seconds = map_timed(mean_levdist, word_lists, timed)
+    return np.array(values, dtype=float), seconds
+
+def _sampled_levdist_shard(word_lists: List[List[str]], max_pairs: int, seed: int,
+                           timed: bool = False) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    values, seconds = map_timed(partial(sampled_levdist, max_pairs=max_pairs, seed=seed), word_lists, timed)
+    return np.array(values, dtype=float).reshape(-1, 2), seconds
+
+def classify_levdist(captions: pd.Series, tokens: Optional[TokenizedCaptions] = None, n_workers: int = 1,
+                     max_pairs: Optional[int] = None, seed: int = 0,
+                     return_error: bool = False) -> Union[pd.Series, pd.DataFrame]:
+    """Average letter edit distance between the words of each caption.
+
+    By default every pair is scored (the result is exact). Setting `max_pairs`
+    bounds the cost per caption by sampling that many pairs; with
+    `return_error=True` a DataFrame with the estimate and its standard error
+    is returned instead of a Series.
+    """
+    if tokens is None:
+        tokens = TokenizedCaptions(captions)
+
+    # Whitespace tokens keep numbers and symbols
+    timed = active()
+    if max_pairs is None:
+        shards = run_sharded(partial(_levdist_shard, timed=timed), tokens.whitespace, n_workers)
+        scores = np.concatenate([values for values, _ in shards])
+        errors = np.zeros(len(scores))
+    else:
+        if max_pairs < 2:
+            raise ValueError("max_pairs must be at least 2.")
+        shard = partial(_sampled_levdist_shard, max_pairs=max_pairs, seed=seed, timed=timed)
+        shards = run_sharded(shard, tokens.whitespace, n_workers)
+        results = np.concatenate([values for values, _ in shards])
+        scores, errors = results[:, 0], results[:, 1]
+        # Sampled = more pairs than max_pairs (its error can still be 0, e.g. a repeated word)
+        n_words = np.array([len(words) for words in tokens.whitespace], dtype=np.int64)
+        n_sampled = int((_n_pairs(n_words) > max_pairs).sum())
+        print(f"📏 Approximate perceptual distance: {n_sampled} captions sampled, "
+              f"max standard error {errors.max(initial=0.0):.3f}")
+    if timed:
+        record_captions(np.concatenate([seconds for _, seconds in shards]))
 
-    return pd.Series(results, index=captions.index)
+    if return_error:
+        return pd.DataFrame({"avg_letter_edit_distance": scores, "avg_letter_edit_distance_se": errors},
+                            index=captions.index)
+    return pd.Series(scores, index=captions.index)
 
 
 if __name__ == "__main__":
@@ -41,3 +126,4 @@ if __name__ == "__main__":
 
     df["avg_letter_edit_distance"] = classify_levdist(df["caption"])
     print(df)
+    print(classify_levdist(df["caption"], max_pairs=10, return_error=True))
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+from itertools import chain
+from scipy import sparse
+from typing import Iterable, List, Optional, Tuple
+
+from .lexicon_store import Lexicon
+
+
+class CountMatrix:
+    """Sparse caption × vocabulary token-count matrix.
+
+    Built once per token view, it turns every "mean lexicon value of the
+    matched tokens" score into two sparse matrix–vector products: one for the
+    value sums and one for the number of matched tokens.
+    """
+
+    def __init__(self, token_lists: Iterable[List[str]], lowercase: bool = False):
+        token_lists = list(token_lists)
+        lengths = np.fromiter((len(tokens) for tokens in token_lists), dtype=np.int64, count=len(token_lists))
+        indptr = np.concatenate([[0], np.cumsum(lengths)])
+
+        # pandas hashes the flat token list in C; codes are the column ids
+        flat = np.fromiter(chain.from_iterable(token_lists), dtype=object, count=int(indptr[-1]))
+        codes, uniques = pd.factorize(flat)
+        if lowercase:
+            # Lowercase each distinct token once and merge the columns that collide
+            lowered, uniques = pd.factorize(np.asarray([u.lower() for u in uniques], dtype=object))
+            codes = lowered[codes]
+
+        self.vocabulary: List[str] = uniques.tolist()
+        matrix = sparse.csr_matrix(
+            (np.ones(len(codes), dtype=np.float64), codes, indptr),
+            shape=(len(token_lists), len(self.vocabulary)),
+        )
+        matrix.sum_duplicates()
+        self.matrix = matrix
+        self.token_counts = lengths
+
+    def __len__(self) -> int:
+        return self.matrix.shape[0]
+
+    def lexicon_means(self, lexicon: Lexicon, exclude: Optional[Iterable[str]] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Mean lexicon value per caption over matched tokens (counting repeats).
+
+        Returns (means, matched): `means` has one column per lexicon column and
+        is NaN where no token matched; `matched` is the number of matched tokens.
+        """
+        rows = lexicon.lookup(self.vocabulary)
+        hit = rows >= 0
+        if exclude:
+            hit &= ~np.isin(np.asarray(self.vocabulary, dtype=object), list(exclude))
+
+        values = np.zeros((len(self.vocabulary), len(lexicon.columns)), dtype=np.float64)
+        values[hit] = lexicon.values[rows[hit]]
+
+        matched = self.matrix @ hit.astype(np.float64)
+        sums = self.matrix @ values
+        means = np.full(sums.shape, np.nan)
+        np.divide(sums, matched[:, None], out=means, where=matched[:, None] > 0)
+        return means, matched
@@ -0,0 +1,239 @@
+import hashlib
+import json
+import os
+import threading
+import numpy as np
+import pandas as pd
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional
+
+from .paths import cache_dir, dictionary_path
+
+# Bump when the on-disk layout changes; compiled files live under lexicons/v<version>
+FORMAT_VERSION = 1
+
+# -----------------------------
+# Source lexicons in linguistic_dictionaries/
+# -----------------------------
+LEXICON_SOURCES = {
+    "brysbaert": {
+        "file": "ac_brysbaert_dict.csv", "sep": ",", "word": "Word",
+        "values": ["Conc.M"], "lowercase": True,
+    },
+    # Not shipped with the package: copy fam_peatzold_dict.csv into linguistic_dictionaries/ to use it
+    "familiarity": {
+        "file": "fam_peatzold_dict.csv", "sep": ",", "word": "Word",
+        "values": ["Familiarity"], "lowercase": True,
+    },
+    "nrc_joy": {
+        "file": "joy-NRC-EmoIntv1-withZeroIntensityEntries.txt", "sep": "\t", "word": "English Word",
+        "values": ["Emotion-Intensity-Score"], "lowercase": True,
+    },
+    "nrc_anger": {
+        "file": "anger-NRC-EmoIntv1-withZeroIntensityEntries.txt", "sep": "\t", "word": "English Word",
+        "values": ["Emotion-Intensity-Score"], "lowercase": True,
+    },
+    "whissell": {
+        "file": "whissell_dict.csv", "sep": ",", "word": "word",
+        "values": ["pleas", "activ", "image"], "lowercase": False,
+    },
+}
+
+
+class Lexicon:
+    """A compiled lexicon: sorted vocabulary plus a float32 value per column."""
+
+    def __init__(self, name: str, vocab: np.ndarray, values: np.ndarray, columns: List[str]):
+        self.name = name
+        self.vocab = vocab
+        self.values = values
+        self.columns = columns
+        self._dicts = {}
+
+    def __len__(self) -> int:
+        return len(self.vocab)
+
+    def lookup(self, words: Iterable[str]) -> np.ndarray:
+        """Return the vocabulary row of each word, or -1 where the word is not in the lexicon."""
+        words = list(words)
+        rows = np.full(len(words), -1, dtype=np.int64)
+        if not words or len(self.vocab) == 0:
+            return rows
+
+        # Words longer than the longest entry cannot match; skipping them keeps
+        # the fixed-width key array small even when the input has huge tokens
+        width = self.vocab.dtype.itemsize // 4
+        candidates = np.asarray([i for i, w in enumerate(words) if len(w) <= width], dtype=np.int64)
+        if candidates.size == 0:
+            return rows
+        keys = np.asarray([words[i] for i in candidates], dtype=self.vocab.dtype)
+
+        pos = np.searchsorted(self.vocab, keys)
+        pos[pos == len(self.vocab)] = 0
+        found = self.vocab[pos] == keys
+        rows[candidates[found]] = pos[found]
+        return rows
+
+    @classmethod
+    def from_mapping(cls, name: str, mapping: Dict[str, float]) -> "Lexicon":
+        """Build an in-memory lexicon from a {word: value} dictionary."""
+        return cls.from_frame(name, pd.DataFrame({"value": pd.Series(mapping, dtype=float)}))
+
+    @classmethod
+    def from_frame(cls, name: str, frame: pd.DataFrame) -> "Lexicon":
+        """Build an in-memory lexicon from a DataFrame indexed by word (last duplicate wins)."""
+        frame = frame[frame.index.notna() & ~frame.index.duplicated(keep="last")]
+        vocab = np.asarray([str(w) for w in frame.index], dtype=str)
+        order = np.argsort(vocab, kind="stable")
+        values = frame.to_numpy(dtype=np.float32)[order]
+        return cls(name, vocab[order], values, [str(c) for c in frame.columns])
+
+    def as_dict(self, column: Optional[str] = None) -> Dict[str, float]:
+        """Return {word: value} for one column (the first by default)."""
+        column = column or self.columns[0]
+        if column not in self._dicts:
+            col = self.columns.index(column)
+            self._dicts[column] = dict(zip(self.vocab.tolist(), self.values[:, col].astype(float).tolist()))
+        return self._dicts[column]
+
+    def as_frame(self) -> pd.DataFrame:
+        """Return the lexicon as a DataFrame indexed by word."""
+        index = pd.Index(self.vocab, name="word")
+        return pd.DataFrame(np.asarray(self.values, dtype=float), index=index, columns=self.columns)
+
+
+# -----------------------------
+# Build step
+# -----------------------------
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def lexicon_available(name: str) -> bool:
+    """Whether the source file of lexicon `name` is installed."""
+    return os.path.exists(dictionary_path(LEXICON_SOURCES[name]["file"]))
+
+
+@lru_cache(maxsize=None)
+def _source_sha256(path: str, size: int, mtime_ns: int) -> str:
+    # Keyed by size and mtime, so a source is hashed again only after it changes
+    return _sha256(path)
+
+
+def lexicon_version(*names: str) -> str:
+    """Version string of compiled lexicons: the store format plus each source file's hash."""
+    parts = [f"v{FORMAT_VERSION}"]
+    for name in names:
+        source = dictionary_path(LEXICON_SOURCES[name]["file"])
+        if os.path.exists(source):
+            stat = os.stat(source)
+            parts.append(_source_sha256(source, stat.st_size, stat.st_mtime_ns)[:12])
+        else:
+            parts.append("missing")
+    return "|".join(parts)
+
+
+def _store_dir(store_dir: Optional[str]) -> str:
+    if store_dir is None:
+        return cache_dir("lexicons", f"v{FORMAT_VERSION}")
+    os.makedirs(store_dir, exist_ok=True)
+    return store_dir
+
+
+def _read_source(spec: dict) -> pd.DataFrame:
+    # keep_default_na=False keeps real words such as "null" instead of turning them into NaN
+    df = pd.read_csv(dictionary_path(spec["file"]), sep=spec["sep"], usecols=[spec["word"]] + spec["values"],
+                     keep_default_na=False, na_values={col: [""] for col in spec["values"]})
+    words = df[spec["word"]].astype(str)
+    if spec["lowercase"]:
+        words = words.str.lower()
+    df = pd.DataFrame({"word": words, **{col: df[col] for col in spec["values"]}})
+    df = df[df["word"] != ""]
+    # Later rows win on duplicates, like the dict(zip(...)) loaders did
+    return df.drop_duplicates(subset="word", keep="last")
+
+
+def compile_lexicon(name: str, store_dir: Optional[str] = None) -> str:
+    """Compile one source lexicon into <store_dir>/<name>.{vocab,values}.npy and a manifest."""
+    if name not in LEXICON_SOURCES:
+        raise ValueError(f"Unknown lexicon '{name}'. Choose from {list(LEXICON_SOURCES)}.")
+    spec = LEXICON_SOURCES[name]
+    if not lexicon_available(name):
+        raise FileNotFoundError(f"The {name} lexicon needs {spec['file']}, which is not installed; "
+                                f"copy it to {dictionary_path(spec['file'])} to use this score.")
+    source = dictionary_path(spec["file"])
+    store_dir = _store_dir(store_dir)
+
+    df = _read_source(spec)
+    vocab = np.asarray(df["word"].tolist(), dtype=str)
+    order = np.argsort(vocab, kind="stable")
+    vocab = vocab[order]
+    values = df[spec["values"]].to_numpy(dtype=np.float32)[order]
+
+    manifest = {
+        "name": name,
+        "format_version": FORMAT_VERSION,
+        "source": spec["file"],
+        "source_sha256": _sha256(source),
+        "columns": spec["values"],
+        "n_words": int(len(vocab)),
+    }
+
+    # Write to temporary names, then swap in atomically so concurrent workers never see partial files
+    pid = f"{os.getpid()}-{threading.get_ident()}"
+    for suffix, array in (("vocab", vocab), ("values", values)):
+        tmp = os.path.join(store_dir, f"{name}.{suffix}.{pid}.tmp.npy")
+        np.save(tmp, array)
+        os.replace(tmp, os.path.join(store_dir, f"{name}.{suffix}.npy"))
+    tmp = os.path.join(store_dir, f"{name}.{pid}.tmp.json")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, os.path.join(store_dir, f"{name}.json"))
+
+    return os.path.join(store_dir, f"{name}.json")
+
+
+def compile_lexicons(store_dir: Optional[str] = None) -> Dict[str, str]:
+    """Compile every lexicon whose source file is present; returns {name: manifest path}."""
+    compiled = {}
+    for name in LEXICON_SOURCES:
+        if lexicon_available(name):
+            compiled[name] = compile_lexicon(name, store_dir)
+    return compiled
+
+
+def _is_current(name: str, store_dir: str) -> bool:
+    manifest_path = os.path.join(store_dir, f"{name}.json")
+    if not os.path.exists(manifest_path):
+        return False
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+    source = dictionary_path(LEXICON_SOURCES[name]["file"])
+    return (manifest.get("format_version") == FORMAT_VERSION
+            and (not os.path.exists(source) or manifest.get("source_sha256") == _sha256(source)))
+
+
+# -----------------------------
+# Runtime access (memory-mapped, once per process)
+# -----------------------------
+@lru_cache(maxsize=None)
+def load_lexicon(name: str, store_dir: Optional[str] = None) -> Lexicon:
+    """Memory-map a compiled lexicon, compiling it first if missing or out of date."""
+    if name not in LEXICON_SOURCES:
+        raise ValueError(f"Unknown lexicon '{name}'. Choose from {list(LEXICON_SOURCES)}.")
+    store_dir = _store_dir(store_dir)
+    if not _is_current(name, store_dir):
+        compile_lexicon(name, store_dir)
+
+    vocab = np.load(os.path.join(store_dir, f"{name}.vocab.npy"), mmap_mode="r")
+    values = np.load(os.path.join(store_dir, f"{name}.values.npy"), mmap_mode="r")
+    return Lexicon(name, vocab, values, LEXICON_SOURCES[name]["values"])
+
+
+if __name__ == "__main__":
+    for lexicon_name, path in compile_lexicons().items():
+        print(f"Compiled {lexicon_name}: {path}")
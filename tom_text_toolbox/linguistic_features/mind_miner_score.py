@@ -1,31 +1,48 @@
 #Import libraries
 import pandas as pd
-from transformers.pipelines import pipeline
-import torch
+from functools import lru_cache
+
+from .inference import InferenceEngine
+from .model_backends import load_model
+
+MODEL_NAME = "j-hartmann/MindMiner"
+# Part of the feature-cache key: bump when the model or the scoring changes
+MIND_MINER_VERSION = f"{MODEL_NAME}:1"
+
+@lru_cache(maxsize=None)
+def load_mind_miner(backend: str = "torch"):
+    """Load the MindMiner tokenizer and model once per process and backend (transformers is imported here)."""
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    return tokenizer, load_model(MODEL_NAME, "sequence-classification", backend)
 
 #Convert the tokenised column to a list
-def classify_mind_miner(captions: pd.Series | list):
+def classify_mind_miner(captions: pd.Series | list, max_tokens: int = 16384, backend: str = "torch"):
     """Analyze captions using MindMiner.
     Parameters:
         captions (pd.Series | list): Series or list of caption strings.
+        max_tokens (int): Padded tokens per batch (lower it if memory is tight).
+        backend (str): "torch" (fp32), "int8" or "onnx"; see model_backends.
     Returns:          
-        list: List of scores for each caption.
+        pd.Series: Raw MindMiner score for each caption.
     """
 
-    model_name = "j-hartmann/MindMiner"
-    
-    mindminer = pipeline(model = model_name, function_to_apply = "none", device = 0 if torch.cuda.is_available() else -1)
+    tokenizer, model = load_mind_miner(backend)
 
     # Check if the GPU is available
-    if mindminer.device == 0:
+    if model.device.type == "cuda":
         print("Using GPU for inference.")
     else:  
         print("Using CPU for inference. This may be slower.")
 
-    p: list = [mindminer(caption) for caption in captions]
-    scores = [entry[0]['score'] for entry in p]
+    # Same score as pipeline(function_to_apply="none"): the top raw logit
+    engine = InferenceEngine(tokenizer, name=f"MindMiner ({backend})", max_tokens=max_tokens, device=model.device)
+    texts = [caption if isinstance(caption, str) else "" for caption in captions]
+    scores = engine.run(texts, lambda batch: model(**batch).logits.max(dim=-1).values.float().cpu().tolist())
 
-    return pd.Series(scores)
+    # Keep the caption index so results line up with chunks that do not start at 0
+    return pd.Series(scores, index=captions.index if isinstance(captions, pd.Series) else None)
 
 if __name__ == "__main__":
     # Example input DataFrame
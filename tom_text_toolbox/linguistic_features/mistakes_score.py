@@ -1,31 +1,38 @@
-import enchant
-import re
+import numpy as np
 import pandas as pd
-
-def count_spelling_mistakes(captions: pd.Series, language: str = "en_US") -> pd.Series:
-    checker = enchant.Dict(language)
-
-    def find_mistakes(text):
-        if pd.isna(text):
-            return 0
-        
-        # Remove links
-        text = re.sub(r"http\S+|www\.\S+", "", str(text))
-
-        # Only alphabetic words
-        words = re.findall(r"\b[a-zA-Z]+\b", str(text))
-
-        # Ignore ALL-CAPS and Title-case words
-        filtered_words = [
-            word for word in words 
-            if not word.isupper() and not word.istitle()
-        ]
-
-        # Count misspelled words
-        return sum(not checker.check(word.lower()) for word in filtered_words)
-
-    return captions.apply(find_mistakes)
-
+from itertools import chain
+from typing import List, Optional
+
+from .spelling_cache import SpellingCache, get_spelling_cache
+from .tokens import TokenizedCaptions
+
+def candidate_words(words: List[str]) -> List[str]:
+    # Alphabetic words with links removed; ignore ALL-CAPS and Title-case words
+    return [word.lower() for word in words if not word.isupper() and not word.istitle()]
+
+def count_spelling_mistakes(captions: pd.Series, language: str = "en_US",
+                            tokens: Optional[TokenizedCaptions] = None, n_workers: int = 1,
+                            cache: Optional[SpellingCache] = None) -> pd.Series:
+    """Count misspelled words per caption.
+
+    Each distinct word is spell-checked once through the per-language
+    SpellingCache (in memory and on disk); with n_workers > 1 the new words
+    are checked in worker processes.
+    """
+    if tokens is None:
+        tokens = TokenizedCaptions(captions)
+    if cache is None:
+        cache = get_spelling_cache(language)
+
+    candidates = [candidate_words(words) for words in tokens.words_without_links]
+    lengths = np.fromiter(map(len, candidates), dtype=np.int64, count=len(candidates))
+    flat = np.fromiter(chain.from_iterable(candidates), dtype=object, count=int(lengths.sum()))
+    codes, uniques = pd.factorize(flat)
+
+    misspelled = ~cache.check(uniques.tolist(), n_workers=n_workers)[codes]
+    caption_ids = np.repeat(np.arange(len(candidates)), lengths)
+    counts = np.bincount(caption_ids, weights=misspelled, minlength=len(candidates)).astype(np.int64)
+    return pd.Series(counts, index=captions.index)
 
 if __name__ == "__main__":
     df = pd.read_csv("tom_text_toolbox/text_data_TEST.csv")
@@ -0,0 +1,137 @@
+import os
+import re
+from functools import lru_cache
+from importlib import metadata
+from typing import Optional
+
+from .paths import cache_dir
+from ..profiling import timed_load
+
+# "torch": full-precision PyTorch (the reference outputs)
+# "int8": PyTorch with dynamic int8 quantization of the Linear layers (CPU)
+# "onnx": ONNX Runtime via optimum (CPU)
+BACKENDS = ("torch", "int8", "onnx")
+
+# Model kinds used by the toolbox and the transformers/optimum classes that load them
+MODEL_CLASSES = {
+    "sequence-classification": ("AutoModelForSequenceClassification", "ORTModelForSequenceClassification"),
+    "seq2seq": ("MT5ForConditionalGeneration", "ORTModelForSeq2SeqLM"),
+}
+
+
+def _package_version(name: str) -> str:
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return "missing"
+
+
+def model_revision(model_name: str) -> str:
+    """Commit hash of the hub snapshot of `model_name` (config.json mtime for a local directory)."""
+    if os.path.isdir(model_name):
+        return f"local{os.stat(os.path.join(model_name, 'config.json')).st_mtime_ns}"
+    from transformers.utils import cached_file
+
+    try:
+        path = cached_file(model_name, "config.json")
+    except OSError:
+        return "unresolved"
+    # <hub cache>/models--org--name/snapshots/<commit>/config.json
+    parts = os.path.normpath(path).split(os.sep)
+    return parts[parts.index("snapshots") + 1] if "snapshots" in parts else "unresolved"
+
+
+@lru_cache(maxsize=None)
+def backend_version(model_name: str, backend: str) -> str:
+    """Library versions and model revision behind one backend's outputs and artifacts.
+
+    Part of both the feature-cache keys and the artifact paths, so upgrading
+    torch/transformers/optimum or a new model commit never reuses old results.
+    """
+    packages = ["torch", "transformers"] + (["optimum", "onnxruntime"] if backend == "onnx" else [])
+    parts = [f"{name}-{_package_version(name)}" for name in packages]
+    return "|".join(parts + [f"rev-{model_revision(model_name)}"])
+
+
+def backend_dir(model_name: str, backend: str) -> str:
+    """Cache directory of one exported model, e.g.
+    <cache>/models/j-hartmann--MindMiner/int8/torch-2.4.1_transformers-4.44.2_rev-<commit>."""
+    version = re.sub(r"[^\w.+-]", "_", backend_version(model_name, backend))
+    return cache_dir("models", model_name.replace("/", "--"), backend, version)
+
+
+def _check(backend: str, kind: str):
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown backend '{backend}'. Choose from {list(BACKENDS)}.")
+    if kind not in MODEL_CLASSES:
+        raise ValueError(f"Unknown model kind '{kind}'. Choose from {list(MODEL_CLASSES)}.")
+
+
+def _load_torch(model_name: str, kind: str):
+    import transformers
+
+    model_class = getattr(transformers, MODEL_CLASSES[kind][0])
+    return model_class.from_pretrained(model_name)
+
+
+def _quantize(model):
+    import torch
+
+    return torch.ao.quantization.quantize_dynamic(model.eval(), {torch.nn.Linear}, dtype=torch.qint8)
+
+
+def _load_int8(model_name: str, kind: str):
+    import torch
+
+    # Only the quantized weights are stored (no pickled module): on a cache hit
+    # the architecture is built from the config, quantized the same way, and
+    # the saved weights are loaded into it
+    path = os.path.join(backend_dir(model_name, "int8"), "state_dict.pt")
+    if os.path.exists(path):
+        import transformers
+
+        model_class = getattr(transformers, MODEL_CLASSES[kind][0])
+        model = _quantize(model_class.from_config(transformers.AutoConfig.from_pretrained(model_name)))
+        model.load_state_dict(torch.load(path, weights_only=True))
+        return model
+
+    model = _quantize(_load_torch(model_name, kind))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    torch.save(model.state_dict(), tmp)
+    os.replace(tmp, path)
+    return model
+
+
+def _load_onnx(model_name: str, kind: str):
+    try:
+        import optimum.onnxruntime as ort
+    except ImportError as e:
+        raise ImportError("The 'onnx' backend needs optimum with ONNX Runtime: "
+                          "pip install 'optimum[onnxruntime]'") from e
+
+    model_class = getattr(ort, MODEL_CLASSES[kind][1])
+    path = backend_dir(model_name, "onnx")
+    if os.path.exists(os.path.join(path, "config.json")):
+        return model_class.from_pretrained(path)
+
+    model = model_class.from_pretrained(model_name, export=True)
+    model.save_pretrained(path)
+    return model
+
+
+def load_model(model_name: str, kind: str, backend: str = "torch", device: Optional[object] = None):
+    """Load `model_name` for inference through `backend`.
+
+    The int8 and ONNX artifacts are exported on first use into the toolbox
+    cache (see backend_dir) and loaded from there afterwards. Both run on the
+    CPU; "torch" runs on `device` (the default device if None).
+    """
+    _check(backend, kind)
+    with timed_load(f"{model_name} ({backend})"):
+        if backend == "torch":
+            from .inference import default_device
+
+            return _load_torch(model_name, kind).to(device or default_device()).eval()
+        if backend == "int8":
+            return _load_int8(model_name, kind).eval()
+        return _load_onnx(model_name, kind)
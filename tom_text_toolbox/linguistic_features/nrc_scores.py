@@ -1,6 +1,8 @@
-import os
 import pandas as pd
-import re
+from typing import Optional
+
+from .lexicon_store import load_lexicon
+from .tokens import TokenizedCaptions
 
 def avg_emo_scores(caption, emo_dicts):
     """
@@ -16,7 +18,7 @@ def avg_emo_scores(caption, emo_dicts):
         result[emo_name] = sum(scores) / len(scores) if scores else float("nan")
     return result
 
-def classify_nrc_dict(captions: list[str] | pd.Series) -> pd.DataFrame:
+def classify_nrc_dict(captions: list[str] | pd.Series, tokens: Optional[TokenizedCaptions] = None) -> pd.DataFrame:
     """
     Calculate the average joy and anger from EmoLex.
 
@@ -25,34 +27,30 @@ def classify_nrc_dict(captions: list[str] | pd.Series) -> pd.DataFrame:
     captions : list of str or pandas.Series
         A list or Series of textual captions for which joy/anger scores will be computed.
         Assumes captions are NOT tokenized.
+    tokens : TokenizedCaptions, optional
+        Shared token artifact for `captions`; built here if not given.
 
     Returns
     -------
     pd.DataFrame
         A pandas DataFrame with average joy and anger scores for each caption.
     """
-    joy_path = os.path.join("tom_text_toolbox/linguistic_dictionaries/joy-NRC-EmoIntv1-withZeroIntensityEntries.txt")
-    anger_path = os.path.join("tom_text_toolbox/linguistic_dictionaries/anger-NRC-EmoIntv1-withZeroIntensityEntries.txt")
-
-    joy = pd.read_csv(joy_path, sep="\t")
-    anger = pd.read_csv(anger_path, sep="\t")
-
-    joy_dict = dict(zip(joy["English Word"].astype(str).str.lower(), joy["Emotion-Intensity-Score"]))
-    anger_dict = dict(zip(anger["English Word"].astype(str).str.lower(), anger["Emotion-Intensity-Score"]))
-
-    emotion_dicts = {
-        "joy": joy_dict,
-        "anger": anger_dict
+    emotion_lexicons = {
+        "joy": load_lexicon("nrc_joy"),
+        "anger": load_lexicon("nrc_anger")
     }
 
-    # Process each caption
-    results = []
-    for caption in captions:
-        tokens = re.findall(r"\b[a-zA-Z]+\b", caption.lower())
-        emo_scores = avg_emo_scores(tokens, emotion_dicts)
-        results.append(emo_scores)
+    if tokens is None:
+        tokens = TokenizedCaptions(captions)
+
+    # Same averages as avg_emo_scores, for every caption at once
+    matrix = tokens.count_matrix("words", lowercase=True)
+    results = {}
+    for emo_name, lexicon in emotion_lexicons.items():
+        means, _ = matrix.lexicon_means(lexicon)
+        results[emo_name] = means[:, 0]
 
-    return pd.DataFrame(results)
+    return pd.DataFrame(results, index=tokens.index)
 
 if __name__ == "__main__":
 
@@ -0,0 +1,53 @@
+import os
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+# Objects built once per worker process by the pool initializer (dictionaries,
+# spell checkers, matchers), looked up by the shard functions with worker_state()
+_WORKER_STATE: Dict[str, Any] = {}
+
+StateFactory = Tuple[Callable[..., Any], tuple]
+
+
+def resolve_workers(n_workers: Optional[int]) -> int:
+    """Turn an n_workers argument into a process count (None or -1 means every core)."""
+    if n_workers is None or n_workers < 0:
+        return os.cpu_count() or 1
+    return max(1, n_workers)
+
+
+def worker_state(key: str) -> Any:
+    """Return an object created by the initializer of the current worker process."""
+    return _WORKER_STATE[key]
+
+
+def _init_worker(state: Dict[str, StateFactory]):
+    for key, (factory, args) in state.items():
+        _WORKER_STATE[key] = factory(*args)
+
+
+def run_sharded(worker: Callable[[Sequence], Any], items: Sequence, n_workers: int,
+                state: Optional[Dict[str, StateFactory]] = None, shards_per_worker: int = 4) -> List[Any]:
+    """Run `worker` over contiguous shards of `items` in a process pool.
+
+    `worker` must be a module-level function taking a list of items and
+    returning one result per shard (e.g. an array with one value per item).
+    `state` maps a key to a (factory, args) pair that each worker process
+    calls once at start-up; the shard function reads it with worker_state().
+    Shard results are returned in the original order.
+    """
+    state = state or {}
+    items = list(items)
+    n_workers = min(resolve_workers(n_workers), max(1, len(items)))
+
+    if n_workers == 1:
+        _init_worker(state)
+        return [worker(items)]
+
+    n_shards = min(len(items), n_workers * shards_per_worker)
+    bounds = np.linspace(0, len(items), n_shards + 1).astype(int)
+    shards = [items[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    with ProcessPoolExecutor(max_workers=n_workers, initializer=_init_worker, initargs=(state,)) as executor:
+        return list(executor.map(worker, shards))
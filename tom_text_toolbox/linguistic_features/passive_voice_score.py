@@ -1,33 +1,92 @@
-from PassivePySrc import PassivePy
 import pandas as pd
-from tqdm import tqdm
+from typing import List, Optional
 
-def count_passive(df: pd.DataFrame, captions: str = "caption", n_process: int = 10, batch_size: int = 1000):
+from .spacy_parse import SpacyParser
+
+# Part of the feature-cache key: bump when the rules change
+PASSIVE_VERSION = "passive-rules:1"
+
+# Dependency-matcher rules, each anchored on the passive verb. A clause is
+# counted once however many of them match (e.g. "was founded by" hits all three).
+_VERB = {"RIGHT_ID": "verb", "RIGHT_ATTRS": {"POS": {"IN": ["VERB", "AUX"]}}}
+PASSIVE_PATTERNS = {
+    # "The company was founded ..." / "That we won is known"
+    "passive_subject": [_VERB, {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "subject",
+                                "RIGHT_ATTRS": {"DEP": {"IN": ["nsubjpass", "csubjpass"]}}}],
+    # "... was founded" (also truncated passives whose subject the parser missed)
+    "passive_auxiliary": [_VERB, {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "auxiliary",
+                                  "RIGHT_ATTRS": {"DEP": "auxpass"}}],
+    # "... founded by our employees"
+    "passive_agent": [_VERB, {"LEFT_ID": "verb", "REL_OP": ">", "RIGHT_ID": "agent",
+                              "RIGHT_ATTRS": {"DEP": "agent"}}],
+}
+
+
+def passive_matcher(vocab):
+    """A DependencyMatcher holding PASSIVE_PATTERNS."""
+    from spacy.matcher import DependencyMatcher
+
+    matcher = DependencyMatcher(vocab)
+    for name, pattern in PASSIVE_PATTERNS.items():
+        matcher.add(name, [pattern])
+    return matcher
+
+
+def count_passive_docs(docs: List[object], matcher=None) -> List[int]:
+    """Number of passive clauses (distinct passive verbs) in each parsed Doc."""
+    if not docs:
+        return []
+    matcher = matcher or passive_matcher(docs[0].vocab)
+    return [len({token_ids[0] for _, token_ids in matcher(doc)}) for doc in docs]
+
+
+def count_passive(df: pd.DataFrame, captions: str = "caption", parser: Optional[SpacyParser] = None,
+                  docs: Optional[List[object]] = None) -> pd.Series:
     """
-    Analyze passive voice in captions using PassivePy.
+    Count passive-voice clauses in captions.
 
     Parameters:
-        df (pd.DataFrame): DataFrame containing captions.
+        df (pd.DataFrame): DataFrame containing captions (not modified).
         captions (str): Column name containing the captions.
-        n_process (int): Number of processes to use for parallel processing.
-        batch_size (int): Size of each batch for processing.
+        parser (SpacyParser): Shared spaCy parse; a default one is made if None.
+        docs (list): Already parsed captions, in row order; skips parsing.
 
     Returns:
-        pd.DataFrame: DataFrame with passive voice analysis results.
+        pd.Series: passive_count per row, on the DataFrame's index.
+    """
+    if docs is None:
+        parser = parser or SpacyParser()
+        docs = parser.parse(df[captions].fillna("").astype(str))
+    return pd.Series(count_passive_docs(docs), index=df.index, name="passive_count", dtype=int)
+
+
+def compare_with_passivepy(captions: Optional[pd.Series] = None, parser: Optional[SpacyParser] = None) -> pd.DataFrame:
+    """Native counts next to PassivePy's on a reference caption set.
+
+    PassivePy (optional: pip install passivepy) is only needed for this check.
+    The agreement rates are printed; the per-caption table is returned.
     """
-    # Ensure captions are strings
-    df[captions] = df[captions].astype(str)
+    from PassivePySrc import PassivePy
+
+    from .backend_report import reference_captions
+
+    captions = reference_captions() if captions is None else captions
+    df = pd.DataFrame({"caption": captions.astype(str)}).reset_index(drop=True)
+    native = count_passive(df, parser=parser)
 
     passivepy = PassivePy.PassivePyAnalyzer(spacy_model="en_core_web_lg")
-    
-    df1 = passivepy.match_corpus_level(
-        df, captions, n_process, batch_size, add_other_columns=True
-    )
+    reference = passivepy.match_corpus_level(df.copy(), "caption", 1, 1000, add_other_columns=True)["passive_count"]
+
+    report = pd.DataFrame({"caption": df["caption"], "native": native, "passivepy": reference.to_numpy()})
+    same_count = (report["native"] == report["passivepy"]).mean()
+    same_flag = ((report["native"] > 0) == (report["passivepy"] > 0)).mean()
+    print(f"🔎 Passive voice on {len(report)} captions: same count {same_count:.1%}, "
+          f"same passive/active flag {same_flag:.1%}")
+    return report
 
-    return df1['passive_count']
 
 if __name__ == "__main__":
     df = pd.read_csv("tom_text_toolbox/text_data_TEST.csv")
 
-    df = count_passive(df)
-    print(df['passive_count'])
+    df["passive_count"] = count_passive(df)
+    print(df["passive_count"])
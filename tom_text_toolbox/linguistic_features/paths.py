@@ -0,0 +1,23 @@
+import os
+
+# Package data lives next to the code, so it is found regardless of the CWD
+PACKAGE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+DICTIONARY_DIR = os.path.join(PACKAGE_DIR, "linguistic_dictionaries")
+
+CACHE_ENV_VAR = "TOM_TEXT_TOOLBOX_CACHE"
+
+
+def dictionary_path(filename: str) -> str:
+    """Absolute path of a file in linguistic_dictionaries/."""
+    return os.path.join(DICTIONARY_DIR, filename)
+
+
+def cache_dir(*parts: str) -> str:
+    """Return (and create) a directory under the toolbox cache.
+
+    The cache root is $TOM_TEXT_TOOLBOX_CACHE if set, else ~/.cache/tom_text_toolbox.
+    """
+    root = os.environ.get(CACHE_ENV_VAR) or os.path.join(os.path.expanduser("~"), ".cache", "tom_text_toolbox")
+    path = os.path.join(root, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
@@ -1,51 +1,85 @@
+import re
+import string
+import numpy as np
 import pandas as pd
-import readability
-from tqdm import tqdm
+from functools import lru_cache
+from itertools import chain
+from typing import Tuple
 
-# Constants for readability method and subkey
-READABILITY_METHOD = "Flesch-Kincaid"
-KINCAID_KEY = "Kincaid"
+# Same token filter as readability.getmeasures: tokens made only of punctuation are not words
+PUNCTRE = re.compile("^[%s]+$" % re.escape(string.punctuation))
 
-def parse_readability_measures(measures: dict, method: str = READABILITY_METHOD) -> dict:
-    """
-    Extracts the specified readability score from the 'readability grades' section.
-    """
-    grades = measures.get("readability grades", {})
-    if method == READABILITY_METHOD and KINCAID_KEY in grades:
-        return {f"readability_{KINCAID_KEY.lower()}": grades[KINCAID_KEY]}
-    return {}
+# Output column -> readability.getmeasures grade it reproduces
+READABILITY_COLUMNS = {
+    "readability_kincaid": "Kincaid",
+    "readability_flesch_reading_ease": "FleschReadingEase",
+    "readability_gunning_fog": "GunningFogIndex",
+    "readability_smog": "SMOGIndex",
+}
 
-def get_readability_safe(text: str) -> dict | None:
-    """
-    Safely computes readability measures for a single text.
-    Returns None if computation fails.
-    """
-    try:
-        measures = readability.getmeasures(text)
-        return parse_readability_measures(measures)
-    except ValueError:
-        return None
 
-def readability_scores(captions: pd.Series) -> pd.DataFrame:
+@lru_cache(maxsize=None)
+def _syllable_counter(lang: str = "en"):
+    # readability builds its language tables on import, so it is loaded on first use
+    from readability.langdata import LANGDATA
+
+    return LANGDATA[lang]["syllables"]
+
+
+@lru_cache(maxsize=1 << 20)
+def word_profile(token: str, lang: str = "en") -> Tuple[bool, int, bool]:
+    """(is a word, syllables, is a complex word) for one whitespace token, as readability counts them."""
+    if PUNCTRE.match(token) is not None:
+        return False, 0, False
+    syllables = _syllable_counter(lang)(token)
+    # Proper nouns and numbers are never complex
+    complex_word = syllables >= 3 and not token[0].isupper() and not token.isdigit()
+    return True, syllables, complex_word
+
+
+def readability_scores(captions: pd.Series, lang: str = "en", verbose: bool = True) -> pd.DataFrame:
     """
-    Computes readability scores for a pandas Series of captions.
-    Returns a DataFrame aligned with the original Series index.
+    Computes readability grades for a pandas Series of captions in bulk.
+
+    Matches readability.getmeasures on each caption (one sentence per line,
+    whitespace tokens) for Flesch-Kincaid grade, Flesch reading ease,
+    Gunning fog and SMOG. Every distinct token is profiled once; the counts
+    per caption and the grades are array operations. Captions without words
+    get NaN. Returns a DataFrame aligned with the original Series index.
     """
-    tqdm.pandas(desc="Computing readability")
-    results = captions.progress_apply(get_readability_safe)
+    texts = [c if isinstance(c, str) else "" for c in captions]
+    split = [t.split() for t in texts]
+    lengths = np.fromiter((len(tokens) for tokens in split), dtype=np.int64, count=len(split))
+    codes, uniques = pd.factorize(pd.Series(list(chain.from_iterable(split)), dtype=object))
+
+    profiles = np.array([word_profile(token, lang) for token in uniques], dtype=np.int64).reshape(-1, 3)
+    token_profiles = profiles[codes]
+    doc_id = np.repeat(np.arange(len(texts)), lengths)
+
+    def per_caption(values: np.ndarray) -> np.ndarray:
+        return np.bincount(doc_id, weights=values, minlength=len(texts)).astype(np.int64)
 
-    # Keep only successful results
-    valid_results = results[results.notnull()]
+    words = per_caption(token_profiles[:, 0])
+    syllables = per_caption(token_profiles[:, 1])
+    complex_words = per_caption(token_profiles[:, 2])
+    # Non-empty lines, as readability's sentence regex counts them
+    sentences = np.fromiter((sum(1 for line in t.split("\n") if line) for t in texts), dtype=np.int64,
+                            count=len(texts))
 
-    # Convert to DataFrame and align with original index
-    df = pd.DataFrame.from_records(valid_results)
-    df = df.reindex(captions.index)
+    # Same formulas and operation order as readability, so the floats match exactly
+    with np.errstate(divide="ignore", invalid="ignore"):
+        grades = pd.DataFrame({
+            "readability_kincaid": 11.8 * (syllables / words) + 0.39 * (words / sentences) - 15.59,
+            "readability_flesch_reading_ease": 206.835 - 84.6 * (syllables / words) - 1.015 * (words / sentences),
+            "readability_gunning_fog": 0.4 * ((words / sentences) + (100 * (complex_words / words))),
+            "readability_smog": np.sqrt(complex_words * (30 / sentences)) + 3,
+        }, index=captions.index)
+    grades.loc[words == 0] = np.nan
 
-    skipped = len(captions) - len(valid_results)
-    success_rate = (len(valid_results) / len(captions)) * 100
-    print(f"Skipped {skipped} rows, success rate: {success_rate:.2f}%")
+    if verbose and (words == 0).any():
+        print(f"📖 {int((words == 0).sum())} captions without words have no readability grades")
+    return grades
 
-    return df
 
 if __name__ == "__main__":
     captions = pd.Series([
@@ -1,90 +1,162 @@
-import spacy
-from spacy.symbols import NOUN, VERB, ADJ, ADV
+import numpy as np
 import pandas as pd
+import hashlib
 import json
 import os
+from typing import Dict, Tuple
+
+from .spacy_parse import SpacyParser
+
+STATE_VERBS = {"feel", "become", "change", "transform", "realize", "understand", "decide"}
+EVENT_VERBS = {"happen", "occur", "cause", "trigger", "lead", "result", "start", "end"}
+CLAUSE_DEPS = ["ccomp", "advcl", "acl", "relcl"]
+SUBJECT_DEPS = ["nsubj", "nsubjpass"]
+
+# Columns of doc.to_array(); everything below works on these integer IDs
+ATTRS = ["IS_ALPHA", "POS", "DEP", "HEAD", "LEMMA", "LOWER", "MORPH"]
+IS_ALPHA, POS, DEP, HEAD, LEMMA, LOWER, MORPH = range(len(ATTRS))
 
 class SpacyAnalyzer:
-    def __init__(self):
-        self.nlp = spacy.load("en_core_web_lg")
+    def __init__(self, parser: SpacyParser = None):
+        # Docs come from the shared parse stage (tagger, parser, lemmatizer; no NER)
+        self.parser = parser if parser is not None else SpacyParser()
 
         # Load cb_ratio.json from dictionaries folder
         base_dir = os.path.dirname(__file__)  # directory of spacy_measure_scores.py
         cb_path = os.path.join(base_dir, "..", "linguistic_dictionaries", "cb_ratio.json")
         cb_path = os.path.abspath(cb_path)
-        with open(cb_path, "r", encoding="utf-8") as f:
-            self.term_dict = json.load(f)
+        with open(cb_path, "rb") as f:
+            cb_bytes = f.read()
+        self.term_dict = json.loads(cb_bytes.decode("utf-8"))
         self.term_dict = {k: set(v) for k, v in self.term_dict.items()}
 
-    def score_spacy_measures(self, captions: pd.Series) -> pd.DataFrame:
-        docs = list(self.nlp.pipe(captions.astype(str), batch_size=2000, n_process=4))
-
-        state_verbs = {"feel", "become", "change", "transform", "realize", "understand", "decide"}
-        event_verbs = {"happen", "occur", "cause", "trigger", "lead", "result", "start", "end"}
-
-        informativeness, narrativity, boastful, syntax_complexity, tense_data = [], [], [], [], []
-        consumer_counts, brand_counts = [], []
-
-        for doc in docs:
-            alpha_tokens = [t for t in doc if t.is_alpha]
-            n_tokens = len(alpha_tokens)
-
-            # ---- Informativeness ----
-            content_count = doc.count_by(spacy.attrs.POS)
-            content_tokens = content_count.get(NOUN, 0) + content_count.get(VERB, 0) + \
-                             content_count.get(ADJ, 0) + content_count.get(ADV, 0)
-            informativeness.append(round(content_tokens / n_tokens, 3) if n_tokens else 0.0)
-
-            # ---- Narrativity ----
-            verbs = [t.lemma_ for t in alpha_tokens if t.pos_ == "VERB"]
-            n_verbs = len(verbs)
-            if n_verbs:
-                state_count = sum(1 for v in verbs if v in state_verbs)
-                event_count = sum(1 for v in verbs if v in event_verbs)
-                narrativity.append(round((state_count + event_count) / n_verbs, 3))
-            else:
-                narrativity.append(0.0)
-
-            # ---- Syntax complexity ----
-            dep_counts = doc.count_by(spacy.attrs.DEP)
-            num_clauses = sum(dep_counts.get(doc.vocab.strings[dep], 0) for dep in ["ccomp", "advcl", "acl", "relcl"])
-            max_depth = max((len(list(t.ancestors)) for t in alpha_tokens), default=0)
-            num_subtrees = sum(1 for t in alpha_tokens if len(list(t.children)) > 1)
-            syntax_complexity.append(round(num_clauses * 1.5 + max_depth * 1.2 + num_subtrees * 1.0, 2))
-
-            # ---- Verb tenses ----
-            counts = {"Past": 0, "Present": 0}
-            for t in alpha_tokens:
-                if t.pos_ == "VERB" and "VerbForm=Fin" in t.morph:
-                    if "Tense=Past" in t.morph:
-                        counts["Past"] += 1
-                    elif "Tense=Pres" in t.morph:
-                        counts["Present"] += 1
-            tense_data.append(counts)
-
-            # ---- Consumer/Brand ratio ----
-            subjects = [t for t in doc if t.dep_ in ("nsubj", "nsubjpass")]
-            c_count = sum(1 for tok in subjects if tok.lemma_.lower() in self.term_dict["user"] or tok.text.lower() in self.term_dict["user"])
-            b_count = sum(1 for tok in subjects if tok.lemma_.lower() in self.term_dict["brand"] or tok.text.lower() in self.term_dict["brand"] 
-                          or tok.lemma_.lower() in self.term_dict["product"] or tok.text.lower() in self.term_dict["product"])
-            consumer_counts.append(c_count)
-            brand_counts.append(b_count)
-
-            # ---- Boastful Language ----
-            boast_count = sum(1 for token in doc if token.tag_ in ["JJS", "RBS"])
-            boastful.append(boast_count)
-
-        # Build final DataFrame
+        # Feature-cache key: changes with spaCy, the model, its components or the cb_ratio dictionary
+        self.version = f"{self.parser.version}|cb_ratio-{hashlib.sha256(cb_bytes).hexdigest()[:12]}"
+
+        # StringStore IDs of the vocabularies, and per-ID flags filled in as new lemmas/morphs appear
+        self._strings = self.parser.nlp.vocab.strings
+        self._ids = {
+            "narrative_verbs": self._hash(STATE_VERBS | EVENT_VERBS),
+            "clause_deps": self._hash(CLAUSE_DEPS),
+            "subject_deps": self._hash(SUBJECT_DEPS),
+            "user": self._hash(self.term_dict["user"]),
+            "brand": self._hash(self.term_dict["brand"] | self.term_dict["product"]),
+        }
+        self._lemma_flags: Dict[int, Tuple[bool, bool]] = {}
+        self._morph_flags: Dict[int, Tuple[bool, bool]] = {}
+
+    def _hash(self, words) -> np.ndarray:
+        return np.array([self._strings.add(w) for w in words], dtype=np.uint64)
+
+    def _lookup(self, ids: np.ndarray, flags: Dict[int, Tuple[bool, bool]], compute) -> Tuple[np.ndarray, np.ndarray]:
+        # Resolve each distinct ID once per process, then broadcast the two flags back
+        unique, inverse = np.unique(ids, return_inverse=True)
+        for i in unique.tolist():
+            if i not in flags:
+                flags[i] = compute(self._strings[i])
+        table = np.array([flags[i] for i in unique.tolist()], dtype=bool).reshape(-1, 2)
+        return table[inverse, 0], table[inverse, 1]
+
+    def _lemma_in_dictionaries(self, lemma: str) -> Tuple[bool, bool]:
+        lemma = lemma.lower()
+        return (lemma in self.term_dict["user"],
+                lemma in self.term_dict["brand"] or lemma in self.term_dict["product"])
+
+    @staticmethod
+    def _finite_tense(morph: str) -> Tuple[bool, bool]:
+        # Same test as `"VerbForm=Fin" in token.morph`: multi-valued fields count each value
+        features = {f"{field}={value}" for field, _, values in (f.partition("=") for f in morph.split("|"))
+                    for value in values.split(",")}
+        finite = "VerbForm=Fin" in features
+        past = finite and "Tense=Past" in features
+        return past, finite and not past and "Tense=Pres" in features
+
+    def score_spacy_measures(self, captions: pd.Series, docs: list = None) -> pd.DataFrame:
+        """Informativeness, narrativity, syntax complexity, cb_ratio and tense counts per caption.
+
+        `docs` are the parsed captions; by default they come from the parser
+        (and its DocBin store). All docs are stacked into one `to_array`
+        table and every measure is a vectorized count over integer IDs.
+        """
+        from spacy.symbols import NOUN, VERB, ADJ, ADV
+
+        if docs is None:
+            docs = self.parser.parse(captions.astype(str))
+
+        n_docs = len(docs)
+        lengths = np.array([len(doc) for doc in docs], dtype=np.int64)
+        arrays = [doc.to_array(ATTRS) for doc in docs if len(doc)]
+        table = np.concatenate(arrays) if arrays else np.zeros((0, len(ATTRS)), dtype=np.uint64)
+        doc_id = np.repeat(np.arange(n_docs), lengths)
+
+        def per_doc(mask: np.ndarray) -> np.ndarray:
+            return np.bincount(doc_id[mask], minlength=n_docs)
+
+        alpha = table[:, IS_ALPHA] == 1
+        pos = table[:, POS]
+        verb = alpha & (pos == VERB)
+
+        # ---- Informativeness ----
+        content = np.isin(pos, np.array([NOUN, VERB, ADJ, ADV], dtype=np.uint64))
+
+        # ---- Narrativity ----
+        narrative = verb & np.isin(table[:, LEMMA], self._ids["narrative_verbs"])
+
+        # ---- Syntax complexity ----
+        # HEAD is a relative offset stored as uint64; roots point at themselves
+        offset = table[:, HEAD].astype(np.int64)
+        heads = np.arange(len(table)) + offset
+        is_root = offset == 0
+        # Depth (number of ancestors) in one pass per tree level over the head array
+        depth = np.zeros(len(table), dtype=np.int64)
+        for _ in range(len(table)):
+            deeper = np.where(is_root, 0, depth[heads] + 1)
+            if np.array_equal(deeper, depth):
+                break
+            depth = deeper
+        max_depth = np.zeros(n_docs, dtype=np.int64)
+        np.maximum.at(max_depth, doc_id[alpha], depth[alpha])
+        children = np.bincount(heads[~is_root], minlength=len(table))
+        clauses = np.isin(table[:, DEP], self._ids["clause_deps"])
+
+        # ---- Verb tenses ----
+        past, present = self._lookup(table[verb, MORPH], self._morph_flags, self._finite_tense)
+        verb_doc = doc_id[verb]
+
+        # ---- Consumer/Brand ratio ----
+        subject = np.isin(table[:, DEP], self._ids["subject_deps"])
+        lemma_user, lemma_brand = self._lookup(table[subject, LEMMA], self._lemma_flags, self._lemma_in_dictionaries)
+        lower = table[subject, LOWER]
+        subject_doc = doc_id[subject]
+        consumer = lemma_user | np.isin(lower, self._ids["user"])
+        brand = lemma_brand | np.isin(lower, self._ids["brand"])
+
+        counts = {
+            "alpha": per_doc(alpha), "content": per_doc(content), "verbs": per_doc(verb),
+            "narrative": per_doc(narrative), "clauses": per_doc(clauses),
+            "subtrees": per_doc(alpha & (children > 1)),
+            "past": np.bincount(verb_doc[past], minlength=n_docs),
+            "present": np.bincount(verb_doc[present], minlength=n_docs),
+            "consumer": np.bincount(subject_doc[consumer], minlength=n_docs),
+            "brand": np.bincount(subject_doc[brand], minlength=n_docs),
+        }
+        counts = {name: values.tolist() for name, values in counts.items()}
+        max_depth = max_depth.tolist()
+
+        # Final arithmetic on Python ints, exactly as the per-token version rounded it
         df = pd.DataFrame({
-            "informativeness": informativeness,
-            "narrativity": narrativity,
-            "syntax_complexity": syntax_complexity,
+            "informativeness": [round(c / n, 3) if n else 0.0 for c, n in zip(counts["content"], counts["alpha"])],
+            "narrativity": [round(c / n, 3) if n else 0.0 for c, n in zip(counts["narrative"], counts["verbs"])],
+            "syntax_complexity": [
+                round(c * 1.5 + d * 1.2 + s * 1.0, 2)
+                for c, d, s in zip(counts["clauses"], max_depth, counts["subtrees"])
+            ],
             "cb_ratio": [
                 float('inf') if b == 0 and c > 0 else 0.0 if b == 0 else c / b
-                for c, b in zip(consumer_counts, brand_counts)
+                for c, b in zip(counts["consumer"], counts["brand"])
             ],
-            "tense_past": [t["Past"] for t in tense_data],
-            "tense_present": [t["Present"] for t in tense_data]
+            "tense_past": counts["past"],
+            "tense_present": counts["present"]
         }, index=captions.index)
 
         return df
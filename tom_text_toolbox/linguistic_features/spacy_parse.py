@@ -0,0 +1,165 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import uuid
+import pandas as pd
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ..feature_cache import text_hash
+from ..profiling import timed_load
+from .paths import cache_dir
+
+SPACY_MODEL = "en_core_web_lg"
+# The toolbox features need the tagger, parser, morphology and lemmas, never entities
+DEFAULT_EXCLUDE = ("ner",)
+# Docs per DocBin file; a lookup loads whole shards, so they are kept moderate
+SHARD_SIZE = 5000
+# Bump when the shard layout or the stored attributes change
+DOC_STORE_FORMAT_VERSION = 1
+# Stays below SQLite's limit on bound parameters per statement
+_BATCH = 500
+
+
+@lru_cache(maxsize=None)
+def load_spacy(model: str = SPACY_MODEL, exclude: Tuple[str, ...] = DEFAULT_EXCLUDE):
+    """Load a spaCy pipeline once per process, without the `exclude`d components."""
+    # spaCy is imported here so importing the toolbox does not pay for it
+    import spacy
+
+    with timed_load(f"spacy {model}"):
+        return spacy.load(model, exclude=list(exclude))
+
+
+def pipeline_version(nlp) -> str:
+    """spaCy version, model name/version and active components (part of every cache key)."""
+    import spacy
+
+    return (f"spacy-{spacy.__version__}|{nlp.meta.get('lang')}_{nlp.meta.get('name')}-{nlp.meta.get('version')}"
+            f"|{','.join(nlp.pipe_names)}")
+
+
+class DocStore:
+    """Parsed spaCy docs persisted as DocBin shards, looked up by caption hash.
+
+    Every shard is one DocBin file under the toolbox cache; a SQLite index
+    maps each caption hash to its shard and position. There is one store per
+    pipeline version, so a different model or component set never reuses
+    another pipeline's parses.
+    """
+
+    def __init__(self, nlp, store_dir: Optional[str] = None):
+        self.nlp = nlp
+        key = hashlib.sha256(f"{DOC_STORE_FORMAT_VERSION}|{pipeline_version(nlp)}".encode()).hexdigest()[:16]
+        self.dir = store_dir or cache_dir("spacy_docs", f"{nlp.meta.get('name')}-{key}")
+        os.makedirs(self.dir, exist_ok=True)
+        self.path = os.path.join(self.dir, "index.sqlite")
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("CREATE TABLE IF NOT EXISTS docs "
+                           "(text_hash TEXT PRIMARY KEY, shard TEXT NOT NULL, position INTEGER NOT NULL)")
+        return connection
+
+    def _locate(self, hashes: List[str]) -> Dict[str, Tuple[str, int]]:
+        found = {}
+        with self._connect() as connection:
+            for start in range(0, len(hashes), _BATCH):
+                batch = hashes[start:start + _BATCH]
+                rows = connection.execute(
+                    f"SELECT text_hash, shard, position FROM docs WHERE text_hash IN ({','.join('?' * len(batch))})",
+                    batch,
+                )
+                found.update((h, (shard, position)) for h, shard, position in rows)
+        return found
+
+    def get(self, hashes: List[str]) -> Dict[str, object]:
+        """Return {hash: Doc} for the hashes already in the store."""
+        from spacy.tokens import DocBin
+
+        by_shard: Dict[str, List[Tuple[str, int]]] = {}
+        for h, (shard, position) in self._locate(hashes).items():
+            by_shard.setdefault(shard, []).append((h, position))
+
+        docs = {}
+        for shard, wanted in by_shard.items():
+            path = os.path.join(self.dir, shard)
+            if not os.path.exists(path):
+                continue  # shard removed by hand: those captions are simply parsed again
+            shard_docs = list(DocBin().from_disk(path).get_docs(self.nlp.vocab))
+            docs.update((h, shard_docs[position]) for h, position in wanted)
+        return docs
+
+    def put(self, hashes: List[str], docs: List[object]):
+        """Write docs to new shards of at most SHARD_SIZE, then index them."""
+        from spacy.tokens import DocBin
+
+        for start in range(0, len(docs), SHARD_SIZE):
+            shard = f"{uuid.uuid4().hex}.spacy"
+            doc_bin = DocBin(store_user_data=False)
+            for doc in docs[start:start + SHARD_SIZE]:
+                doc_bin.add(doc)
+            # Write then rename, so the index never points at a half-written shard
+            tmp = os.path.join(self.dir, f"{shard}.{os.getpid()}.tmp")
+            with open(tmp, "wb") as f:
+                f.write(doc_bin.to_bytes())
+            os.replace(tmp, os.path.join(self.dir, shard))
+            with self._connect() as connection:
+                connection.executemany("INSERT OR REPLACE INTO docs VALUES (?, ?, ?)",
+                                       [(h, shard, i) for i, h in enumerate(hashes[start:start + SHARD_SIZE])])
+
+    def __len__(self) -> int:
+        with self._connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+
+class SpacyParser:
+    """The one spaCy parse shared by every spaCy-based scorer.
+
+    Only the components the features need are loaded (everything but
+    `exclude`). With `store` on, docs are read from / written to a DocBin
+    store, so reruns and additional spaCy features skip parsing entirely;
+    only captions never seen before go through `nlp.pipe`.
+    """
+
+    def __init__(self, model: str = SPACY_MODEL, exclude: Sequence[str] = DEFAULT_EXCLUDE, n_process: int = 1,
+                 batch_size: int = 256, store: bool = True, store_dir: Optional[str] = None):
+        self.nlp = load_spacy(model, tuple(exclude))
+        self.n_process = n_process
+        self.batch_size = batch_size
+        self.version = pipeline_version(self.nlp)
+        self.store = DocStore(self.nlp, store_dir) if store else None
+        # Docs of the latest call, so several scorers on the same captions share one parse
+        self._recent: Dict[str, object] = {}
+        # Stages may run in threads; one parse at a time keeps _recent and the store consistent
+        self._lock = threading.Lock()
+
+    def parse(self, captions: Sequence[str]) -> List[object]:
+        """One Doc per caption, in order (identical captions share a Doc)."""
+        with self._lock:
+            return self._parse(captions)
+
+    def _parse(self, captions: Sequence[str]) -> List[object]:
+        if isinstance(captions, pd.Series):
+            captions = captions.tolist()
+        texts = [c if isinstance(c, str) else str(c) for c in captions]
+        hashes = [text_hash(t) for t in texts]
+        first_seen: Dict[str, int] = {}
+        for position, h in enumerate(hashes):
+            first_seen.setdefault(h, position)
+
+        docs = {h: self._recent[h] for h in first_seen if h in self._recent}
+        unseen = [h for h in first_seen if h not in docs]
+        if unseen and self.store is not None:
+            docs.update(self.store.get(unseen))
+        missing = [h for h in unseen if h not in docs]
+        if missing:
+            parsed = list(self.nlp.pipe((texts[first_seen[h]] for h in missing), batch_size=self.batch_size,
+                                        n_process=self.n_process))
+            if self.store is not None:
+                self.store.put(missing, parsed)
+            docs.update(zip(missing, parsed))
+
+        self._recent = docs
+        return [docs[h] for h in hashes]
@@ -0,0 +1,55 @@
+import pandas as pd
+from functools import lru_cache
+
+from .inference import InferenceEngine, zero_shot_scores
+from .model_backends import load_model
+
+# distilbart-mnli was the fastest of the NLI models tried in features_in_progress
+MODEL_NAME = "valhalla/distilbart-mnli-12-1"
+HYPOTHESIS_TEMPLATE = "This example is {}."
+# Part of the feature-cache key: bump when the model, labels or hypotheses change
+SPEECH_ACTS_VERSION = f"{MODEL_NAME}|{HYPOTHESIS_TEMPLATE}:1"
+
+# Each label fills HYPOTHESIS_TEMPLATE as is ("This example is Directive.")
+SPEECH_ACT_LABELS = ("Assertive", "Commissive", "Directive")
+
+@lru_cache(maxsize=None)
+def load_speech_act_model(model_name: str = MODEL_NAME, backend: str = "torch"):
+    """Load the NLI tokenizer and model once per process and backend."""
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    return tokenizer, load_model(model_name, "sequence-classification", backend)
+
+def classify_speech_acts(captions: pd.Series, model_name: str = MODEL_NAME,
+                         hypothesis_template: str = HYPOTHESIS_TEMPLATE, multi_label: bool = True,
+                         max_tokens: int = 16384, backend: str = "torch") -> pd.DataFrame:
+    """Zero-shot Assertive/Commissive/Directive probabilities per caption.
+
+    Every caption is paired with one hypothesis per act. Captions and
+    hypotheses are each tokenized once, and all pairs run through the shared
+    length-bucketed engine. With `multi_label` (default) each act gets an
+    independent probability; otherwise they sum to 1. `speech_act` is the
+    most likely act.
+    """
+    tokenizer, model = load_speech_act_model(model_name, backend)
+    labels = list(SPEECH_ACT_LABELS)
+    texts = [caption if isinstance(caption, str) else "" for caption in captions]
+
+    engine = InferenceEngine(tokenizer, name=f"Speech acts ({backend})", max_tokens=max_tokens, device=model.device)
+    scores = zero_shot_scores(engine, model, texts, labels, hypothesis_template, multi_label=multi_label)
+
+    df = pd.DataFrame(scores.round(4), columns=[f"speech_act_{label.lower()}" for label in labels], index=captions.index)
+    df["speech_act"] = [labels[i] for i in scores.argmax(axis=1)] if len(texts) else []
+    return df
+
+if __name__ == "__main__":
+    df = pd.DataFrame({
+        "caption": [
+            "We’ll launch a loyalty program for our customers next month.",
+            "Sign up today to receive your free sample.",
+            "Our company has served over 100,000 satisfied customers since 2010.",
+        ]
+    })
+
+    print(pd.concat([df, classify_speech_acts(df["caption"])], axis=1))
@@ -0,0 +1,126 @@
+import hashlib
+import os
+import sqlite3
+import numpy as np
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+from .parallel import run_sharded, worker_state
+from .paths import cache_dir
+
+# Bump when the cache layout or the meaning of a stored result changes
+SPELLING_FORMAT_VERSION = 1
+
+
+def open_dictionary(language: str):
+    """An enchant.Dict for `language` (enchant is imported on first use)."""
+    import enchant
+
+    return enchant.Dict(language)
+
+
+def dictionary_dirs() -> List[str]:
+    """Where enchant's hunspell/myspell providers look for <language>.dic files, in search order."""
+    config_dirs = [os.environ.get("ENCHANT_CONFIG_DIR", ""),
+                   os.path.join(os.environ.get("XDG_CONFIG_HOME") or os.path.expanduser("~/.config"), "enchant")]
+    data_dirs = (os.environ.get("XDG_DATA_DIRS") or "/usr/local/share:/usr/share").split(os.pathsep)
+    dirs = [os.path.join(d, "hunspell") for d in config_dirs if d]
+    for d in data_dirs:
+        dirs += [os.path.join(d, "hunspell"), os.path.join(d, "myspell"), os.path.join(d, "myspell", "dicts")]
+    return dirs
+
+
+def dictionary_files(language: str) -> List[str]:
+    """The .dic and .aff files of the first `language` dictionary on the search path (empty if none)."""
+    for directory in dictionary_dirs():
+        dic = os.path.join(directory, f"{language}.dic")
+        if os.path.exists(dic):
+            aff = os.path.join(directory, f"{language}.aff")
+            return [dic, aff] if os.path.exists(aff) else [dic]
+    return []
+
+
+def _file_identity(path: str) -> str:
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+def dictionary_version(checker) -> str:
+    """Describe the enchant library, provider and dictionary files behind `checker` (part of the cache key).
+
+    Files are identified by path, size and modification time, so installing
+    or updating a dictionary starts a new cache.
+    """
+    import enchant
+
+    provider = getattr(checker, "provider", None)
+    parts = [enchant.get_enchant_version()]
+    if provider is not None:
+        parts += [provider.name, _file_identity(provider.file) if os.path.exists(provider.file) else provider.file]
+    language = getattr(checker, "tag", None)
+    if language:
+        parts += [language] + [_file_identity(path) for path in dictionary_files(language)]
+    return "|".join(parts)
+
+
+def _check_shard(words: Sequence[str]) -> np.ndarray:
+    checker = worker_state("spelling_checker")
+    return np.fromiter((checker.check(w) for w in words), dtype=bool, count=len(words))
+
+
+class SpellingCache:
+    """Spell-check results per word, checked at most once per language and dictionary version.
+
+    Results live in memory for the process and in a SQLite file under the
+    toolbox cache, so reruns and new batches only ask enchant about words
+    that have never been seen before.
+    """
+
+    def __init__(self, language: str = "en_US", checker=None, store_dir: Optional[str] = None):
+        self.language = language
+        self.checker = checker if checker is not None else open_dictionary(language)
+        self.version = dictionary_version(self.checker)
+
+        key = hashlib.sha256(f"{SPELLING_FORMAT_VERSION}|{language}|{self.version}".encode()).hexdigest()[:16]
+        store_dir = store_dir or cache_dir("spelling")
+        os.makedirs(store_dir, exist_ok=True)
+        self.path = os.path.join(store_dir, f"{language}-{key}.sqlite")
+        self._known: Optional[Dict[str, bool]] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("CREATE TABLE IF NOT EXISTS words (word TEXT PRIMARY KEY, correct INTEGER NOT NULL)")
+        return connection
+
+    def _load(self) -> Dict[str, bool]:
+        if self._known is None:
+            with self._connect() as connection:
+                self._known = {word: bool(correct) for word, correct in connection.execute("SELECT word, correct FROM words")}
+        return self._known
+
+    def check(self, words: Sequence[str], n_workers: int = 1) -> np.ndarray:
+        """Return whether each word is spelled correctly; `words` should already be unique."""
+        known = self._load()
+        new_words = [w for w in words if w not in known]
+
+        if new_words:
+            if n_workers == 1:
+                results = np.fromiter((self.checker.check(w) for w in new_words), dtype=bool, count=len(new_words))
+            else:
+                results = np.concatenate(run_sharded(_check_shard, new_words, n_workers,
+                                                     state={"spelling_checker": (open_dictionary, (self.language,))}))
+            known.update(zip(new_words, results.tolist()))
+            with self._connect() as connection:
+                connection.executemany("INSERT OR REPLACE INTO words VALUES (?, ?)",
+                                       zip(new_words, results.astype(int).tolist()))
+
+        return np.fromiter((known[w] for w in words), dtype=bool, count=len(words))
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+
+@lru_cache(maxsize=None)
+def get_spelling_cache(language: str = "en_US", store_dir: Optional[str] = None) -> SpellingCache:
+    """One SpellingCache per language per process."""
+    return SpellingCache(language, store_dir=store_dir)
@@ -0,0 +1,158 @@
+import re
+import numpy as np
+import pandas as pd
+from typing import List, Dict, Tuple
+
+# Text is split into maximal runs of word / non-word characters, exactly the
+# units that regex `\b` boundaries separate. Every term in term_dict.json
+# starts and ends on a run boundary, so matching can be done run by run.
+RUN_PATTERN = re.compile(r"\w+|\W+")
+
+
+def is_word_run(run: str) -> bool:
+    return run[0].isalnum() or run[0] == "_"
+
+
+class _TrieNode:
+    __slots__ = ("children", "exact", "wildcards", "wildcard_lengths")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        # (category index, term index) of terms whose last run ends here
+        self.exact: List[Tuple[int, int]] = []
+        # final-run prefix -> [(category index, term index)] for "term*" entries
+        self.wildcards: Dict[str, List[Tuple[int, int]]] = {}
+        self.wildcard_lengths: List[int] = []
+
+
+class TermMatcher:
+    """Count every term category in a single pass per caption.
+
+    The matcher is a trie over word/non-word runs and reproduces the counts of
+    the per-category regexes built by `TermCounter.build_pattern`:
+    `\\bterm\\b` for plain terms and `\\bprefix\\w*` for terms ending in `*`,
+    counted left to right without overlaps, with the earliest listed term
+    winning when several terms of a category match at the same position.
+    """
+
+    def __init__(self, term_dict: Dict[str, List[str]], ignore_case: bool = False):
+        self.categories = list(term_dict)
+        self.ignore_case = ignore_case
+        self.root = _TrieNode()
+
+        for cat_idx, terms in enumerate(term_dict.values()):
+            for term_idx, term in enumerate(terms):
+                self._insert(term, cat_idx, term_idx)
+
+        for node in self._walk(self.root):
+            node.wildcard_lengths = sorted({len(p) for p in node.wildcards})
+        # first characters that can open a match, used to skip most runs cheaply
+        self._first_chars = {run[0] for run in self.root.children} | {p[0] for p in self.root.wildcards}
+
+    def _walk(self, node: _TrieNode):
+        yield node
+        for child in node.children.values():
+            yield from self._walk(child)
+
+    def _insert(self, term: str, cat_idx: int, term_idx: int):
+        if self.ignore_case:
+            term = term.lower()
+        wildcard = term.endswith("*")
+        if wildcard:
+            term = term[:-1]
+        runs = RUN_PATTERN.findall(term)
+        if not runs:
+            return
+
+        node = self.root
+        for run in runs[:-1]:
+            node = node.children.setdefault(run, _TrieNode())
+        if wildcard:
+            node.wildcards.setdefault(runs[-1], []).append((cat_idx, term_idx))
+        else:
+            node = node.children.setdefault(runs[-1], _TrieNode())
+            node.exact.append((cat_idx, term_idx))
+
+    def _matches_at(self, runs: List[str], start: int) -> Dict[int, Tuple[int, int]]:
+        """Return {category: (term index, next free run)} for the first-listed match at `start`."""
+        best: Dict[int, Tuple[int, int]] = {}
+        n_runs = len(runs)
+
+        def offer(entries, next_run):
+            for cat_idx, term_idx in entries:
+                current = best.get(cat_idx)
+                if current is None or term_idx < current[0]:
+                    best[cat_idx] = (term_idx, next_run)
+
+        # `\b` before a term that starts with a non-word character needs a
+        # word character right before it, i.e. it cannot open the text.
+        starts_with_word = is_word_run(runs[start])
+        if not starts_with_word and start == 0:
+            return best
+
+        node = self.root
+        pos = start
+        while node is not None and pos < n_runs:
+            run = runs[pos]
+            word = is_word_run(run)
+
+            for length in node.wildcard_lengths:
+                if length > len(run):
+                    break
+                entries = node.wildcards.get(run[:length])
+                if entries is None:
+                    continue
+                if word or length < len(run) or pos + 1 == n_runs:
+                    # `\w*` stops inside or at the end of this run
+                    offer(entries, pos + 1)
+                else:
+                    # the prefix ends a non-word run, so `\w*` eats the next word run
+                    offer(entries, pos + 2)
+
+            node = node.children.get(run)
+            if node is not None and node.exact:
+                # `\b` after a trailing non-word run needs a word character next
+                if word or pos + 1 < n_runs:
+                    offer(node.exact, pos + 1)
+            pos += 1
+
+        return best
+
+    def count_text(self, text: str) -> np.ndarray:
+        """Count matches of every category in a single caption."""
+        counts = np.zeros(len(self.categories), dtype=np.int64)
+        if self.ignore_case:
+            text = text.lower()
+        runs = RUN_PATTERN.findall(text)
+        if not runs:
+            return counts
+
+        first_chars = self._first_chars
+        next_free = [0] * len(self.categories)
+
+        for start, run in enumerate(runs):
+            if run[0] not in first_chars:
+                continue
+            for cat_idx, (_, next_run) in self._matches_at(runs, start).items():
+                if start >= next_free[cat_idx]:
+                    counts[cat_idx] += 1
+                    next_free[cat_idx] = next_run
+
+        return counts
+
+    def count(self, captions: pd.Series) -> pd.DataFrame:
+        """Count all categories for a Series of captions (NaN rows stay NaN, like `str.count`)."""
+        counts = np.zeros((len(captions), len(self.categories)), dtype=np.int64)
+        missing = np.zeros(len(captions), dtype=bool)
+
+        for row, caption in enumerate(captions):
+            if isinstance(caption, str):
+                counts[row] = self.count_text(caption)
+            else:
+                missing[row] = True
+
+        if missing.any():
+            counts = counts.astype(float)
+            counts[missing] = np.nan
+
+        return pd.DataFrame(counts, index=captions.index, columns=self.categories)
@@ -0,0 +1,149 @@
+import re
+import threading
+import pandas as pd
+from functools import lru_cache
+from typing import List, Optional, Union
+
+from .lexicon_matrix import CountMatrix
+from .parallel import run_sharded
+
+LINK_PATTERN = re.compile(r"http\S+|www\.\S+")
+ASCII_WORD_PATTERN = re.compile(r"\b[a-zA-Z]+\b")
+
+
+# NLTK data packages used by the token views, with the path nltk.data.find looks for
+NLTK_RESOURCES = {
+    "punkt_tab": "tokenizers/punkt_tab/english/",
+    "stopwords": "corpora/stopwords",
+}
+
+
+@lru_cache(maxsize=None)
+def ensure_nltk_data(package: str):
+    """Check that an NLTK data package is installed, downloading it on first use only.
+
+    Nothing is checked or downloaded at import time, so importing the toolbox
+    never touches the network.
+    """
+    import nltk
+
+    try:
+        nltk.data.find(NLTK_RESOURCES[package])
+    except LookupError:
+        nltk.download(package, quiet=True)
+        # Raises a LookupError with NLTK's install instructions if the download failed
+        nltk.data.find(NLTK_RESOURCES[package])
+
+
+@lru_cache(maxsize=None)
+def english_stopwords() -> frozenset:
+    from nltk.corpus import stopwords
+
+    ensure_nltk_data("stopwords")
+    return frozenset(stopwords.words("english"))
+
+
+def _tokenize_shard(texts: List[str]) -> List[List[str]]:
+    from nltk.tokenize import word_tokenize
+
+    ensure_nltk_data("punkt_tab")
+    return [word_tokenize(text) for text in texts]
+
+
+class TokenizedCaptions:
+    """Tokenize a Series of captions once and share the token views between scorers.
+
+    Every view is a list of token lists aligned with `captions.index` and is
+    computed on first access:
+
+    - `raw`: NLTK `word_tokenize` tokens (the `token_captions` column)
+    - `lower`: `raw` lowercased
+    - `alpha`: lowercased alphabetic `raw` tokens
+    - `content`: `alpha` without English stopwords
+    - `whitespace`: lowercased whitespace-split tokens
+    - `words`: ASCII words matched by `\\b[a-zA-Z]+\\b`, case preserved
+    - `words_without_links`: `words` after removing http/www links
+
+    Non-string captions (e.g. NaN) produce empty token lists. With
+    `n_workers` > 1 the `word_tokenize` pass is sharded over worker processes.
+    Views and count matrices are built once even when several stage threads
+    ask for the same one at the same time.
+    """
+
+    def __init__(self, captions: Union[pd.Series, List[str]], raw: Optional[pd.Series] = None,
+                 n_workers: int = 1):
+        if not isinstance(captions, pd.Series):
+            captions = pd.Series(captions)
+        self.captions = captions
+        self.index = captions.index
+        self._texts = [c if isinstance(c, str) else "" for c in captions]
+        self._views = {}
+        self._matrices = {}
+        # One lock per view or matrix, so concurrent first accesses build it once
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        self.n_workers = n_workers
+        if raw is not None:
+            self._views["raw"] = list(raw)
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def _lock(self, key) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(key, threading.Lock())
+
+    def _view(self, name: str, build) -> List[List[str]]:
+        if name not in self._views:
+            # Views build on other views (content -> alpha -> raw), each under its own lock
+            with self._lock(name):
+                if name not in self._views:
+                    self._views[name] = build()
+        return self._views[name]
+
+    @property
+    def raw(self) -> List[List[str]]:
+        return self._view("raw", lambda: [
+            tokens for shard in run_sharded(_tokenize_shard, self._texts, self.n_workers) for tokens in shard
+        ])
+
+    @property
+    def lower(self) -> List[List[str]]:
+        return self._view("lower", lambda: [[t.lower() for t in tokens] for tokens in self.raw])
+
+    @property
+    def alpha(self) -> List[List[str]]:
+        return self._view("alpha", lambda: [[t.lower() for t in tokens if t.isalpha()] for tokens in self.raw])
+
+    @property
+    def content(self) -> List[List[str]]:
+        return self._view("content", lambda: [
+            [t for t in tokens if t not in english_stopwords()] for tokens in self.alpha
+        ])
+
+    @property
+    def whitespace(self) -> List[List[str]]:
+        return self._view("whitespace", lambda: [text.lower().split() for text in self._texts])
+
+    @property
+    def words(self) -> List[List[str]]:
+        return self._view("words", lambda: [ASCII_WORD_PATTERN.findall(text) for text in self._texts])
+
+    @property
+    def words_without_links(self) -> List[List[str]]:
+        return self._view("words_without_links", lambda: [
+            ASCII_WORD_PATTERN.findall(LINK_PATTERN.sub("", text)) for text in self._texts
+        ])
+
+    def count_matrix(self, view: str = "raw", lowercase: bool = False) -> CountMatrix:
+        """Sparse caption × vocabulary counts of one view, built once and shared by the lexicon scorers."""
+        key = (view, lowercase)
+        if key not in self._matrices:
+            with self._lock(("matrix", view, lowercase)):
+                if key not in self._matrices:
+                    self._matrices[key] = CountMatrix(getattr(self, view), lowercase=lowercase)
+        return self._matrices[key]
+
+    def as_series(self, view: str = "raw") -> pd.Series:
+        """Return one view as a Series aligned with the captions."""
+        return pd.Series(getattr(self, view), index=self.index)
@@ -1,13 +1,18 @@
+import numpy as np
 import pandas as pd
-from tqdm import tqdm
 
-def classify_whissell_scores(captions: pd.Series, dictionary: str|pd.DataFrame = "tom_text_toolbox/linguistic_dictionaries/whissell_dict.csv") -> pd.DataFrame:
+from .lexicon_matrix import CountMatrix
+from .lexicon_store import Lexicon, load_lexicon
+from .tokens import TokenizedCaptions
+
+def classify_whissell_scores(captions: pd.Series | TokenizedCaptions, dictionary: str|pd.DataFrame|None = None) -> pd.DataFrame:
     """
     Calculate Whissell scores for a series of captions and return as a dictionary of Series.
 
     Parameters:
-        captions (pd.Series): Series of caption strings.
-        dictionary (pd.DataFrame): Whissell dictionary with 'pleas', 'activ', 'image' columns, indexed by 'word'.
+        captions (pd.Series | TokenizedCaptions): Series of tokenized captions, or the shared token artifact.
+        dictionary (str | pd.DataFrame | None): Whissell dictionary with 'pleas', 'activ', 'image' columns, indexed by 'word'.
+            Defaults to the compiled copy of linguistic_dictionaries/whissell_dict.csv.
 
     Returns:
         dict[str, pd.Series]: Dictionary with keys:
@@ -15,35 +20,31 @@ def classify_whissell_scores(captions: pd.Series, dictionary: str|pd.DataFrame =
             - 'mean_active'
             - 'mean_image'
     """
-    if isinstance(dictionary, str):
-        dictionary = pd.read_csv(dictionary)
-
-    if dictionary.index.name != 'word':
-        dictionary = dictionary.set_index('word')
-
-    pleasant = []
-    active = []
-    image = []
-
-    for caption in tqdm(captions, desc="Scoring captions"):
-        matched_words = [w for w in caption if w in dictionary.index]
-
-        if matched_words:
-            scores = dictionary.loc[matched_words]
-            means = scores[["pleas", "activ", "image"]].mean()
-            pleasant.append(means["pleas"])
-            active.append(means["activ"])
-            image.append(means["image"])
-        else:
-            pleasant.append(0.0)
-            active.append(0.0)
-            image.append(0.0)
+    if dictionary is None:
+        lexicon = load_lexicon("whissell")
+    else:
+        if isinstance(dictionary, str):
+            dictionary = pd.read_csv(dictionary)
+        if dictionary.index.name != 'word':
+            dictionary = dictionary.set_index('word')
+        lexicon = Lexicon.from_frame("whissell", dictionary[["pleas", "activ", "image"]])
+
+    # Tokens are matched case-sensitively, as before
+    if isinstance(captions, TokenizedCaptions):
+        matrix = captions.count_matrix("raw")
+    else:
+        matrix = CountMatrix(list(caption) if isinstance(caption, (list, tuple, str)) else [] for caption in captions)
+
+    # Captions without a dictionary word score 0.0
+    means, _ = matrix.lexicon_means(lexicon)
+    means = np.nan_to_num(means, nan=0.0)
+    columns = dict(zip(lexicon.columns, means.T))
 
     return pd.DataFrame({
-        "whissell_pleasant": pd.Series(pleasant, index=captions.index),
-        "whissell_active": pd.Series(active, index=captions.index),
-        "whissell_image": pd.Series(image, index=captions.index),
-    })
+        "whissell_pleasant": columns["pleas"],
+        "whissell_active": columns["activ"],
+        "whissell_image": columns["image"],
+    }, index=captions.index)
 
 if __name__ == "__main__":
     df = pd.DataFrame({
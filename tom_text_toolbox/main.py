@@ -1,121 +1,469 @@
+import os
+import time
 import pandas as pd
-from nltk.tokenize import word_tokenize
+from contextlib import nullcontext
+
+### Shared tokenization (one pass, reused by every scorer)
+from .linguistic_features.tokens import TokenizedCaptions
+
+### Chunked reading/writing for the streaming mode
+from .streaming import read_file_chunks, prefetch, OutputWriter
+
+### Columnar (Parquet) input and output
+from .columnar import read_columns, check_columns, is_parquet, has_pyarrow
+
+### On-disk cache of expensive per-caption results across runs
+from .feature_cache import FeatureCache, run_cached
+
+### Feature stages run as a dependency graph within a CPU budget
+from .scheduler import Stage, run_stages, assemble_columns, select_stages
+
+### Score each distinct caption once and scatter the results back to its rows
+from .dedupe import CaptionGroups, dedup_summary
+
+### Per-stage checkpoints, so a failed run resumes where it stopped
+from .checkpoints import RunCheckpoints, ChunkCheckpoint
+
+### Opt-in run profiling (per-stage time, memory, model loads, slowest captions)
+from .profiling import Profiler, current as current_profiler, timed_load
 
 ### Single Score Features (returns a Series)
-from linguistic_features.abstract_concrete_score import classify_abstract_concrete  # Abstract/Concrete Scores
-from linguistic_features.familiarity_score import classify_familiarity  # Familiarity Score
-from linguistic_features.mind_miner_score import classify_mind_miner  # Mind Miner Score
-from linguistic_features.mistakes_score import count_spelling_mistakes  # Spelling Mistake Count
-from linguistic_features.passive_voice_score import count_passive  # Passive Voice Count
-from linguistic_features.levdist_scores import classify_levdist
+from .linguistic_features.abstract_concrete_score import classify_abstract_concrete  # Abstract/Concrete Scores
+from .linguistic_features.familiarity_score import classify_familiarity  # Familiarity Score
+from .linguistic_features.mind_miner_score import classify_mind_miner, MIND_MINER_VERSION, MODEL_NAME as MIND_MINER_MODEL  # Mind Miner Score
+from .linguistic_features.mistakes_score import count_spelling_mistakes  # Spelling Mistake Count
+from .linguistic_features.passive_voice_score import count_passive, PASSIVE_VERSION  # Passive Voice Count
+from .linguistic_features.levdist_scores import classify_levdist
 
 ### Multiple Score Features (returns a DataFrame)
-from linguistic_features.dictionary_scores import TermCounter  # All custom dictionary scores (including Harvard, excluding nrc)
-from linguistic_features.spacy_measure_scores import SpacyAnalyzer  # Spacy-Based Scores
-from linguistic_features.nrc_scores import classify_nrc_dict  # Score Joy and Anger
-from linguistic_features.whissell_scores import classify_whissell_scores  # Score Whissell Dictionary Scores
-from linguistic_features.figurative_speech_scores import classify_figures_of_speech  # Score Figure of Speech
-from linguistic_features.liwc_scores import classify_liwc  # Classify all liwc scores
+from .linguistic_features.dictionary_scores import TermCounter  # All custom dictionary scores (including Harvard, excluding nrc)
+from .linguistic_features.spacy_measure_scores import SpacyAnalyzer  # Spacy-Based Scores
+from .linguistic_features.spacy_parse import SpacyParser  # One shared spaCy parse (DocBin-cached)
+from .linguistic_features.parallel import resolve_workers
+from .linguistic_features.nrc_scores import classify_nrc_dict  # Score Joy and Anger
+from .linguistic_features.whissell_scores import classify_whissell_scores  # Score Whissell Dictionary Scores
+from .linguistic_features.lexicon_store import lexicon_version  # Source hashes of the word lexicons
+from .linguistic_features.emoji_features import classify_emoji_sentiment, EMOJI_COLUMNS  # Emoji Count, Sentiment and Top Emoji
+from .linguistic_features.readability_score import readability_scores, READABILITY_COLUMNS  # Kincaid, Flesch, Gunning fog, SMOG
+from .linguistic_features.figurative_speech_scores import classify_figures_of_speech, FIGURATIVE_VERSION, DEFAULT_TASKS, MODEL_NAME as FIGURATIVE_MODEL  # Score Figure of Speech
+from .linguistic_features.speech_act_scores import classify_speech_acts, SPEECH_ACTS_VERSION, SPEECH_ACT_LABELS, MODEL_NAME as SPEECH_ACTS_MODEL  # Assertive/Commissive/Directive
+from .linguistic_features.liwc_scores import classify_liwc  # Classify all liwc scores
+from .linguistic_features.model_backends import backend_version  # Library versions and model revision per backend
 
 
 ### Read in the target file
-def read_file(file: str):
+def read_file(file: str, columns: list = None):
     try:
-        if file.endswith(".csv"):
-            df = pd.read_csv(file)
-        else:
-            df = pd.read_excel(file)
-        return df
-    except ValueError:
-        print("❌ Please enter either a CSV file or an Excel file.")
+        # Only `columns` are loaded (default all); Excel is read from a cached Parquet copy
+        return read_columns(file, columns)
+    except ValueError as e:
+        print(f"❌ Please enter a CSV, Parquet or Excel file with the requested columns ({e}).")
+        return None
+    except ImportError as e:
+        print(f"❌ {e}")
+        return None
+
+
+def input_columns(column: str, keep_columns: list = None):
+    """Columns to read: all (None) by default, else the caption column plus `keep_columns`."""
+    if keep_columns is None:
         return None
+    return [column] + [c for c in keep_columns if c != column]
+
+
+def output_writer(output_file: str) -> OutputWriter:
+    """CSV or Parquet writer; in Parquet, float features are float32 and tokens a list column."""
+    return OutputWriter(output_file, float32=available_features(), lists=["token_captions"])
 
 
 ### Process the Captions
-def process_captions(df: pd.DataFrame, column: str):
+def process_captions(df: pd.DataFrame, column: str, n_workers: int = 1, tokenize: bool = True):
     df[column] = df[column].fillna("")
-    df["token_captions"] = df[column].apply(word_tokenize)
+    if not tokenize:
+        return df
+    # Tokenize each distinct caption once; duplicates share its token list
+    groups = CaptionGroups(df[column])
+    raw = TokenizedCaptions(groups.collapse(df[column]), n_workers=n_workers).raw
+    df["token_captions"] = [raw[code] for code in groups.codes]
     return df
 
 
+### Run every "complete" feature stage on one DataFrame (or one chunk of a file)
+def score_features(df: pd.DataFrame, column: str, tc: TermCounter, sc: SpacyAnalyzer,
+                   verbose: bool = True, n_workers: int = 1, cache: FeatureCache = None,
+                   backends: dict = None, dedupe: bool = True, stats: dict = None,
+                   cpu_budget: int = 1, features: list = None,
+                   checkpoint: ChunkCheckpoint = None) -> pd.DataFrame:
+    """Add every feature column to `df` (which needs `column`, and `token_captions` if tokens are read).
+
+    With `features` (output column names or glob patterns, see
+    available_features) only those columns are added, and only the stages
+    behind them run; `tc` and `sc` may then be None if no such stage needs them.
+
+    With `dedupe` on, rows with identical caption text are scored once and the
+    results copied to every such row. `stats`, if given, is updated with the
+    "rows" and "unique" caption counts. Independent stages run concurrently
+    on up to `cpu_budget` cores (see feature_stages and scheduler.run_stages).
+    With a `checkpoint`, stages saved there are restored instead of run, and
+    every stage that runs is saved as soon as it finishes.
+    """
+    groups = CaptionGroups(df[column])
+    if stats is not None:
+        stats["rows"] = stats.get("rows", 0) + groups.n_rows
+        stats["unique"] = stats.get("unique", 0) + (groups.n_unique if dedupe else groups.n_rows)
+    if not (dedupe and groups.has_duplicates):
+        return _score_rows(df, column, tc, sc, verbose, n_workers, cache, backends, cpu_budget, features,
+                           checkpoint)
+
+    if verbose:
+        print(f"🧬 {dedup_summary(groups.n_rows, groups.n_unique)}")
+    inputs = [c for c in (column, "token_captions") if c in df.columns]
+    unique = _score_rows(groups.collapse(df[inputs]), column, tc, sc, verbose, n_workers, cache, backends,
+                         cpu_budget, features, checkpoint)
+    return pd.concat([df, groups.expand(unique.drop(columns=inputs), df.index)], axis=1)
+
+
+def _score_rows(df: pd.DataFrame, column: str, tc: TermCounter, sc: SpacyAnalyzer, verbose: bool,
+                n_workers: int, cache: FeatureCache, backends: dict, cpu_budget: int = 1,
+                features: list = None, checkpoint: ChunkCheckpoint = None) -> pd.DataFrame:
+    log = print if verbose else (lambda *args, **kwargs: None)
+
+    # Every scorer reads its tokens from this one artifact
+    captions = df[column]
+    artifacts = {
+        "captions": captions,
+        "tokens": TokenizedCaptions(captions, raw=df["token_captions"] if "token_captions" in df.columns else None),
+        "parser": sc.parser if sc is not None else None,
+    }
+    stages = feature_stages(tc, sc, verbose=verbose, n_workers=n_workers, cache=cache, backends=backends)
+    stages, selected = select_stages(stages, features)
+
+    restored = checkpoint.load(stages) if checkpoint is not None else {}
+    if restored:
+        log(f"↩️ {len(restored)} stages restored from checkpoints: {', '.join(restored)}")
+
+    timings = {}
+    start = time.perf_counter()
+    results = run_stages(stages, artifacts, cpu_budget=cpu_budget, n_workers=n_workers, verbose=verbose,
+                         timings=timings, completed=restored,
+                         on_complete=checkpoint.save if checkpoint is not None else None,
+                         profiler=current_profiler())
+    log(f"⏱️ {len(stages) - len(restored)} stages in {time.perf_counter() - start:.1f}s "
+        f"(sum of stage times {sum(timings.values()):.1f}s)")
+
+    # Columns are assembled once, in stage order
+    frames = assemble_columns(stages, results, df.index)
+    if selected is not None:
+        frames = [frame[[c for c in frame.columns if c in selected]] for frame in frames]
+    return pd.concat([df, *frames], axis=1)
+
+
+### The familiarity lexicon is not shipped; without it the column is left empty instead of failing the run
+def score_familiarity(tokens: TokenizedCaptions) -> pd.Series:
+    try:
+        return classify_familiarity(tokens)
+    except FileNotFoundError as e:
+        print(f"⚠️ Skipping familiarity_score: {e}")
+        return pd.Series(float("nan"), index=tokens.index, dtype=float)
+
+
+### Version of a model stage: its scoring version, the backend, the library versions and the model revision
+def model_stage_version(version: str, model_name: str, backend: str) -> str:
+    return f"{version}|{backend}|{backend_version(model_name, backend)}"
+
+
+### Every "complete" feature as a stage: its inputs, resource class and output column(s)
+def feature_stages(tc: TermCounter = None, sc: SpacyAnalyzer = None, verbose: bool = True, n_workers: int = 1,
+                   cache: FeatureCache = None, backends: dict = None) -> list:
+    # Model backend per transformer stage ("torch", "int8" or "onnx"); part of the cache key
+    backends = {"mind_miner": "torch", "figurative": "torch", "speech_acts": "torch", **(backends or {})}
+    spacy_version = sc.version if sc is not None else ""
+    # Resolved when first needed (it imports transformers), not while the stage list is built
+    figurative_version = lambda: model_stage_version(f"{FIGURATIVE_VERSION}|generate", FIGURATIVE_MODEL,
+                                                     backends["figurative"])
+    speech_acts_version = lambda: model_stage_version(SPEECH_ACTS_VERSION, SPEECH_ACTS_MODEL, backends["speech_acts"])
+    mind_miner_version = lambda: model_stage_version(MIND_MINER_VERSION, MIND_MINER_MODEL, backends["mind_miner"])
+
+    return [
+        Stage("term_counts", lambda captions, tokens: tc.count_all(captions, tokens=tokens, n_workers=n_workers),
+              inputs=("captions", "tokens"), resource="heavy", message="📘 Running TermCounter...",
+              version=tc.version if tc is not None else "",
+              columns=list(tc.term_dict) + TermCounter.TEXT_FEATURES if tc else TermCounter.column_names()),
+        Stage("spacy_measures",
+              lambda captions, parser: run_cached(cache, "spacy_measures", sc.version, captions,
+                                                  sc.score_spacy_measures, verbose),
+              inputs=("captions", "parser"), resource="heavy", message="🧠 Running SpacyScores...",
+              version=spacy_version,
+              columns=["informativeness", "narrativity", "syntax_complexity", "cb_ratio", "tense_past",
+                       "tense_present"]),
+        # Runs after the spaCy stage so it reuses the docs just parsed (or loads them from the DocBin store)
+        Stage("passive_count",
+              lambda captions, parser: run_cached(
+                  cache, "passive_count", f"{parser.version}|{PASSIVE_VERSION}", captions,
+                  lambda c: count_passive(c.to_frame("caption"), parser=parser), verbose),
+              inputs=("captions", "parser"), after=("spacy_measures",), resource="heavy",
+              message="🕰 Counting Passives...", version=f"{spacy_version}|{PASSIVE_VERSION}"),
+        Stage("nrc", lambda captions, tokens: classify_nrc_dict(captions, tokens=tokens), inputs=("captions", "tokens"),
+              message="🎭 Running NRC Dictionary Scoring...", columns=["joy", "anger"],
+              version=lexicon_version("nrc_joy", "nrc_anger")),
+        # Opt-in (select its columns with `features=`), as in the original pipeline: the fast
+        # logits method has not been validated against generate() decoding yet
+        Stage("figures_of_speech",
+              lambda captions: run_cached(
+                  cache, "figures_of_speech", figurative_version(), captions,
+                  lambda c: classify_figures_of_speech(c, method="generate",
+                                                       backend=backends["figurative"]).drop(columns="Caption"),
+                  verbose),
+              resource="model", message="🪶 Classifying Figurative Language...",
+              version=figurative_version,
+              columns=list(DEFAULT_TASKS), default=False),
+        # Opt-in: one NLI forward pass per caption and act, i.e. three per caption
+        Stage("speech_acts",
+              lambda captions: run_cached(
+                  cache, "speech_acts", speech_acts_version(), captions,
+                  lambda c: classify_speech_acts(c, backend=backends["speech_acts"]), verbose),
+              resource="model", message="🗣️ Classifying Speech Acts...",
+              version=speech_acts_version,
+              columns=[f"speech_act_{label.lower()}" for label in SPEECH_ACT_LABELS] + ["speech_act"],
+              default=False),
+        Stage("abstract_concrete_score", lambda tokens: classify_abstract_concrete(tokens), inputs=("tokens",),
+              message="📗 Scoring Abstract vs Concrete...", version=lexicon_version("brysbaert")),
+        Stage("familiarity_score", score_familiarity, inputs=("tokens",), message="📙 Scoring Familiarity...",
+              version=lexicon_version("familiarity")),
+        Stage("mistakes_count",
+              lambda captions, tokens: count_spelling_mistakes(captions, tokens=tokens, n_workers=n_workers),
+              inputs=("captions", "tokens"), resource="heavy", message="🩸 Counting Spelling Mistakes..."),
+        Stage("mind_miner_score",
+              lambda captions: run_cached(
+                  cache, "mind_miner", mind_miner_version(), captions,
+                  lambda c: classify_mind_miner(c, backend=backends["mind_miner"]), verbose),
+              resource="model", message="💭 Scoring Mind Miner...",
+              version=mind_miner_version),
+        Stage("percept_dist", lambda captions, tokens: classify_levdist(captions, tokens=tokens, n_workers=n_workers),
+              inputs=("captions", "tokens"), resource="heavy", message="📏 Scoring Perceptual Distance..."),
+        Stage("whissell", lambda tokens: classify_whissell_scores(tokens), inputs=("tokens",),
+              message="🎨 Scoring Whissell Dimensions...",
+              columns=["whissell_pleasant", "whissell_active", "whissell_image"],
+              version=lexicon_version("whissell")),
+        Stage("readability", lambda captions: readability_scores(captions, verbose=verbose),
+              message="📖 Scoring Readability...", columns=list(READABILITY_COLUMNS)),
+        Stage("emoji", classify_emoji_sentiment, message="😀 Scoring Emoji Sentiment...", columns=EMOJI_COLUMNS),
+    ]
+
+
+### Every output column analyse_features can produce (names for `features=`)
+def available_features() -> list:
+    return [c for stage in feature_stages() for c in stage.columns]
+
+
+### spaCy scorers share one parse; with `store` the docs are kept as DocBin shards across runs
+def spacy_analyzer(n_workers: int = 1, store: bool = True) -> SpacyAnalyzer:
+    return SpacyAnalyzer(SpacyParser(n_process=resolve_workers(n_workers), store=store))
+
+
+### Load only what the selected stages use
+def load_resources(features: list = None, n_workers: int = 1, store: bool = True):
+    """(TermCounter or None, SpacyAnalyzer or None, whether tokens are needed) for `features`."""
+    stages = select_stages(feature_stages(), features)[0]
+    names = {stage.name for stage in stages}
+    tc = None
+    if "term_counts" in names:
+        with timed_load("term dictionaries"):
+            tc = TermCounter.from_json()
+    sc = spacy_analyzer(n_workers, store=store) if names & {"spacy_measures", "passive_count"} else None
+    return tc, sc, any("tokens" in stage.inputs for stage in stages)
+
+
+### Streaming mode: bounded memory, one chunk at a time
+def stream_features(file: str, column: str, chunksize: int, output_file: str, n_workers: int = 1,
+                    cache: FeatureCache = None, backends: dict = None, dedupe: bool = True,
+                    stats: dict = None, cpu_budget: int = 1, features: list = None,
+                    keep_columns: list = None, checkpoints: RunCheckpoints = None):
+    tc, sc, tokenize = load_resources(features, n_workers, store=cache is not None)
+
+    columns = input_columns(column, keep_columns)
+    try:
+        # Also fails early on Parquet input without pyarrow
+        check_columns(file, columns if columns is not None else [column])
+    except (ValueError, ImportError) as e:
+        print(f"❌ {e}")
+        return None
+
+    rows = 0
+    # The next chunk is parsed in the background while the current one is scored
+    chunks = read_file_chunks(file, chunksize, columns=columns)
+    with output_writer(output_file) as writer:
+        for i, chunk in enumerate(prefetch(chunks)):
+            if column not in chunk.columns:
+                print(f"❌ Column '{column}' not found in the DataFrame.")
+                return None
+            chunk = process_captions(chunk, column, n_workers=n_workers, tokenize=tokenize)
+            # Duplicates are collapsed within each chunk; the feature cache covers repeats across chunks
+            checkpoint = checkpoints.chunk(i, rows, rows + len(chunk)) if checkpoints is not None else None
+            chunk = score_features(chunk, column, tc, sc, verbose=False, n_workers=n_workers, cache=cache,
+                                   backends=backends, dedupe=dedupe, stats=stats, cpu_budget=cpu_budget,
+                                   features=features, checkpoint=checkpoint)
+            writer.write(chunk)
+            rows += len(chunk)
+            print(f"📦 Chunk {i + 1} done ({rows} rows written).")
+
+    return rows
+
+
 ### Main function to run the analysis
 def analyse_features(file: str, column: str = "caption", method: str = "complete", liwc: bool = False,
-                     custom_dictionary: str = None):
-    print("🚀 Running Main Function...")
+                     custom_dictionary: str = None, chunksize: int = None,
+                     output_file: str = "processed_captions.csv", n_workers: int = 1,
+                     cache: bool = True, cache_size_mb: int = 1024, backends: dict = None,
+                     dedupe: bool = True, cpu_budget: int = None, features: list = None,
+                     keep_columns: list = None, checkpoint: bool = False, run_dir: str = None,
+                     profile=False):
+    """Score every caption in `file` and save the result to `output_file`.
 
-    # Read the input file
-    df = read_file(file)
+    With `chunksize` set, the file is read and scored `chunksize` rows at a
+    time and each chunk is appended to `output_file`, so peak memory depends
+    on the chunk size rather than the corpus size. In that mode the output
+    path is returned instead of the full DataFrame.
 
-    # Process the DataFrame if it's valid
-    if df is not None and column in df.columns:
-        df = process_captions(df, column)
-    else:
-        print(f"❌ Column '{column}' not found in the DataFrame.")
-        return None
+    `n_workers` > 1 runs tokenization, term matching, spelling and
+    perceptual distance in that many worker processes (None for every core).
+
+    With `cache` on, spaCy, MindMiner, figurative and speech-act scores are
+    stored per caption text in an on-disk cache (at most `cache_size_mb`), so
+    reruns on overlapping files only score new captions. The spaCy parses
+    themselves are kept as DocBin shards, so new spaCy features skip parsing.
+
+    `backends` picks the model backend per transformer stage, e.g.
+    {"mind_miner": "int8", "figurative": "onnx"} (default "torch", fp32).
+    Compare them first with linguistic_features.backend_report.
 
-    # "Complete" analysis method
-    if method == "complete":
-        print("🧩 Running Complete Analysis...")
+    With `dedupe` on, identical captions (e.g. the same post on several
+    platforms or profiles) are scored once and the results copied to every
+    row; the run summary reports how many rows that skipped.
 
-        print("📘 Running TermCounter...")
-        tc = TermCounter.from_json()
-        term_counts_df = tc.count_all(df["caption"])
-        df = pd.concat([df, term_counts_df], axis=1)
+    Feature stages that do not depend on each other run concurrently on up
+    to `cpu_budget` cores (None for every core; 1 runs them one by one).
 
-        print("🧠 Running SpacyScores...")
-        sc = SpacyAnalyzer()
-        sc_df = sc.score_spacy_measures(df["caption"])
-        df = pd.concat([df, sc_df], axis=1)
+    `features` limits the output to some columns, by name or glob pattern,
+    e.g. ["joy", "anger", "whissell_*", "cb_ratio"] (see available_features()).
+    Only the stages, models and dictionaries those columns need are loaded.
+    Some stages are opt-in and only run when `features` names their
+    columns: figurative language ("Idiom", "Hyperbole", "Metaphor") and
+    speech acts ("speech_act*"; three NLI model passes per caption).
 
-        print("🎭 Running NRC Dictionary Scoring...")
-        nrc_scores_df = classify_nrc_dict(df["caption"])
-        df = pd.concat([df, nrc_scores_df], axis=1)
+    `file` may be CSV, Parquet or Excel (read from a Parquet copy made once
+    per workbook version). With `keep_columns` set, only the caption column
+    and those columns are read and carried into the output (default all).
+    An `output_file` ending in .parquet is written as compressed Parquet
+    with float32 features and the tokens as a list column, one row group
+    per chunk.
 
-        # print("🪶 Classifying Figurative Language...")
-        # figurative_scores_df = classify_figures_of_speech(df["caption"])
-        # df = pd.concat([df, figurative_scores_df], axis=1)
+    With `checkpoint=True`, each stage's output is saved to a run directory
+    (`run_dir`, by default one per input file and settings in the toolbox
+    cache) as soon as it finishes. Rerunning after a failure restores every
+    saved stage and chunk and only runs the rest; stages whose model,
+    lexicon or term dictionary changed in between are run again. The
+    checkpoints are removed once the whole run, LIWC included, has
+    succeeded. Off by default, as it writes every stage's output to disk.
 
-        # print("🕰 Counting passives... this might take a while...")
-        # df["passive_count"] = count_passive(df)
+    `profile=True` (or a profiling.Profiler, for its top_n and metrics
+    sink) measures every stage: wall and CPU time, rows per second, peak
+    RSS, model load times and the slowest captions. The report is written
+    as JSON next to the output, as <output name>_profile.json, also when
+    the run fails.
+    """
+    profiler = profile if isinstance(profile, Profiler) else Profiler() if profile else None
+    if profiler is not None and profiler.path is None:
+        profiler.path = os.path.splitext(output_file)[0] + "_profile.json"
 
-        print("📗 Scoring Abstract vs Concrete...")
-        df["abstract_concrete_score"] = classify_abstract_concrete(df["token_captions"])
+    # The profiler writes its report on exit, also when the run fails
+    with profiler if profiler is not None else nullcontext():
+        print("🚀 Running Main Function...")
+        feature_cache = FeatureCache(max_bytes=cache_size_mb * 1024 * 1024) if cache else None
+        stats = {}
+        cpu_budget = resolve_workers(cpu_budget)
 
-        print("📙 Scoring Familiarity...")
-        df["familiarity_score"] = classify_familiarity(df["token_captions"])
+        if method != "complete":
+            print(f"❌ Unknown method '{method}'.")
+            return None
+        if is_parquet(output_file) and not has_pyarrow():
+            print("❌ Parquet output needs pyarrow: pip install 'tom-text-toolbox[parquet]'")
+            return None
+        if features is not None:
+            # Fails here, before any file is read, if a name matches no column
+            _, selected = select_stages(feature_stages(), features)
+            print(f"🎯 Scoring {len(selected)} selected features: {', '.join(selected)}")
 
-        print("🩸 Counting Spelling Mistakes...")
-        df["mistakes_count"] = count_spelling_mistakes(df["caption"])
+        checkpoints = None
+        if checkpoint:
+            settings = {"column": column, "chunksize": chunksize, "dedupe": dedupe}
+            checkpoints = RunCheckpoints(file, settings, run_dir=run_dir)
+            if checkpoints.saved:
+                print(f"♻️ Resuming: {checkpoints.saved} stage results saved in {checkpoints.run_dir}")
+            else:
+                print(f"💾 Checkpointing each stage to {checkpoints.run_dir}")
 
-        print("💭 Scoring Mind Miner...")
-        df["mind_miner_score"] = classify_mind_miner(df["caption"])
+        if chunksize:
+            print(f"🌊 Streaming Complete Analysis in chunks of {chunksize} rows...")
+            if stream_features(file, column, chunksize, output_file, n_workers=n_workers, cache=feature_cache,
+                               backends=backends, dedupe=dedupe, stats=stats, cpu_budget=cpu_budget,
+                               features=features, keep_columns=keep_columns, checkpoints=checkpoints) is None:
+                return None
+            result = output_file
+        else:
+            # Read the input file
+            df = read_file(file, columns=input_columns(column, keep_columns))
 
-        print("📏 Scoring Perceptual Distance...")
-        df["percept_dist"] = classify_levdist(df["caption"])
+            # Process the DataFrame if it's valid
+            if df is None:
+                return None
+            if column not in df.columns:
+                print(f"❌ Column '{column}' not found in the DataFrame.")
+                return None
+            tc, sc, tokenize = load_resources(features, n_workers, store=cache)
+            df = process_captions(df, column, n_workers=n_workers, tokenize=tokenize)
 
-        print("🎨 Scoring Whissell Dimensions...")
-        df[["whissell_pleasant", "whissell_active", "whissell_image"]] = classify_whissell_scores(df["token_captions"])
+            if features is None:
+                print("🧩 Running Complete Analysis...")
+            df = score_features(df, column, tc, sc, n_workers=n_workers, cache=feature_cache, backends=backends,
+                                dedupe=dedupe, stats=stats, cpu_budget=cpu_budget, features=features,
+                                checkpoint=checkpoints.chunk(0, 0, len(df)) if checkpoints is not None else None)
 
-        # Save with the new column(s)
-        output_file = "processed_captions.csv"
-        df.to_csv(output_file, index=False)
+            # Save with the new column(s)
+            with output_writer(output_file) as writer:
+                writer.write(df)
+            result = df
 
         print(f"✅ Complete analysis done. File saved as {output_file}.")
+        if stats.get("rows"):
+            print(f"🧬 Deduplication: {dedup_summary(stats['rows'], stats['unique'])}.")
         if liwc:
             print("🧩 Running LIWC analysis...")
-            classify_liwc(
-                file="processed_captions.csv",
-                column="caption",
+            liwc_input = output_file
+            if is_parquet(output_file):
+                # The LIWC CLI reads CSV
+                liwc_input = os.path.splitext(output_file)[0] + ".csv"
+                pd.read_parquet(output_file).to_csv(liwc_input, index=False)
+            liwc_result = classify_liwc(
+                file=liwc_input,
+                column=column,
                 dependent=True,
                 merge_back=True,
                 concise=True,
                 custom_dictionary=custom_dictionary
             )
+            if liwc_result is None:
+                # Keep the checkpoints: a rerun rebuilds the output from them and retries LIWC
+                return result
             print("🎉 All Done!")
 
-        return df
+        if checkpoints is not None:
+            checkpoints.clear()
+
+        return result
 
 
 if __name__ == "__main__":
+    # Run as a module: python -m tom_text_toolbox.main
     file = r"C:\Users\txtbn\Dropbox\Message Consistency\01_Scraped Data\Fortune 500\05_Analysis\tom_text_toolbox\tom-text-toolbox\tom_text_toolbox\text_data_TEST.csv"
     result_df = analyse_features(file, liwc=True)
@@ -0,0 +1,233 @@
+import heapq
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+# The profiler recording right now (None when profiling is off) and the stage on each thread
+_ACTIVE: Optional["Profiler"] = None
+_local = threading.local()
+
+# Captions are cut to this many characters in the report
+CAPTION_CHARS = 200
+
+
+def current() -> Optional["Profiler"]:
+    """The profiler recording right now, or None."""
+    return _ACTIVE
+
+
+def active() -> bool:
+    """Whether a profiler is recording; per-caption timings are only worth taking then."""
+    return _ACTIVE is not None
+
+
+def map_timed(fn: Callable[[Any], Any], items: Sequence, timed: bool) -> Tuple[list, Optional[np.ndarray]]:
+    """[fn(item) for item in items], plus the seconds spent on each item if `timed`.
+
+    Safe to call in worker processes: the timings travel back with the results.
+    """
+    if not timed:
+        return [fn(item) for item in items], None
+    values, seconds = [], np.empty(len(items))
+    for i, item in enumerate(items):
+        start = time.perf_counter()
+        values.append(fn(item))
+        seconds[i] = time.perf_counter() - start
+    return values, seconds
+
+
+def record_captions(seconds: np.ndarray):
+    """Report the seconds spent on each caption of the stage running on this thread."""
+    record = getattr(_local, "record", None)
+    if record is not None and len(seconds):
+        record.add_captions(np.asarray(seconds, dtype=float))
+
+
+@contextmanager
+def timed_load(name: str):
+    """Time a model or dictionary load; it is charged to the stage running on this thread."""
+    if _ACTIVE is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _ACTIVE.add_load(name, time.perf_counter() - start)
+
+
+class _StageRun:
+    # One execution of one stage (one chunk)
+    def __init__(self, name: str, captions, top_n: int, rss: int):
+        self.name = name
+        self.captions = captions
+        self.top_n = top_n
+        self.rows = len(captions) if captions is not None else 0
+        self.rss_start = self.peak_rss = rss
+        self.failed = False
+        self.loads: Dict[str, float] = {}
+        self.slowest: List[Tuple[float, str]] = []
+
+    def add_captions(self, seconds: np.ndarray):
+        top = np.argsort(seconds)[::-1][:self.top_n]
+        for position in top.tolist():
+            if self.captions is None:
+                caption = position
+            else:
+                caption = self.captions.iloc[position] if hasattr(self.captions, "iloc") else self.captions[position]
+            self.slowest.append((float(seconds[position]), str(caption)[:CAPTION_CHARS]))
+
+
+class Profiler:
+    """Opt-in instrumentation of an analyse_features run.
+
+    For every stage it records wall time, CPU time of the stage's own thread
+    (work in worker processes only shows in wall time), rows per second, the
+    peak process RSS while it ran, model and dictionary load times, and the
+    `top_n` slowest captions where the stage times them (see
+    record_captions). Chunks of a streamed run are summed per stage.
+
+    Use it as a context manager around the run; `emit` writes the report as
+    JSON and passes it to `sink`, e.g. a function forwarding it to a metrics
+    service. With `path` set, this happens when the context exits.
+    """
+
+    def __init__(self, top_n: int = 10, sink: Optional[Callable[[dict], None]] = None,
+                 sample_interval: float = 0.05, path: Optional[str] = None):
+        import psutil
+
+        self.top_n = top_n
+        self.sink = sink
+        self.path = path
+        self.sample_interval = sample_interval
+        self.stages: Dict[str, dict] = {}
+        self.setup_loads: Dict[str, float] = {}
+        self.wall_seconds = 0.0
+        self.peak_rss = 0
+        self._process = psutil.Process()
+        self._running: List[_StageRun] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._start = None
+
+    def _rss(self) -> int:
+        return self._process.memory_info().rss
+
+    def _sample(self):
+        # Peak memory is sampled: the process RSS is read every `sample_interval` seconds
+        while not self._stop.wait(self.sample_interval):
+            self._observe(self._rss())
+
+    def _observe(self, rss: int):
+        with self._lock:
+            self.peak_rss = max(self.peak_rss, rss)
+            for record in self._running:
+                record.peak_rss = max(record.peak_rss, rss)
+
+    def __enter__(self):
+        global _ACTIVE
+        _ACTIVE = self
+        self._start = time.perf_counter()
+        self._observe(self._rss())
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc):
+        global _ACTIVE
+        self._stop.set()
+        self._sampler.join()
+        self._observe(self._rss())
+        self.wall_seconds += time.perf_counter() - self._start
+        _ACTIVE = None
+        if self.path:
+            self.emit(self.path)
+            print(f"📊 Profile written to {self.path}")
+
+    @contextmanager
+    def stage(self, name: str, captions=None):
+        """Measure one run of stage `name` over `captions` on the calling thread."""
+        record = _StageRun(name, captions, self.top_n, self._rss())
+        with self._lock:
+            self._running.append(record)
+        _local.record = record
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        except BaseException:
+            record.failed = True
+            raise
+        finally:
+            record.wall = time.perf_counter() - wall
+            record.cpu = time.thread_time() - cpu
+            _local.record = None
+            self._observe(self._rss())
+            with self._lock:
+                self._running.remove(record)
+                self._merge(record)
+
+    def add_load(self, name: str, seconds: float):
+        """Charge a load to the stage on this thread, or to the run set-up outside stages."""
+        record = getattr(_local, "record", None)
+        loads = record.loads if record is not None else self.setup_loads
+        with self._lock:
+            loads[name] = loads.get(name, 0.0) + seconds
+
+    def _merge(self, record: _StageRun):
+        entry = self.stages.setdefault(record.name, {
+            "calls": 0, "failures": 0, "rows": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0, "peak_rss_mb": 0.0,
+            "rss_growth_mb": 0.0, "model_loads": {}, "slowest_captions": [],
+        })
+        entry["calls"] += 1
+        entry["failures"] += record.failed
+        entry["rows"] += record.rows
+        entry["wall_seconds"] += record.wall
+        entry["cpu_seconds"] += record.cpu
+        entry["peak_rss_mb"] = max(entry["peak_rss_mb"], record.peak_rss / 2 ** 20)
+        entry["rss_growth_mb"] = max(entry["rss_growth_mb"], (record.peak_rss - record.rss_start) / 2 ** 20)
+        for load, seconds in record.loads.items():
+            entry["model_loads"][load] = entry["model_loads"].get(load, 0.0) + seconds
+        entry["slowest_captions"] = heapq.nlargest(self.top_n, entry["slowest_captions"] + record.slowest)
+
+    def report(self) -> dict:
+        """The measurements so far, as JSON-ready dicts (stages in the order they first finished)."""
+        stages = []
+        with self._lock:
+            for name, entry in self.stages.items():
+                wall = entry["wall_seconds"]
+                stages.append({
+                    "stage": name,
+                    "calls": entry["calls"],
+                    "failures": entry["failures"],
+                    "rows": entry["rows"],
+                    "wall_seconds": round(wall, 4),
+                    "cpu_seconds": round(entry["cpu_seconds"], 4),
+                    "rows_per_second": round(entry["rows"] / wall, 1) if wall > 0 else None,
+                    "peak_rss_mb": round(entry["peak_rss_mb"], 1),
+                    "rss_growth_mb": round(entry["rss_growth_mb"], 1),
+                    "model_load_seconds": round(sum(entry["model_loads"].values()), 4),
+                    "model_loads": {k: round(v, 4) for k, v in entry["model_loads"].items()},
+                    "slowest_captions": [{"seconds": round(s, 6), "caption": c} for s, c in entry["slowest_captions"]],
+                })
+            return {
+                "wall_seconds": round(self.wall_seconds, 4),
+                "peak_rss_mb": round(self.peak_rss / 2 ** 20, 1),
+                "setup_loads": {k: round(v, 4) for k, v in self.setup_loads.items()},
+                "stages": stages,
+            }
+
+    def emit(self, path: Optional[str] = None) -> dict:
+        """Write the report to `path` as JSON (if given), hand it to the sink, and return it."""
+        report = self.report()
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        if self.sink is not None:
+            self.sink(report)
+        return report
@@ -0,0 +1,205 @@
+import fnmatch
+import time
+import threading
+import pandas as pd
+from contextlib import nullcontext
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+# Resource classes:
+# - "light": pure-Python or numpy work on one core (lexicons, emoji, readability)
+# - "heavy": may fan out to n_workers processes (term matching, spelling, levdist, spaCy)
+# - "model": transformer inference; these run one at a time so only one model is busy
+RESOURCES = ("light", "heavy", "model")
+
+
+class Stage:
+    """One feature stage: what it reads, what it costs, and how to run it.
+
+    `run` is called with one keyword argument per name in `inputs`, taken
+    from the shared artifacts (e.g. captions, tokens, the spaCy parser) and
+    the results of earlier stages. `columns` lists the output columns it
+    produces; a Series result is named after its first column. `version`
+    identifies the model, dictionary or code behind the result (checkpoints
+    made with another version are not reused); it may be a zero-argument
+    callable, evaluated when first read, for versions that need heavy
+    imports (e.g. model revisions). A stage with `default` False
+    is opt-in: it only runs when `features` selects one of its columns.
+    """
+
+    def __init__(self, name: str, run: Callable[..., Any], inputs: Sequence[str] = ("captions",),
+                 resource: str = "light", message: str = "", columns: Optional[Sequence[str]] = None,
+                 after: Sequence[str] = (), version: Union[str, Callable[[], str]] = "",
+                 default: bool = True):
+        if resource not in RESOURCES:
+            raise ValueError(f"Unknown resource '{resource}'. Choose from {list(RESOURCES)}.")
+        self.name = name
+        self.run = run
+        self.inputs = tuple(inputs)
+        self.resource = resource
+        self.message = message
+        self.columns = list(columns or [name])
+        # Stages to run first when they are scheduled too (ordering only, not a dependency)
+        self.after = tuple(after)
+        self._version = version
+        self.default = default
+
+    @property
+    def version(self) -> str:
+        if callable(self._version):
+            self._version = self._version()
+        return self._version
+
+    def __repr__(self) -> str:
+        return f"Stage({self.name!r}, inputs={self.inputs}, resource={self.resource!r})"
+
+
+def _slots(stage: Stage, cpu_budget: int, n_workers: int) -> int:
+    # CPU slots held while the stage runs. A heavy stage with a process pool takes
+    # the whole budget, so no other thread is running when its workers fork.
+    if stage.resource == "heavy" and n_workers > 1:
+        return cpu_budget
+    return 1
+
+
+def run_stages(stages: List[Stage], artifacts: Dict[str, Any], cpu_budget: int = 1, n_workers: int = 1,
+               verbose: bool = True, timings: Optional[Dict[str, float]] = None,
+               completed: Optional[Dict[str, Any]] = None,
+               on_complete: Optional[Callable[[Stage, Any], None]] = None,
+               profiler: Optional[Any] = None) -> Dict[str, Any]:
+    """Run `stages` as a dependency graph and return {stage name: result}.
+
+    A stage starts as soon as everything it reads is available and its CPU
+    slots fit in `cpu_budget`; model stages also wait for any other model
+    stage. With `cpu_budget` 1 the stages run one by one in the given order.
+    Per-stage wall times are written to `timings` if given.
+
+    Stages run on threads of this process, so they only overlap while one
+    of them has released the GIL: in model inference, in numpy/scipy code,
+    or while waiting on its own worker processes. Pure-Python light stages
+    (lexicon lookups, emoji, readability) take turns on one core; the
+    budget spares them from waiting on each other, it does not run them in
+    parallel.
+
+    Stages with a result in `completed` (e.g. restored from a checkpoint) are
+    not run. `on_complete(stage, result)` is called on the calling thread as
+    each stage finishes, before any stage that depends on it starts. If a
+    stage fails, no new stage starts; the ones already running finish (and
+    are reported) before the first error is raised. With a `profiler`
+    (profiling.Profiler), every stage run is measured by it.
+    """
+    log = print if verbose else (lambda *args, **kwargs: None)
+    names = {stage.name for stage in stages}
+    for stage in stages:
+        unknown = [i for i in stage.inputs if i not in names and i not in artifacts]
+        if unknown:
+            raise ValueError(f"Stage '{stage.name}' needs {unknown}, which no stage or artifact provides.")
+
+    results: Dict[str, Any] = {name: result for name, result in (completed or {}).items() if name in names}
+    pending = [stage for stage in stages if stage.name not in results]
+    running: Dict[Any, Stage] = {}
+    free, model_busy = max(1, cpu_budget), False
+    error: Optional[BaseException] = None
+    timings = timings if timings is not None else {}
+    lock = threading.Lock()
+
+    def execute(stage: Stage):
+        start = time.perf_counter()
+        kwargs = {name: results[name] if name in results else artifacts[name] for name in stage.inputs}
+        # Every stage is measured against the shared captions, whichever inputs it reads
+        measure = profiler.stage(stage.name, artifacts.get("captions")) if profiler is not None else nullcontext()
+        with measure:
+            result = stage.run(**kwargs)
+        with lock:
+            timings[stage.name] = time.perf_counter() - start
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, cpu_budget)) as executor:
+        while pending or running:
+            # After a failure nothing new starts; the running stages are drained
+            if error is not None:
+                pending.clear()
+            # Start every ready stage that fits, in declaration order
+            for stage in list(pending):
+                ready = all(d in results for d in stage.inputs + stage.after if d in names)
+                slots = min(_slots(stage, cpu_budget, n_workers), max(1, cpu_budget))
+                if not ready or slots > free or (stage.resource == "model" and model_busy):
+                    continue
+                if stage.message:
+                    log(stage.message)
+                pending.remove(stage)
+                free -= slots
+                model_busy = model_busy or stage.resource == "model"
+                running[executor.submit(execute, stage)] = stage
+
+            if not running:
+                if error is not None:
+                    break
+                raise RuntimeError(f"Stages {[s.name for s in pending]} can never start (dependency cycle?).")
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                stage = running.pop(future)
+                if future.exception() is not None:
+                    error = error or future.exception()
+                else:
+                    results[stage.name] = future.result()
+                    if on_complete is not None:
+                        on_complete(stage, results[stage.name])
+                free += min(_slots(stage, cpu_budget, n_workers), max(1, cpu_budget))
+                if stage.resource == "model":
+                    model_busy = False
+
+    if error is not None:
+        raise error
+    return results
+
+
+def assemble_columns(stages: List[Stage], results: Dict[str, Any], index: pd.Index) -> List[pd.DataFrame]:
+    """The output of every stage as a DataFrame on `index`, in stage order (None results are skipped).
+
+    Series and plain sequences become a single column named after the stage.
+    """
+    frames = []
+    for stage in stages:
+        result = results.get(stage.name)
+        if result is None:
+            continue
+        if isinstance(result, pd.DataFrame):
+            frame = result
+        elif isinstance(result, pd.Series):
+            frame = result.to_frame(stage.columns[0])
+        else:
+            frame = pd.DataFrame({stage.columns[0]: list(result)})
+        frame.index = index
+        frames.append(frame)
+    return frames
+
+
+def select_stages(stages: List[Stage], features: Optional[Sequence[str]]) -> Tuple[List[Stage], Optional[List[str]]]:
+    """The stages needed for `features`, and the output columns they name.
+
+    `features` are output column names or glob patterns ("whissell_*").
+    Stages producing a matching column are kept together with every stage
+    they read from; the rest are dropped, so their models and dictionaries
+    are never loaded. Without `features`, the default stages are kept
+    (all of their columns).
+    """
+    if features is None:
+        return [stage for stage in stages if stage.default], None
+    columns = []
+    for pattern in features:
+        matched = [c for stage in stages for c in stage.columns if fnmatch.fnmatchcase(c, pattern)]
+        if not matched:
+            raise ValueError(f"Unknown feature '{pattern}'. Choose from {[c for s in stages for c in s.columns]}.")
+        columns += [c for c in matched if c not in columns]
+
+    by_name = {stage.name: stage for stage in stages}
+    needed = {stage.name for stage in stages if set(stage.columns) & set(columns)}
+    todo = list(needed)
+    while todo:
+        for dependency in by_name[todo.pop()].inputs:
+            if dependency in by_name and dependency not in needed:
+                needed.add(dependency)
+                todo.append(dependency)
+    return [stage for stage in stages if stage.name in needed], columns
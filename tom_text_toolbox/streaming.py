@@ -0,0 +1,84 @@
+import os
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+from .columnar import (
+    STREAMING_EXCEL_SUFFIXES, ParquetOutput, check_columns, excel_copy, is_parquet, iter_excel, iter_parquet,
+)
+
+_DONE = object()
+
+
+### Read the target file in fixed-size chunks
+def read_file_chunks(file: str, chunksize: int, columns: Optional[List[str]] = None) -> Iterator[pd.DataFrame]:
+    """Yield DataFrames of at most `chunksize` rows; the index continues across chunks.
+
+    Only `columns` are read (default all). Excel files are streamed from
+    their cached Parquet copy, or row by row with openpyxl without pyarrow.
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be a positive integer.")
+    check_columns(file, columns)
+    if file.endswith(".csv"):
+        with pd.read_csv(file, chunksize=chunksize, usecols=columns) as reader:
+            yield from reader
+    elif is_parquet(file):
+        yield from iter_parquet(file, chunksize, columns)
+    else:
+        copy = excel_copy(file)
+        if copy is not None:
+            yield from iter_parquet(copy, chunksize, columns)
+        elif file.lower().endswith(STREAMING_EXCEL_SUFFIXES):
+            yield from iter_excel(file, chunksize, columns)
+        else:
+            raise ValueError("Streaming supports CSV, Parquet and .xlsx files (other Excel formats need pyarrow).")
+
+
+### Read the next item in the background while the current one is processed
+def prefetch(items: Iterable) -> Iterator:
+    """Yield from `items`, fetching the following item on a background thread."""
+    iterator = iter(items)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(next, iterator, _DONE)
+        while True:
+            item = future.result()
+            if item is _DONE:
+                return
+            future = executor.submit(next, iterator, _DONE)
+            yield item
+
+
+### Write processed chunks to the output file
+class OutputWriter:
+    """Writes processed DataFrames to `output_file` as they come.
+
+    A .csv file gets the header with the first DataFrame and rows appended
+    after it. A .parquet file gets one row group per DataFrame, with the
+    `float32` columns stored as float32 and the `lists` columns as lists of
+    strings; it is complete once the writer is closed.
+    """
+
+    def __init__(self, output_file: str, float32: Sequence[str] = (), lists: Sequence[str] = ()):
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        self.output_file = output_file
+        self._parquet = ParquetOutput(output_file, float32, lists) if is_parquet(output_file) else None
+        self._first = True
+
+    def write(self, df: pd.DataFrame):
+        if self._parquet is not None:
+            self._parquet.write(df)
+        else:
+            df.to_csv(self.output_file, mode="w" if self._first else "a", header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()